@@ -0,0 +1,48 @@
+"""Compare ControllerStateSerializer.serialize() + UTF-8 encoding with serialize_bytes().
+
+Run from the repository root, so that switch_pilot_core is importable without installing it:
+
+    python -m benchmarks.controller_state_serializer
+"""
+import random
+import timeit
+
+from switch_pilot_core.controller import Button, ControllerState, ControllerStateSerializer, Hat
+
+
+def create_states(count: int) -> list[ControllerState]:
+    rng = random.Random(0)
+    buttons = list(Button)
+    states = []
+    for _ in range(count):
+        state = ControllerState(buttons=rng.choice(buttons) if rng.random() < 0.7 else 0,
+                                hat=rng.choice(list(Hat)))
+        if rng.random() < 0.3:
+            state.lx, state.ly = rng.choice((0, 128, 255)), rng.choice((0, 128, 255))
+        else:
+            state.consume_stick_displacement()
+        states.append(state)
+    return states
+
+
+def main():
+    states = create_states(1000)
+    for state in states:
+        expected = f"{ControllerStateSerializer.serialize(state)}\r\n".encode('utf-8')
+        assert ControllerStateSerializer.serialize_bytes(state) == expected
+
+    def run_str():
+        for state in states:
+            f"{ControllerStateSerializer.serialize(state)}\r\n".encode('utf-8')
+
+    def run_bytes():
+        for state in states:
+            ControllerStateSerializer.serialize_bytes(state)
+
+    for name, function in (("serialize + encode", run_str), ("serialize_bytes", run_bytes)):
+        best = min(timeit.repeat(function, number=100, repeat=5))
+        print(f"{name:>20}: {best / (100 * len(states)) * 1e9:8.1f} ns/state")
+
+
+if __name__ == "__main__":
+    main()
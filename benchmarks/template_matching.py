@@ -0,0 +1,37 @@
+"""Compare match_template with and without the pyramid on a 1280x720 frame, for a hit and a miss.
+
+Run from the repository root, so that switch_pilot_core is importable without installing it:
+
+    python -m benchmarks.template_matching
+"""
+import timeit
+
+import numpy as np
+
+from switch_pilot_core.image.matching import match_template
+
+
+def textured(rng: np.random.Generator, size: tuple[int, int], cell: int = 8) -> np.ndarray:
+    width, height = size
+    cells = rng.integers(0, 256, (-(-height // cell), -(-width // cell), 3), dtype=np.uint8)
+    return np.repeat(np.repeat(cells, cell, axis=0), cell, axis=1)[:height, :width].copy()
+
+
+def main():
+    rng = np.random.default_rng(0)
+    frame = textured(rng, (1280, 720))
+    templates = {
+        "hit": frame[300:396, 600:728].copy(),
+        "miss": textured(rng, (128, 96)),
+    }
+    for case, template in templates.items():
+        for pyramid_levels in (0, 1, 2):
+            def run():
+                match_template(frame, template, threshold=0.8, pyramid_levels=pyramid_levels)
+
+            best = min(timeit.repeat(run, number=10, repeat=5))
+            print(f"{case:>4} pyramid_levels={pyramid_levels}: {best / 10 * 1e3:7.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
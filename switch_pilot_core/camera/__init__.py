@@ -0,0 +1,4 @@
+from .camera import Camera
+from .frame_buffer import Frame, FrameBuffer
+from .source import DeviceFrameSource, FrameSource, ImageSequenceFrameSource, PacedFrameSource, SyntheticFrameSource, \
+    VideoFileFrameSource, create_frame_source
@@ -0,0 +1,265 @@
+import base64
+import threading
+import time
+from typing import Optional, TYPE_CHECKING
+
+from switch_pilot_core.image import Image, ImageRegion
+from switch_pilot_core.logger import Logger
+from switch_pilot_core.timing import CancellationToken, Clock, SystemClock, VirtualClock
+from switch_pilot_core.utils.env import camera_source, is_packed
+from .frame_buffer import Frame, FrameBuffer
+from .source import DeviceFrameSource, FrameSource, PacedFrameSource, create_frame_source
+
+if TYPE_CHECKING:
+    import cv2
+
+
+class Camera:
+    def __init__(self,
+                 capture_size: tuple[int, int],
+                 logger: Logger):
+        self._id: int = 0
+        self._name: str = "Default"
+
+        self._current_frame: Optional['cv2.typing.MatLike'] = None
+        self._source: Optional[FrameSource] = None
+        self._clock: Clock = SystemClock.shared()
+        self.capture_size = capture_size
+
+        self._frame_buffer: Optional[FrameBuffer] = None
+        self._capture_thread: Optional[threading.Thread] = None
+        self._capture_stop_event = threading.Event()
+
+        self._logger = logger
+
+    @property
+    def id(self) -> int:
+        return self._id
+
+    @id.setter
+    def id(self, new_value: int):
+        self._id = new_value
+
+    @property
+    def name(self) -> str:
+        return self._name
+
+    @name.setter
+    def name(self, new_value: str):
+        self._name = new_value
+
+    @property
+    def current_frame(self) -> Optional['cv2.typing.MatLike']:
+        frame_buffer = self._frame_buffer
+        if frame_buffer is not None:
+            latest = frame_buffer.latest()
+            return latest.mat if latest is not None else None
+        return self._current_frame
+
+    @current_frame.setter
+    def current_frame(self, new_value: Optional['cv2.typing.MatLike']):
+        self._current_frame = new_value
+
+    @property
+    def source(self) -> Optional[FrameSource]:
+        return self._source
+
+    @property
+    def clock(self) -> Clock:
+        """Clock that paces recorded footage and stamps frames; a VirtualClock also pumps a frame on every advance.
+
+        Capturing on a thread is not possible on a virtual clock, because nothing but its owner moves it forward.
+        """
+        return self._clock
+
+    @clock.setter
+    def clock(self, new_value: Clock):
+        if new_value.is_virtual and self.is_capturing:
+            self.stop_capture()
+        previous = self._clock
+        if isinstance(previous, VirtualClock):
+            previous.remove_listener(self._on_clock_advanced)
+        self._clock = new_value
+        if isinstance(new_value, VirtualClock):
+            new_value.add_listener(self._on_clock_advanced)
+        source = self._source
+        if isinstance(source, PacedFrameSource):
+            source.clock = new_value
+
+    @property
+    def is_capturing(self) -> bool:
+        thread = self._capture_thread
+        return thread is not None and thread.is_alive()
+
+    @staticmethod
+    def get_devices():
+        import pygame.camera
+
+        cameras = pygame.camera.list_cameras()
+        return [{'name': name, 'id': i} for i, name in enumerate(cameras)]
+
+    def is_opened(self):
+        return self._source is not None and self._source.is_opened()
+
+    def open(self, source: Optional[FrameSource] = None):
+        """Open source, or the one named by SWITCH_PILOT_CAMERA_SOURCE, or the capture device with this id.
+
+        The capture device is only opened in the packed application.
+        """
+        if source is None:
+            spec = camera_source()
+            if spec is not None:
+                source = create_frame_source(spec, device_id=self.id)
+            elif not is_packed():
+                self._logger.debug("Application is not packed. Skipped open camera.")
+                return
+            else:
+                source = DeviceFrameSource(device_id=self.id)
+
+        if self.is_opened():
+            self._logger.debug("Camera is already opened.")
+            self.release()
+
+        if isinstance(source, PacedFrameSource):
+            source.clock = self._clock
+        if not source.open():
+            if isinstance(source, DeviceFrameSource):
+                print(f"Camera {self.id} can't open.")
+            else:
+                print(f"Camera source {type(source).__name__} can't open.")
+            source.release()
+            return
+
+        self._source = source
+        self.resize()
+
+    def resize(self):
+        if self.is_opened():
+            self._source.resize(self.capture_size)
+
+    def update_frame(self):
+        if not self.is_opened() or self.is_capturing:
+            return
+
+        if self._clock.is_virtual:
+            self.pump()
+            return
+        self.current_frame = self._source.read()
+
+    def pump(self):
+        """Take the frame due at the current clock time without waiting; keeps the last one if none is due."""
+        if not self.is_opened() or self.is_capturing:
+            return
+
+        mat = self._source.read(wait=False)
+        if mat is not None:
+            self.current_frame = mat
+
+    def _on_clock_advanced(self, now: float):
+        self.pump()
+
+    def start_capture(self, buffer_size: int = 8):
+        """Start filling a ring buffer of frames from a dedicated thread."""
+        if not self.is_opened():
+            self._logger.debug("Camera is not opened. Skipped start capture.")
+            return
+        if self._clock.is_virtual:
+            self._logger.debug("Camera clock is virtual. Skipped start capture.")
+            return
+
+        if self.is_capturing:
+            self.stop_capture()
+
+        self._frame_buffer = FrameBuffer(capacity=buffer_size, clock=self._clock)
+        self._capture_stop_event.clear()
+        self._capture_thread = threading.Thread(target=self._capture,
+                                                name=f"{Camera.__name__}:{self.id}",
+                                                daemon=True)
+        self._capture_thread.start()
+
+    def stop_capture(self):
+        self._capture_stop_event.set()
+        thread = self._capture_thread
+        try:
+            if thread is not None and thread.is_alive() and thread is not threading.current_thread():
+                thread.join()
+        finally:
+            self._capture_thread = None
+
+        frame_buffer = self._frame_buffer
+        if frame_buffer is not None:
+            latest = frame_buffer.latest()
+            self.current_frame = latest.mat if latest is not None else None
+        self._frame_buffer = None
+
+    def _capture(self):
+        source = self._source
+        frame_buffer = self._frame_buffer
+        while not self._capture_stop_event.is_set():
+            mat = source.read()
+            if mat is None:
+                # Device hiccup, unplugged or end of footage; avoid spinning on a failing read.
+                time.sleep(0.01)
+                continue
+            frame_buffer.push(mat, source_time=source.source_time)
+
+    def get_latest_frame(self) -> Optional[Frame]:
+        frame_buffer = self._frame_buffer
+        if frame_buffer is None:
+            return None
+        return frame_buffer.latest()
+
+    def wait_for_next_frame(self,
+                            after_sequence: Optional[int] = None,
+                            timeout: Optional[float] = None,
+                            token: Optional[CancellationToken] = None) -> Optional[Frame]:
+        frame_buffer = self._frame_buffer
+        if frame_buffer is None:
+            return None
+        return frame_buffer.wait_for_next(after_sequence=after_sequence, timeout=timeout, token=token)
+
+    def get_past_frame(self, n: int) -> Optional[Frame]:
+        frame_buffer = self._frame_buffer
+        if frame_buffer is None:
+            return None
+        return frame_buffer.look_back(n)
+
+    def encoded_current_frame_base64(self):
+        if not self.is_opened() or self.current_frame is None:
+            return ""
+
+        import cv2
+
+        _, encoded = cv2.imencode(".jpg", self.current_frame)
+        return base64.b64encode(encoded).decode("ascii")
+
+    def get_current_frame(self,
+                          region: Optional[ImageRegion] = None):
+        current_frame = self.current_frame
+        if current_frame is None:
+            self._logger.debug("current_frame is None")
+            return None
+
+        if region is not None:
+            return Image(current_frame).roi(region=region)
+        return Image(current_frame)
+
+    def save_capture(self,
+                     file_path: str,
+                     region: Optional[ImageRegion] = None):
+        image = self.get_current_frame(region=region)
+        if image is None:
+            self._logger.info(f"Capture skipped: image is None")
+            return
+
+        try:
+            image.save(file_path=file_path)
+        except Exception as e:
+            self._logger.error(f"Capture failed: {e}")
+
+    def release(self):
+        self.stop_capture()
+        if self._source is not None:
+            self._source.release()
+            self._source = None
+            self._logger.debug("Camera destroyed.")
@@ -0,0 +1,96 @@
+import threading
+from collections import deque
+from dataclasses import dataclass
+from typing import Optional, TYPE_CHECKING
+
+from switch_pilot_core.timing import CancellationToken, Clock, SystemClock
+
+if TYPE_CHECKING:
+    import cv2
+
+
+@dataclass(frozen=True)
+class Frame:
+    mat: 'cv2.typing.MatLike'
+    timestamp: float
+    """Time of the buffer's clock when the frame was pushed."""
+    sequence: int
+    source_time: Optional[float] = None
+    """Media time of the frame when it comes from recorded footage."""
+
+
+class FrameBuffer:
+    """Fixed-size ring buffer of captured frames shared between a producer and any number of readers."""
+
+    def __init__(self, capacity: int = 8, clock: Optional[Clock] = None):
+        if capacity < 1:
+            raise ValueError(f"capacity must be positive: {capacity}")
+        self._clock = clock if clock is not None else SystemClock.shared()
+        self._frames: deque[Frame] = deque(maxlen=capacity)
+        self._condition = threading.Condition()
+        self._sequence = 0
+
+    @property
+    def capacity(self) -> int:
+        return self._frames.maxlen
+
+    @property
+    def clock(self) -> Clock:
+        return self._clock
+
+    @property
+    def sequence(self) -> int:
+        """Sequence id of the latest frame, 0 if no frame has been pushed yet."""
+        return self._sequence
+
+    def push(self, mat: 'cv2.typing.MatLike', source_time: Optional[float] = None) -> Frame:
+        with self._condition:
+            self._sequence += 1
+            frame = Frame(mat=mat, timestamp=self._clock.now(), sequence=self._sequence, source_time=source_time)
+            self._frames.append(frame)
+            self._condition.notify_all()
+        return frame
+
+    def latest(self) -> Optional[Frame]:
+        with self._condition:
+            return self._frames[-1] if self._frames else None
+
+    def look_back(self, n: int) -> Optional[Frame]:
+        """Get the frame captured n frames before the latest one, None if it is no longer buffered."""
+        if n < 0:
+            raise ValueError(f"n must not be negative: {n}")
+        with self._condition:
+            if n >= len(self._frames):
+                return None
+            return self._frames[-1 - n]
+
+    def wait_for_next(self,
+                      after_sequence: Optional[int] = None,
+                      timeout: Optional[float] = None,
+                      token: Optional[CancellationToken] = None) -> Optional[Frame]:
+        """Wait for a frame newer than after_sequence (default: the latest one), None on timeout or cancellation."""
+        if token is not None:
+            token.add_callback(self._wake)
+        try:
+            with self._condition:
+                if after_sequence is None:
+                    after_sequence = self._sequence
+                cancelled = (lambda: False) if token is None else (lambda: token.is_cancelled)
+                if not self._condition.wait_for(lambda: self._sequence > after_sequence or cancelled(),
+                                                timeout=timeout):
+                    return None
+                if self._sequence <= after_sequence:
+                    return None
+                return self._frames[-1]
+        finally:
+            if token is not None:
+                token.remove_callback(self._wake)
+
+    def _wake(self):
+        with self._condition:
+            self._condition.notify_all()
+
+    def clear(self):
+        with self._condition:
+            self._frames.clear()
+            self._condition.notify_all()
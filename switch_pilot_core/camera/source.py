@@ -0,0 +1,407 @@
+import glob
+import os
+from abc import ABCMeta, abstractmethod
+from typing import Callable, Optional, TYPE_CHECKING
+
+from switch_pilot_core.timing import Clock, SystemClock
+from switch_pilot_core.utils.os import is_windows
+
+if TYPE_CHECKING:
+    import cv2
+
+
+class FrameSource(metaclass=ABCMeta):
+    """Where Camera gets its frames from: a capture device or recorded footage."""
+
+    @abstractmethod
+    def open(self) -> bool:
+        raise NotImplementedError
+
+    @abstractmethod
+    def is_opened(self) -> bool:
+        raise NotImplementedError
+
+    @abstractmethod
+    def read(self, wait: bool = True) -> Optional['cv2.typing.MatLike']:
+        """Block until the next frame is available and return it, None on failure or at the end.
+
+        Sources that pace their frames return None instead of blocking when wait is False and no frame is due.
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def release(self):
+        raise NotImplementedError
+
+    @property
+    def source_time(self) -> Optional[float]:
+        """Media time in seconds of the latest frame read, None for live sources."""
+        return None
+
+    def resize(self, size: tuple[int, int]):
+        pass
+
+
+class DeviceFrameSource(FrameSource):
+    def __init__(self, device_id: int = 0):
+        self._device_id = device_id
+        self._capture: Optional['cv2.VideoCapture'] = None
+
+    @property
+    def device_id(self) -> int:
+        return self._device_id
+
+    def open(self) -> bool:
+        import cv2
+
+        if is_windows():
+            self._capture = cv2.VideoCapture(self._device_id, cv2.CAP_DSHOW)
+        else:
+            self._capture = cv2.VideoCapture(self._device_id)
+        return self.is_opened()
+
+    def is_opened(self) -> bool:
+        return self._capture is not None and self._capture.isOpened()
+
+    def read(self, wait: bool = True) -> Optional['cv2.typing.MatLike']:
+        if not self.is_opened():
+            return None
+        succeeded, mat = self._capture.read()
+        return mat if succeeded else None
+
+    def resize(self, size: tuple[int, int]):
+        if self.is_opened():
+            import cv2
+
+            self._capture.set(cv2.CAP_PROP_FRAME_WIDTH, size[0])
+            self._capture.set(cv2.CAP_PROP_FRAME_HEIGHT, size[1])
+
+    def release(self):
+        if self._capture is not None:
+            self._capture.release()
+            self._capture = None
+
+
+class PacedFrameSource(FrameSource, metaclass=ABCMeta):
+    """Recorded frames delivered like a live camera.
+
+    Frame n is due n / (fps * speed) seconds after the first read. read() waits for the next due frame and,
+    when the reader falls behind, drops the late frames instead of slowing the footage down.
+    On a virtual clock read() never waits, because that would move the shared time forward; it returns None until
+    the owner of the clock advances it to the next frame. speed 0 disables pacing and delivers every frame.
+    """
+
+    def __init__(self, fps: float, speed: float = 1.0, loop: bool = False):
+        if fps <= 0:
+            raise ValueError(f"fps must be positive: {fps}")
+        if speed < 0:
+            raise ValueError(f"speed must not be negative: {speed}")
+        self._fps = fps
+        self._speed = speed
+        self._loop = loop
+        self._size: Optional[tuple[int, int]] = None
+        self._clock: Clock = SystemClock.shared()
+        self._started_at: Optional[float] = None
+        self._index = -1
+        self._position = 0
+        self._dropped_count = 0
+
+    @property
+    def fps(self) -> float:
+        return self._fps
+
+    @property
+    def speed(self) -> float:
+        return self._speed
+
+    @property
+    def loop(self) -> bool:
+        return self._loop
+
+    @property
+    def clock(self) -> Clock:
+        return self._clock
+
+    @clock.setter
+    def clock(self, new_value: Clock):
+        self._clock = new_value
+        self._started_at = None
+
+    @property
+    def dropped_count(self) -> int:
+        """Frames skipped because the reader was late."""
+        return self._dropped_count
+
+    @property
+    def source_time(self) -> Optional[float]:
+        if self._position == 0:
+            return None
+        return (self._position - 1) / self._fps
+
+    def open(self) -> bool:
+        self._started_at = None
+        self._index = -1
+        self._position = 0
+        self._dropped_count = 0
+        return self._open_media()
+
+    def resize(self, size: tuple[int, int]):
+        """Scale delivered frames to size so templates made for the capture size still match."""
+        self._size = size
+
+    def read(self, wait: bool = True) -> Optional['cv2.typing.MatLike']:
+        if not self.is_opened():
+            return None
+
+        next_index = self._index + 1
+        if self._speed > 0:
+            now = self._clock.now()
+            if self._started_at is None:
+                # Anchor the timeline so that the next frame is due now, also after the clock was replaced.
+                self._started_at = now - next_index / (self._fps * self._speed)
+            # The epsilon keeps a frame exactly on its deadline from being rounded down to the previous one.
+            due_index = int((now - self._started_at) * self._speed * self._fps + 1e-9)
+            if due_index > next_index:
+                if not self._seek_forward(due_index - next_index):
+                    return None
+                self._dropped_count += due_index - next_index
+                next_index = due_index
+            elif due_index < next_index:
+                if not wait or self._clock.is_virtual:
+                    return None
+                self._clock.sleep_until(self._started_at + next_index / (self._fps * self._speed))
+
+        mat = self._decode()
+        if mat is None and self._loop and self._position > 0:
+            self._rewind()
+            self._position = 0
+            mat = self._decode()
+        if mat is None:
+            return None
+
+        self._position += 1
+        self._index = next_index
+        return self._fit(mat)
+
+    def _seek_forward(self, frames: int) -> bool:
+        while frames > 0:
+            skipped = self._skip(frames)
+            self._position += skipped
+            frames -= skipped
+            if frames > 0:
+                if not self._loop or self._position == 0:
+                    return False
+                self._rewind()
+                self._position = 0
+        return True
+
+    def _fit(self, mat: 'cv2.typing.MatLike') -> 'cv2.typing.MatLike':
+        size = self._size
+        if size is None or (mat.shape[1], mat.shape[0]) == tuple(size):
+            return mat
+
+        import cv2
+
+        return cv2.resize(mat, size, interpolation=cv2.INTER_AREA)
+
+    @abstractmethod
+    def _open_media(self) -> bool:
+        raise NotImplementedError
+
+    @abstractmethod
+    def _decode(self) -> Optional['cv2.typing.MatLike']:
+        """Decode the frame at the current position, None at the end."""
+        raise NotImplementedError
+
+    @abstractmethod
+    def _skip(self, frames: int) -> int:
+        """Move forward without decoding and return how many frames were skipped before the end."""
+        raise NotImplementedError
+
+    @abstractmethod
+    def _rewind(self):
+        raise NotImplementedError
+
+
+class VideoFileFrameSource(PacedFrameSource):
+    def __init__(self, file_path: str, speed: float = 1.0, loop: bool = False, fps: Optional[float] = None):
+        """fps defaults to the rate stored in the file."""
+        super().__init__(fps=fps if fps is not None else 30.0, speed=speed, loop=loop)
+        self._file_path = file_path
+        self._fps_override = fps
+        self._capture: Optional['cv2.VideoCapture'] = None
+
+    @property
+    def file_path(self) -> str:
+        return self._file_path
+
+    def _open_media(self) -> bool:
+        import cv2
+
+        self.release()
+        self._capture = cv2.VideoCapture(self._file_path)
+        if not self._capture.isOpened():
+            return False
+        file_fps = self._capture.get(cv2.CAP_PROP_FPS)
+        if self._fps_override is None and file_fps > 0:
+            self._fps = file_fps
+        return True
+
+    def is_opened(self) -> bool:
+        return self._capture is not None and self._capture.isOpened()
+
+    def _decode(self) -> Optional['cv2.typing.MatLike']:
+        succeeded, mat = self._capture.read()
+        return mat if succeeded else None
+
+    def _skip(self, frames: int) -> int:
+        for skipped in range(frames):
+            if not self._capture.grab():
+                return skipped
+        return frames
+
+    def _rewind(self):
+        import cv2
+
+        self._capture.set(cv2.CAP_PROP_POS_FRAMES, 0)
+
+    def release(self):
+        if self._capture is not None:
+            self._capture.release()
+            self._capture = None
+
+
+class ImageSequenceFrameSource(PacedFrameSource):
+    def __init__(self,
+                 directory: str,
+                 fps: float = 30.0,
+                 speed: float = 1.0,
+                 loop: bool = False,
+                 pattern: str = "*.png"):
+        """Frames are the files in directory matching pattern, in file name order."""
+        super().__init__(fps=fps, speed=speed, loop=loop)
+        self._directory = directory
+        self._pattern = pattern
+        self._files: Optional[list[str]] = None
+
+    @property
+    def directory(self) -> str:
+        return self._directory
+
+    def _open_media(self) -> bool:
+        self._files = sorted(glob.glob(os.path.join(glob.escape(self._directory), self._pattern)))
+        return len(self._files) > 0
+
+    def is_opened(self) -> bool:
+        return self._files is not None and len(self._files) > 0
+
+    def _decode(self) -> Optional['cv2.typing.MatLike']:
+        if self._position >= len(self._files):
+            return None
+
+        import cv2
+
+        return cv2.imread(self._files[self._position], cv2.IMREAD_COLOR)
+
+    def _skip(self, frames: int) -> int:
+        return max(min(frames, len(self._files) - self._position), 0)
+
+    def _rewind(self):
+        pass
+
+    def release(self):
+        self._files = None
+
+
+class SyntheticFrameSource(PacedFrameSource):
+    def __init__(self,
+                 size: tuple[int, int] = (1280, 720),
+                 fps: float = 30.0,
+                 speed: float = 1.0,
+                 loop: bool = False,
+                 frame_count: Optional[int] = None,
+                 generator: Optional[Callable[[int], 'cv2.typing.MatLike']] = None):
+        """Frames come from generator(position); the default draws a square moving over a gradient.
+
+        frame_count None makes the source endless.
+        """
+        super().__init__(fps=fps, speed=speed, loop=loop)
+        self._frame_size = size
+        self._frame_count = frame_count
+        self._generator = generator if generator is not None else self._default_frame
+        self._is_opened = False
+
+    def _open_media(self) -> bool:
+        self._is_opened = True
+        return True
+
+    def is_opened(self) -> bool:
+        return self._is_opened
+
+    def _decode(self) -> Optional['cv2.typing.MatLike']:
+        if self._frame_count is not None and self._position >= self._frame_count:
+            return None
+        return self._generator(self._position)
+
+    def _skip(self, frames: int) -> int:
+        if self._frame_count is None:
+            return frames
+        return max(min(frames, self._frame_count - self._position), 0)
+
+    def _rewind(self):
+        pass
+
+    def release(self):
+        self._is_opened = False
+
+    def _default_frame(self, position: int) -> 'cv2.typing.MatLike':
+        import numpy as np
+
+        width, height = self._frame_size
+        gradient = np.linspace(0, 96, width, dtype=np.uint8)
+        mat = np.empty((height, width, 3), dtype=np.uint8)
+        mat[:] = gradient[np.newaxis, :, np.newaxis]
+        side = max(min(width, height) // 8, 1)
+        x = (position * 8) % max(width - side, 1)
+        y = (height - side) // 2
+        mat[y:y + side, x:x + side] = 255
+        return mat
+
+
+def create_frame_source(spec: str, device_id: int = 0) -> FrameSource:
+    """Build a frame source from a spec such as "video:/path/to/run.mp4?speed=4&loop=1".
+
+    Kinds are device[:id], video:<file>, images:<directory> and synthetic. Options are speed, loop and fps,
+    plus pattern for images and width, height and frames for synthetic.
+    """
+    kind, _, rest = spec.partition(':')
+    if '?' in rest:
+        target, _, query = rest.rpartition('?')
+    elif '?' in kind:
+        kind, _, query = kind.partition('?')
+        target = rest
+    else:
+        target, query = rest, ''
+    options = dict(option.partition('=')[::2] for option in query.split('&') if option != '')
+
+    kind = kind.strip().lower()
+    speed = float(options.get('speed', 1.0))
+    loop = options.get('loop', '0').lower() in ('1', 'true', 'yes')
+    fps = float(options['fps']) if 'fps' in options else None
+    if kind == 'device':
+        return DeviceFrameSource(device_id=int(target) if target != '' else device_id)
+    if kind == 'video':
+        return VideoFileFrameSource(file_path=target, speed=speed, loop=loop, fps=fps)
+    if kind == 'images':
+        return ImageSequenceFrameSource(directory=target,
+                                        fps=fps if fps is not None else 30.0,
+                                        speed=speed,
+                                        loop=loop,
+                                        pattern=options.get('pattern', "*.png"))
+    if kind == 'synthetic':
+        return SyntheticFrameSource(size=(int(options.get('width', 1280)), int(options.get('height', 720))),
+                                    fps=fps if fps is not None else 30.0,
+                                    speed=speed,
+                                    loop=loop,
+                                    frame_count=int(options['frames']) if 'frames' in options else None)
+    raise ValueError(f"Unknown camera source: {spec}")
@@ -1,4 +1,8 @@
-from .api import CommandAPI, CommandConfigAPI, CommandExtensionsAPI, CommandImageAPI, CommandTimerAPI, CommandVideoAPI
+from .api import CommandAPI, CommandConfigAPI, CommandExtensionsAPI, CommandImageAPI, CommandTimerAPI, CommandVideoAPI, \
+    TemplateWaitResult
 from .base import BaseCommand, check_should_keep_running, CommandCancellationError
 from .loader import CommandLoader
+from .macro import CompiledMacro, Hold, Macro, MacroExecutor, MacroProfile, MacroStep, Press, Release, StepProfile, Wait, \
+    WaitForTemplate
 from .runner import CommandRunner
+from .time_leap import DateTimeField, FieldPlan, HoldScrollProfile, TimeLeapPlan, TimeLeapPlanner
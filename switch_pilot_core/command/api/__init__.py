@@ -1,6 +1,6 @@
 from .command import CommandAPI
 from .config import CommandConfigAPI
-from .extensions import CommandExtensionsAPI
+from .extensions import CommandExtensionsAPI, TemplateWaitResult
 from .image import CommandImageAPI
 from .timer import CommandTimerAPI
 from .video import CommandVideoAPI
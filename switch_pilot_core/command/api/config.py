@@ -1,4 +1,7 @@
+from typing import Optional, Type
+
 from switch_pilot_core.config import Config
+from switch_pilot_core.config.config import Model
 
 
 class CommandConfigAPI:
@@ -6,5 +9,5 @@ class CommandConfigAPI:
         self._config = config
         self._command = command
 
-    def read(self):
-        return self._config.read_command_config(name=self._command)
+    def read(self, model: Optional[Type[Model]] = None):
+        return self._config.read_command_config(name=self._command, model=model)
@@ -1,9 +1,25 @@
-from time import sleep, perf_counter
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Optional, Union
 
 from switch_pilot_core.camera import Camera
 from switch_pilot_core.controller import Controller, Button, StickDisplacementPreset as Displacement
-from switch_pilot_core.image import Image, ImageRegion
+from switch_pilot_core.image import Image, ImageRegion, TemplateCache, TemplateMatch, TemplateQuery
 from switch_pilot_core.path import Path
+from switch_pilot_core.timing import CancellationToken, Clock
+from ..macro import CompiledMacro, Macro, MacroExecutor, MacroProfile, MacroStep, Press, Wait, WaitForTemplate
+from ..time_leap import TimeLeapPlanner
+
+
+@dataclass(frozen=True)
+class TemplateWaitResult:
+    match: TemplateMatch
+    index: int
+    """Index of the matched query in the list passed to wait_for_any."""
+    timestamp: float
+    """Clock time the matched frame was captured at."""
+    elapsed: float
+    """Seconds from the start of the wait to the capture of the matched frame."""
 
 
 class CommandExtensionsAPI:
@@ -16,6 +32,9 @@ class CommandExtensionsAPI:
         self._camera = camera
         self._path = path
         self._attempt_count = 0
+        # Built-in routines are built once so that their schedules are compiled only once.
+        self._goto_home_macro = Macro('goto_home', self._goto_home_steps())
+        self._restart_sv_macro: Optional[tuple[Image, Macro]] = None
 
     def prepare(self, command):
         self._command = command
@@ -34,24 +53,87 @@ class CommandExtensionsAPI:
     def should_exit(self):
         return not self.should_keep_running
 
+    @property
+    def clock(self) -> Clock:
+        return self._controller.clock
+
+    @property
+    def cancellation_token(self) -> Optional[CancellationToken]:
+        if self._command is None:
+            return None
+        return self._command.cancellation_token
+
     def attempt(self):
         self._attempt_count += 1
 
     def wait(self, duration: float, check_interval: float = 1.0):
-        if check_interval <= 0:
-            check_interval = 1.0
-
-        if float(duration) > 0.1:
-            elapsed = 0
-            while self.should_keep_running and elapsed < duration:
-                remaining = duration - elapsed
-                sleep_duration = min(remaining, check_interval)
-                sleep(sleep_duration)
-                elapsed += sleep_duration
-        else:
-            current_time = perf_counter()
-            while perf_counter() < current_time + duration:
-                pass
+        """Sleep for duration and return as soon as the command is stopped.
+
+        check_interval is no longer used; the wait blocks on the cancellation token instead of polling.
+        """
+        self.clock.sleep(duration, token=self.cancellation_token)
+
+    def wait_for_template(self,
+                          template: Image,
+                          threshold: float,
+                          region: Optional[ImageRegion] = None,
+                          timeout: Optional[float] = None,
+                          pyramid_levels: int = 0,
+                          poll_interval: float = 0.01) -> Optional[TemplateWaitResult]:
+        query = TemplateQuery(template=template, threshold=threshold, region=region)
+        return self.wait_for_any([query], timeout=timeout, pyramid_levels=pyramid_levels, poll_interval=poll_interval)
+
+    def wait_for_any(self,
+                     queries: list[TemplateQuery],
+                     timeout: Optional[float] = None,
+                     pyramid_levels: int = 0,
+                     poll_interval: float = 0.01) -> Optional[TemplateWaitResult]:
+        """Check every newly captured frame until one of queries matches.
+
+        Returns None on timeout or cancellation. The best scoring query wins when several match the same frame.
+        poll_interval is only used when the camera is not capturing on its own thread or the clock is virtual;
+        then the current frame is polled and every poll moves a virtual clock forward.
+        """
+        clock = self.clock
+        start = clock.now()
+        deadline = None if timeout is None else start + timeout
+        last_sequence: Optional[int] = None
+        last_mat = None
+        token = self.cancellation_token
+        while self.should_keep_running:
+            remaining = None if deadline is None else deadline - clock.now()
+            if remaining is not None and remaining <= 0:
+                return None
+
+            if self._camera.is_capturing and not clock.is_virtual:
+                # The frame wait is in real time; wake up regularly to check the deadline on the clock and to notice
+                # a stopped command without a token.
+                frame_timeout = 0.1 if remaining is None else min(remaining, 0.1)
+                frame = self._camera.wait_for_next_frame(after_sequence=last_sequence,
+                                                         timeout=frame_timeout,
+                                                         token=token)
+                if frame is None:
+                    continue
+                last_sequence = frame.sequence
+                mat, timestamp = frame.mat, frame.timestamp
+            else:
+                mat = self._camera.current_frame
+                if mat is None or mat is last_mat:
+                    poll_timeout = poll_interval if remaining is None else min(poll_interval, remaining)
+                    clock.sleep(poll_timeout, token=token)
+                    continue
+                last_mat = mat
+                timestamp = clock.now()
+
+            matches = Image(mat).match_templates(queries, pyramid_levels=pyramid_levels)
+            matched = [(i, match) for i, match in enumerate(matches) if match.matched]
+            if len(matched) > 0:
+                index, match = max(matched, key=lambda item: item[1].score)
+                return TemplateWaitResult(match=match,
+                                          index=index,
+                                          timestamp=timestamp,
+                                          elapsed=timestamp - start)
+        return None
 
     def get_recognition(self, buttons: list[Button]):
         self._controller.send_repeat(buttons=buttons,
@@ -60,59 +142,48 @@ class CommandExtensionsAPI:
                                      interval=0.8,
                                      skip_last_interval=False)
 
+    def run_macro(self, macro: Union[Macro, CompiledMacro]) -> MacroProfile:
+        executor = MacroExecutor(controller=self._controller,
+                                 should_exit=lambda: self.should_exit,
+                                 wait_for_template=self._wait_for_template_step)
+        return executor.run(macro)
+
+    def _wait_for_template_step(self, step: WaitForTemplate) -> Optional[TemplateWaitResult]:
+        return self.wait_for_template(template=step.template,
+                                      threshold=step.threshold,
+                                      region=step.region,
+                                      timeout=step.timeout,
+                                      pyramid_levels=step.pyramid_levels)
+
     def goto_home(self):
-        self._controller.send_one_shot(buttons=[Button.HOME])
-        self.wait(1)
+        self.run_macro(self._goto_home_macro)
 
     def restart_sv(self):
-        self.goto_home()
-        if self.should_exit:
-            return
-
-        # Shutdown Software
-        self._controller.send_one_shot(buttons=[Button.X],
-                                       duration=0.05)
-        if self.should_exit:
-            return
-        self.wait(0.5)
-        if self.should_exit:
-            return
-        self._controller.send_one_shot(buttons=[Button.A],
-                                       duration=0.05)
-        if self.should_exit:
-            return
-        self.wait(3.0)
-        if self.should_exit:
-            return
-
-        # Launch Software
-        self._controller.send_repeat(buttons=[Button.A],
-                                     times=5,
-                                     duration=0.05,
-                                     interval=0.5)
-        if self.should_exit:
-            return
-
-        # Wait for detect game freak logo
-        logo_template = Image.from_file(self._path.template("game_freak_logo.png"))
+        logo_template = TemplateCache.shared().get(self._path.template("game_freak_logo.png"))
+        cached = self._restart_sv_macro
+        # The cache hands out a new template only when the logo file changed, and only then is the macro rebuilt.
+        if cached is None or cached[0] is not logo_template:
+            cached = (logo_template, self._restart_sv(logo_template))
+            self._restart_sv_macro = cached
+        return self.run_macro(cached[1])
+
+    def _restart_sv(self, logo_template: Image) -> Macro:
         capture_region = ImageRegion(x=(0.18, 0.23), y=(0.44, 0.58))
-        while not self._camera.get_current_frame(capture_region).to_gray_scale().contains(logo_template, threshold=0.8):
-            if self.should_exit:
-                return
-            self.wait(0.1)
-        if self.should_exit:
-            return
-
-        # Wait for 7 seconds and press A button
-        self.wait(7.0)
-        if self.should_exit:
-            return
-        self._controller.send_repeat(buttons=[Button.A],
-                                     times=5,
-                                     duration=0.05,
-                                     interval=0.5)
-        if self.should_exit:
-            return
+        return Macro('restart_sv', [
+            *self._goto_home_steps(),
+            # Shutdown Software
+            Press(buttons=(Button.X,), duration=0.05),
+            Wait(0.5),
+            Press(buttons=(Button.A,), duration=0.05),
+            Wait(3.0),
+            # Launch Software
+            Press(buttons=(Button.A,), times=5, duration=0.05, interval=0.5),
+            # Wait for detect game freak logo
+            WaitForTemplate(template=logo_template, threshold=0.8, region=capture_region, name='game_freak_logo'),
+            # Wait for 7 seconds and press A button
+            Wait(7.0),
+            Press(buttons=(Button.A,), times=5, duration=0.05, interval=0.5),
+        ])
 
     def time_leap(self,
                   years: int = 0,
@@ -121,124 +192,68 @@ class CommandExtensionsAPI:
                   hours: int = 0,
                   minutes: int = 0,
                   toggle_auto: bool = False,
-                  with_reset: bool = False):
-        self.goto_home()
-        if self.should_exit:
-            return
-
-        # Goto System Settings
-        self._controller.send_one_shot(l_displacement=Displacement.BOTTOM)
-        if self.should_exit:
-            return
-        self._controller.send_repeat(l_displacement=Displacement.RIGHT,
-                                     times=5)
-        if self.should_exit:
-            return
-        self._controller.send_one_shot(buttons=[Button.A])
-        if self.should_exit:
-            return
-        self._command.wait(1.5)
-
-        if self.should_exit:
-            return
-
-        # Goto System
-        self._controller.send_one_shot(l_displacement=Displacement.BOTTOM,
-                                       duration=2)
-        if self.should_exit:
-            return
-        self._command.wait(0.3)
-        if self.should_exit:
-            return
-        self._controller.send_one_shot(buttons=[Button.A])
-        if self.should_exit:
-            return
-        self._command.wait(0.2)
-
-        if self.should_exit:
-            return
-
-        # Goto Date and Time
-        self._controller.send_one_shot(l_displacement=Displacement.BOTTOM,
-                                       duration=0.7)
-        if self.should_exit:
-            return
-        self._command.wait(0.2)
-        if self.should_exit:
-            return
-        self._controller.send_one_shot(buttons=[Button.A])
-        if self.should_exit:
-            return
-        self._command.wait(0.2)
-        if self.should_exit:
-            return
-
-        if self.should_exit:
-            return
-
+                  with_reset: bool = False,
+                  current: Optional[datetime] = None,
+                  planner: Optional[TimeLeapPlanner] = None):
+        """Shift the console clock by the given field changes.
+
+        current is the date and time displayed before the change; when given, days also wrap within the month.
+        """
+        steps = [
+            *self._goto_home_steps(),
+            # Goto System Settings
+            Press(l_displacement=Displacement.BOTTOM),
+            Press(l_displacement=Displacement.RIGHT, times=5),
+            Press(buttons=(Button.A,)),
+            Wait(1.5),
+            # Goto System
+            Press(l_displacement=Displacement.BOTTOM, duration=2),
+            Wait(0.3),
+            Press(buttons=(Button.A,)),
+            Wait(0.2),
+            # Goto Date and Time
+            Press(l_displacement=Displacement.BOTTOM, duration=0.7),
+            Wait(0.2),
+            Press(buttons=(Button.A,)),
+            Wait(0.2),
+        ]
         if with_reset:
-            self._controller.send_one_shot(buttons=[Button.A])
-            if self.should_exit:
-                return
-            self._command.wait(0.2)
-            if self.should_exit:
-                return
-            self._controller.send_one_shot(buttons=[Button.A])
-            if self.should_exit:
-                return
-            self._command.wait(0.2)
-
-        if self.should_exit:
-            return
+            steps += [
+                Press(buttons=(Button.A,)),
+                Wait(0.2),
+                Press(buttons=(Button.A,)),
+                Wait(0.2),
+            ]
 
         # Toggle auto clock
         if toggle_auto:
-            self._controller.send_one_shot(buttons=[Button.A])
-            if self.should_exit:
-                return
-            self._command.wait(0.2)
-
-        if self.should_exit:
-            return
+            steps += [
+                Press(buttons=(Button.A,)),
+                Wait(0.2),
+            ]
 
         # Goto Current Date and Time
-        self._controller.send_repeat(l_displacement=Displacement.BOTTOM,
-                                     times=2)
-        if self.should_exit:
-            return
-        self._controller.send_one_shot(buttons=[Button.A])
-        if self.should_exit:
-            return
-        self._command.wait(0.2)
-
-        if self.should_exit:
-            return
-
-        def change(diff: int):
-            if diff < 0:
-                self._controller.send_repeat(l_displacement=Displacement.BOTTOM,
-                                             times=-diff)
-            else:
-                self._controller.send_repeat(l_displacement=Displacement.TOP,
-                                             times=diff)
-            self._controller.send_one_shot(l_displacement=Displacement.RIGHT)
+        steps += [
+            Press(l_displacement=Displacement.BOTTOM, times=2),
+            Press(buttons=(Button.A,)),
+            Wait(0.2),
+        ]
 
         # Change datetime
-        change(years)
-        if self.should_exit:
-            return
-        change(months)
-        if self.should_exit:
-            return
-        change(days)
-        if self.should_exit:
-            return
-        change(hours)
-        if self.should_exit:
-            return
-        change(minutes)
-        if self.should_exit:
-            return
+        if planner is None:
+            planner = TimeLeapPlanner()
+        plan = planner.plan(years=years, months=months, days=days, hours=hours, minutes=minutes, current=current)
+        for field_plan in plan.fields:
+            steps += field_plan.to_steps(press_duration=planner.press_duration, press_interval=planner.press_interval)
+            steps.append(Press(l_displacement=Displacement.RIGHT))
 
         # Confirm datetime changes
-        self._controller.send_one_shot(buttons=[Button.A])
+        steps.append(Press(buttons=(Button.A,)))
+        return self.run_macro(Macro('time_leap', steps))
+
+    @staticmethod
+    def _goto_home_steps() -> list[MacroStep]:
+        return [
+            Press(buttons=(Button.HOME,)),
+            Wait(1),
+        ]
@@ -1,10 +1,11 @@
-from typing import Optional
+from typing import Optional, TYPE_CHECKING
 
-from easyocr import easyocr
-
-from switch_pilot_core.image import Image, ImageRegion
+from switch_pilot_core.image import Image, ImageRegion, TemplateCache, TemplateMatch, TemplateQuery, TextReaderRegistry
 from switch_pilot_core.path import Path
 
+if TYPE_CHECKING:
+    from easyocr import easyocr
+
 
 class CommandImageAPI:
     def __init__(self, command: str, path: Path):
@@ -13,12 +14,28 @@ class CommandImageAPI:
 
     def read_template(self, name: str, use_gray_scale: bool = True) -> Image:
         path = self._path.template(command=self._command, name=name)
-        return Image.from_file(file_path=path, use_gray_scale=use_gray_scale)
+        return TemplateCache.shared().get(file_path=path, use_gray_scale=use_gray_scale)
 
     @staticmethod
-    def create_text_reader(langs: Optional[list[str]] = None) -> easyocr.Reader:
+    def create_text_reader(langs: Optional[list[str]] = None) -> 'easyocr.Reader':
         return Image.get_text_reader(langs=langs)
 
+    @staticmethod
+    def warm_up_text_reader(langs: Optional[list[str]] = None):
+        """Start loading the reader in the background so the first text detection does not block."""
+        TextReaderRegistry.shared().warm_up(langs=langs)
+
+    @staticmethod
+    def create_template_query(template: Image,
+                              threshold: float,
+                              region: Optional[ImageRegion] = None,
+                              name: Optional[str] = None) -> TemplateQuery:
+        return TemplateQuery(template=template, threshold=threshold, region=region, name=name)
+
+    @staticmethod
+    def match_templates(frame: Image, queries: list[TemplateQuery], pyramid_levels: int = 0) -> list[TemplateMatch]:
+        return frame.match_templates(queries, pyramid_levels=pyramid_levels)
+
     @staticmethod
     def create_region(x: tuple[float, float], y: tuple[float, float]) -> ImageRegion:
         return ImageRegion(x=x, y=y)
@@ -1,11 +1,18 @@
 from abc import ABCMeta, abstractmethod
-from typing import Any, Optional
+from datetime import datetime
+from typing import Any, Optional, TYPE_CHECKING
 
 from switch_pilot_core.controller import Controller, Button, Hat, StickDisplacementPreset
-from switch_pilot_core.image import ImageRegion
+from switch_pilot_core.image import Image, ImageRegion, TemplateQuery
 from switch_pilot_core.logger import Logger
 from switch_pilot_core.timer import ElapsedTime
-from .api import CommandAPI, CommandExtensionsAPI, CommandImageAPI, CommandTimerAPI, CommandVideoAPI
+from switch_pilot_core.timing import CancellationToken
+from .macro import Macro, MacroProfile
+from .time_leap import TimeLeapPlanner
+from .api import CommandAPI, CommandExtensionsAPI, CommandImageAPI, CommandTimerAPI, CommandVideoAPI, TemplateWaitResult
+
+if TYPE_CHECKING:
+    from easyocr import easyocr
 
 
 class CommandCancellationError(Exception):
@@ -24,12 +31,43 @@ def check_should_keep_running(f):
 
 
 class BaseCommand(metaclass=ABCMeta):
+    preload_text_reader = False
+    """Start loading the text reader in the background when the command starts, for commands that read text."""
+
     def __init__(self, api: CommandAPI):
         self._api = api
-        self.text_reader = None
-        self.should_keep_running = False
+        self._text_reader = None
+        self._cancellation_token = CancellationToken()
+        self._cancellation_token.cancel()
         self.is_alive = False
 
+    @property
+    def cancellation_token(self) -> CancellationToken:
+        """Token cancelled by stop(); waits block on it so a stop takes effect at once."""
+        return self._cancellation_token
+
+    @property
+    def text_reader(self) -> 'easyocr.Reader':
+        """Reader used for text detection, loaded from the shared registry on first use unless one is set."""
+        if self._text_reader is not None:
+            return self._text_reader
+        return self.image.create_text_reader()
+
+    @text_reader.setter
+    def text_reader(self, new_value: Optional['easyocr.Reader']):
+        self._text_reader = new_value
+
+    @property
+    def should_keep_running(self) -> bool:
+        return not self._cancellation_token.is_cancelled
+
+    @should_keep_running.setter
+    def should_keep_running(self, new_value: bool):
+        if not new_value:
+            self._cancellation_token.cancel()
+        elif self._cancellation_token.is_cancelled:
+            self._cancellation_token = CancellationToken()
+
     @property
     def should_exit(self):
         return not self.should_keep_running
@@ -85,12 +123,16 @@ class BaseCommand(metaclass=ABCMeta):
     def preprocess(self):
         self.api.extensions.prepare(self)
         self.timer.start()
-        self.text_reader = self.image.create_text_reader()
+        if self.preload_text_reader:
+            self.image.warm_up_text_reader()
         self.should_keep_running = True
+        self.controller.cancellation_token = self._cancellation_token
         self.is_alive = True
 
     def postprocess(self):
         self.should_keep_running = False
+        if self.controller.cancellation_token is self._cancellation_token:
+            self.controller.cancellation_token = None
         self.is_alive = False
 
     def stop(self):
@@ -207,14 +249,18 @@ class BaseCommand(metaclass=ABCMeta):
                   hours: int = 0,
                   minutes: int = 0,
                   toggle_auto: bool = False,
-                  with_reset: bool = False):
+                  with_reset: bool = False,
+                  current: Optional[datetime] = None,
+                  planner: Optional[TimeLeapPlanner] = None):
         self.extensions.time_leap(years=years,
                                   months=months,
                                   days=days,
                                   hours=hours,
                                   minutes=minutes,
                                   toggle_auto=toggle_auto,
-                                  with_reset=with_reset)
+                                  with_reset=with_reset,
+                                  current=current,
+                                  planner=planner)
 
     @check_should_keep_running
     def attempt(self):
@@ -253,6 +299,33 @@ class BaseCommand(metaclass=ABCMeta):
         return self.video.get_current_frame(region=region).detect_text(reader=self.text_reader,
                                                                        threshold=threshold)
 
+    def wait_for_template(self,
+                          template: Image,
+                          threshold: float,
+                          region: Optional[ImageRegion] = None,
+                          timeout: Optional[float] = None,
+                          pyramid_levels: int = 0,
+                          poll_interval: float = 0.01) -> Optional[TemplateWaitResult]:
+        return self.extensions.wait_for_template(template=template,
+                                                 threshold=threshold,
+                                                 region=region,
+                                                 timeout=timeout,
+                                                 pyramid_levels=pyramid_levels,
+                                                 poll_interval=poll_interval)
+
+    def wait_for_any(self,
+                     queries: list[TemplateQuery],
+                     timeout: Optional[float] = None,
+                     pyramid_levels: int = 0,
+                     poll_interval: float = 0.01) -> Optional[TemplateWaitResult]:
+        return self.extensions.wait_for_any(queries=queries,
+                                            timeout=timeout,
+                                            pyramid_levels=pyramid_levels,
+                                            poll_interval=poll_interval)
+
+    def run_macro(self, macro: Macro) -> MacroProfile:
+        return self.extensions.run_macro(macro)
+
     def get_recognition(self, buttons: Optional[list[Button]] = None):
         if buttons is None:
             self.extensions.get_recognition(buttons=[Button.ZL])
@@ -1,31 +1,198 @@
+import hashlib
 import importlib.util
+import json
 import os
-from typing import Type, Any
+import re
+import sys
+import threading
+from dataclasses import dataclass
+from types import ModuleType
+from typing import Type, Any, Optional
 
-from switch_pilot_core.config import Config
+from switch_pilot_core.config import Config, freeze, thaw
 from switch_pilot_core.path import Path
 
+_MODULE_PACKAGE = 'switch_pilot_commands'
+_MANIFEST_FILE_NAME = '.commands_manifest.json'
+_MANIFEST_VERSION = 1
+
+
+@dataclass
+class _LoadedCommand:
+    module: ModuleType
+    mtime_ns: int
+    file_size: int
+    digest: str
+
 
 class CommandLoader:
+    """Loads command modules once and re-executes them only when their command.py changes.
+
+    Command names and configs are indexed in a manifest next to the commands directory, so listing commands does
+    not have to parse every config.json again on the next start.
+    """
+
     def __init__(self, config: Config, path: Path):
         self._config = config
         self._path = path
+        self._lock = threading.RLock()
+        self._loaded: dict[str, _LoadedCommand] = {}
+        self._manifest: Optional[dict[str, Any]] = None
 
     def load(self, name: str) -> Type[Any]:
         return self._get_class(name)
 
+    def reload(self, names: Optional[list[str]] = None) -> list[str]:
+        """Re-execute the loaded commands whose command.py changed and return their names."""
+        with self._lock:
+            if names is None:
+                names = list(self._loaded.keys())
+            reloaded = []
+            for name in names:
+                loaded = self._loaded.get(name)
+                try:
+                    module = self._get_module(name)
+                except FileNotFoundError:
+                    self.unload(name)
+                    continue
+                if loaded is None or module is not loaded.module:
+                    reloaded.append(name)
+            return reloaded
+
+    def unload(self, name: str):
+        with self._lock:
+            loaded = self._loaded.pop(name, None)
+            if loaded is not None and sys.modules.get(loaded.module.__name__) is loaded.module:
+                del sys.modules[loaded.module.__name__]
+
     def get_names(self) -> list[str]:
-        return [name for name in os.listdir(self._path.commands())
-                if not name.startswith('.')]
+        commands_path = self._path.commands()
+        with self._lock:
+            manifest = self._read_manifest()
+            directory_mtime_ns = os.stat(commands_path).st_mtime_ns
+            if manifest.get('directory_mtime_ns') == directory_mtime_ns:
+                return list(manifest['names'])
+
+            names = [name for name in os.listdir(commands_path)
+                     if not name.startswith('.')]
+            manifest['directory_mtime_ns'] = directory_mtime_ns
+            manifest['names'] = names
+            self._write_manifest()
+            return names
 
     def get_info(self):
-        return [{
-            'name': name,
-            'config': self._config.read_command_config(name)
-        } for name in self.get_names()]
+        with self._lock:
+            names = self.get_names()
+            manifest = self._read_manifest()
+            configs: dict[str, Any] = manifest['configs']
+            changed = False
+            info = []
+            for name in names:
+                config_path = os.path.join(self._path.command(name), "config.json")
+                try:
+                    stat = os.stat(config_path)
+                except FileNotFoundError:
+                    configs.pop(name, None)
+                    raise FileNotFoundError(f"Config file not found: {config_path}")
+
+                entry = configs.get(name)
+                if entry is None or entry['mtime_ns'] != stat.st_mtime_ns or entry['size'] != stat.st_size:
+                    entry = {
+                        'mtime_ns': stat.st_mtime_ns,
+                        'size': stat.st_size,
+                        'config': freeze(self._config.read_command_config(name)),
+                    }
+                    configs[name] = entry
+                    changed = True
+                info.append({
+                    'name': name,
+                    'config': thaw(entry['config']),
+                })
+
+            for name in set(configs.keys()) - set(names):
+                del configs[name]
+                changed = True
+            if changed:
+                self._write_manifest()
+            return info
 
     def _get_class(self, name: str) -> Type[Any]:
-        spec = importlib.util.spec_from_file_location('command', f"{self._path.command(name)}/command.py")
+        with self._lock:
+            return self._get_module(name).Command
+
+    def _get_module(self, name: str) -> ModuleType:
+        file_path = f"{self._path.command(name)}/command.py"
+        stat = os.stat(file_path)
+        loaded = self._loaded.get(name)
+        if loaded is not None and loaded.mtime_ns == stat.st_mtime_ns and loaded.file_size == stat.st_size:
+            return loaded.module
+
+        with open(file_path, 'rb') as command_file:
+            digest = hashlib.sha256(command_file.read()).hexdigest()
+        if loaded is not None and loaded.digest == digest:
+            # Touched but not edited, so the module does not have to run again.
+            loaded.mtime_ns = stat.st_mtime_ns
+            loaded.file_size = stat.st_size
+            return loaded.module
+
+        module_name = self._module_name(name)
+        spec = importlib.util.spec_from_file_location(module_name, file_path)
         module = importlib.util.module_from_spec(spec)
-        spec.loader.exec_module(module)
-        return module.Command
+        previous = sys.modules.get(module_name)
+        sys.modules[module_name] = module
+        try:
+            spec.loader.exec_module(module)
+        except BaseException:
+            if previous is None:
+                del sys.modules[module_name]
+            else:
+                sys.modules[module_name] = previous
+            raise
+
+        self._loaded[name] = _LoadedCommand(module=module,
+                                            mtime_ns=stat.st_mtime_ns,
+                                            file_size=stat.st_size,
+                                            digest=digest)
+        return module
+
+    @staticmethod
+    def _module_name(name: str) -> str:
+        # Command directory names are free-form, so keep a readable part and add a hash to stay unique.
+        identifier = re.sub(r'\W', '_', name)
+        suffix = hashlib.sha1(name.encode('utf-8')).hexdigest()[:8]
+        return f"{_MODULE_PACKAGE}.{identifier}_{suffix}"
+
+    def _manifest_path(self) -> str:
+        # Kept outside the commands directory so that writing it does not change the directory mtime.
+        return os.path.join(self._path.user_directory(), _MANIFEST_FILE_NAME)
+
+    def _read_manifest(self) -> dict[str, Any]:
+        if self._manifest is not None:
+            return self._manifest
+
+        manifest = None
+        try:
+            with open(self._manifest_path(), encoding='utf-8') as manifest_file:
+                manifest = json.load(manifest_file)
+        except (OSError, ValueError):
+            pass
+        if not isinstance(manifest, dict) or manifest.get('version') != _MANIFEST_VERSION:
+            manifest = {'version': _MANIFEST_VERSION, 'directory_mtime_ns': None, 'names': [], 'configs': {}}
+        for entry in manifest['configs'].values():
+            entry['config'] = freeze(entry['config'])
+        self._manifest = manifest
+        return manifest
+
+    def _write_manifest(self):
+        # The manifest is only an index, so a read-only user directory just means a slower next start.
+        manifest_path = self._manifest_path()
+        temporary_path = f"{manifest_path}.{os.getpid()}.tmp"
+        try:
+            with open(temporary_path, 'w', encoding='utf-8') as manifest_file:
+                json.dump(self._manifest, manifest_file, ensure_ascii=False)
+            os.replace(temporary_path, manifest_path)
+        except OSError:
+            try:
+                os.remove(temporary_path)
+            except OSError:
+                pass
@@ -0,0 +1,262 @@
+from dataclasses import dataclass, field
+from typing import Any, Callable, Optional, Union
+
+from switch_pilot_core.controller import Button, Controller, Hat, StickDisplacement
+from switch_pilot_core.image import Image, ImageRegion
+
+
+@dataclass(frozen=True)
+class Press:
+    """Press and release, times times, like Controller.send_repeat."""
+    buttons: Optional[tuple[Button, ...]] = None
+    l_displacement: Optional[StickDisplacement] = None
+    r_displacement: Optional[StickDisplacement] = None
+    hat: Optional[Hat] = None
+    duration: float = 0.1
+    times: int = 1
+    interval: float = 0.1
+    skip_last_interval: bool = True
+    name: Optional[str] = None
+
+
+@dataclass(frozen=True)
+class Hold:
+    """Press without releasing; a later Press or Release step releases it."""
+    buttons: Optional[tuple[Button, ...]] = None
+    l_displacement: Optional[StickDisplacement] = None
+    r_displacement: Optional[StickDisplacement] = None
+    hat: Optional[Hat] = None
+    name: Optional[str] = None
+
+
+@dataclass(frozen=True)
+class Release:
+    name: Optional[str] = None
+
+
+@dataclass(frozen=True)
+class Wait:
+    duration: float
+    name: Optional[str] = None
+
+
+@dataclass(frozen=True)
+class WaitForTemplate:
+    """Block until template shows up; the timed schedule restarts when it matches."""
+    template: Image
+    threshold: float
+    region: Optional[ImageRegion] = None
+    timeout: Optional[float] = None
+    pyramid_levels: int = 0
+    name: Optional[str] = None
+
+
+MacroStep = Union[Press, Hold, Release, Wait, WaitForTemplate]
+
+
+@dataclass(frozen=True)
+class _TimedAction:
+    offset: float
+    kind: str
+    """'hold', 'reset' or 'end'; 'end' marks the planned end of a step."""
+    step_index: int
+    arguments: dict[str, Any] = field(default_factory=dict)
+
+
+@dataclass(frozen=True)
+class _Segment:
+    """Timed actions measured from the start of the segment, or a single blocking template wait."""
+    actions: tuple[_TimedAction, ...] = ()
+    template_wait: Optional[WaitForTemplate] = None
+    step_index: int = -1
+
+
+@dataclass(frozen=True)
+class CompiledMacro:
+    name: str
+    steps: tuple[MacroStep, ...]
+    segments: tuple[_Segment, ...]
+    planned_durations: tuple[float, ...]
+    """Planned duration per step; template waits are 0."""
+
+
+@dataclass(frozen=True)
+class StepProfile:
+    index: int
+    name: str
+    planned_duration: float
+    actual_duration: float
+    max_error: float
+    """Largest lateness of the step's inputs against their deadlines."""
+
+
+@dataclass(frozen=True)
+class MacroProfile:
+    name: str
+    steps: tuple[StepProfile, ...]
+    completed: bool
+    """False when the macro was cancelled or a template wait timed out."""
+    total_duration: float
+
+
+class Macro:
+    """Routine declared as a list of steps and compiled once into a timed schedule."""
+
+    def __init__(self, name: str, steps: list[MacroStep]):
+        self._name = name
+        self._steps = tuple(steps)
+        self._compiled: Optional[CompiledMacro] = None
+
+    @property
+    def name(self) -> str:
+        return self._name
+
+    @property
+    def steps(self) -> tuple[MacroStep, ...]:
+        return self._steps
+
+    def compile(self) -> CompiledMacro:
+        if self._compiled is None:
+            self._compiled = self._compile()
+        return self._compiled
+
+    def _compile(self) -> CompiledMacro:
+        segments: list[_Segment] = []
+        actions: list[_TimedAction] = []
+        planned_durations: list[float] = []
+        offset = 0.0
+        for index, step in enumerate(self._steps):
+            start = offset
+            if isinstance(step, WaitForTemplate):
+                if len(actions) > 0:
+                    segments.append(_Segment(actions=tuple(actions)))
+                segments.append(_Segment(template_wait=step, step_index=index))
+                actions, offset = [], 0.0
+                planned_durations.append(0.0)
+                continue
+
+            if isinstance(step, Press):
+                arguments = self._input_arguments(step)
+                for i in range(step.times):
+                    actions.append(_TimedAction(offset=offset, kind='hold', step_index=index, arguments=arguments))
+                    offset += step.duration
+                    actions.append(_TimedAction(offset=offset, kind='reset', step_index=index))
+                    if not (step.skip_last_interval and i >= step.times - 1):
+                        offset += step.interval
+            elif isinstance(step, Hold):
+                actions.append(_TimedAction(offset=offset,
+                                            kind='hold',
+                                            step_index=index,
+                                            arguments=self._input_arguments(step)))
+            elif isinstance(step, Release):
+                actions.append(_TimedAction(offset=offset, kind='reset', step_index=index))
+            elif isinstance(step, Wait):
+                offset += step.duration
+            else:
+                raise TypeError(f"Unknown macro step: {step!r}")
+
+            actions.append(_TimedAction(offset=offset, kind='end', step_index=index))
+            planned_durations.append(offset - start)
+
+        if len(actions) > 0:
+            segments.append(_Segment(actions=tuple(actions)))
+        return CompiledMacro(name=self._name,
+                             steps=self._steps,
+                             segments=tuple(segments),
+                             planned_durations=tuple(planned_durations))
+
+    @staticmethod
+    def _input_arguments(step: Union[Press, Hold]) -> dict[str, Any]:
+        return {
+            'buttons': None if step.buttons is None else list(step.buttons),
+            'l_displacement': step.l_displacement,
+            'r_displacement': step.r_displacement,
+            'hat': step.hat,
+        }
+
+
+class MacroExecutor:
+    """Runs compiled macros on a controller with deadline timing, cancellation and per-step profiling."""
+
+    def __init__(self,
+                 controller: Controller,
+                 should_exit: Callable[[], bool],
+                 wait_for_template: Callable[[WaitForTemplate], Any],
+                 check_interval: float = 0.1):
+        self._controller = controller
+        self._should_exit = should_exit
+        self._wait_for_template = wait_for_template
+        self._check_interval = check_interval
+
+    def run(self, macro: Union[Macro, CompiledMacro]) -> MacroProfile:
+        compiled = macro.compile() if isinstance(macro, Macro) else macro
+        profiles: list[StepProfile] = []
+        clock = self._controller.clock
+        started_at = clock.now()
+        step_started_at = started_at
+        step_max_error = 0.0
+
+        def finish_step(index: int):
+            nonlocal step_started_at, step_max_error
+            now = clock.now()
+            step = compiled.steps[index]
+            profiles.append(StepProfile(index=index,
+                                        name=step.name or type(step).__name__,
+                                        planned_duration=compiled.planned_durations[index],
+                                        actual_duration=now - step_started_at,
+                                        max_error=step_max_error))
+            step_started_at = now
+            step_max_error = 0.0
+
+        def result(completed: bool) -> MacroProfile:
+            return MacroProfile(name=compiled.name,
+                                steps=tuple(profiles),
+                                completed=completed,
+                                total_duration=clock.now() - started_at)
+
+        held = False
+        completed = False
+        try:
+            for segment in compiled.segments:
+                if self._should_exit():
+                    return result(False)
+
+                if segment.template_wait is not None:
+                    if self._wait_for_template(segment.template_wait) is None:
+                        return result(False)
+                    finish_step(segment.step_index)
+                    continue
+
+                schedule = self._controller.create_schedule()
+                for action in segment.actions:
+                    error = self._wait_until(schedule, action.offset)
+                    if error is None:
+                        return result(False)
+                    step_max_error = max(step_max_error, error)
+                    if action.kind == 'hold':
+                        self._controller.send_hold(**action.arguments)
+                        held = True
+                    elif action.kind == 'reset':
+                        self._controller.send_reset()
+                        held = False
+                    else:
+                        finish_step(action.step_index)
+            completed = True
+            return result(True)
+        finally:
+            # A stopped or failed macro must not leave a button or stick held on the console.
+            if held and not completed:
+                self._controller.send_reset()
+
+    def _wait_until(self, schedule, offset: float) -> Optional[float]:
+        """Wait for offset and return how late it woke up, None when the macro has to stop."""
+        # A controller with a cancellation token wakes up on its own; otherwise sleep in slices while the deadline
+        # is far away so a stop is still noticed. The last slice is precise either way.
+        clock = self._controller.clock
+        deadline = schedule.start + offset
+        while self._controller.cancellation_token is None and deadline - clock.now() > self._check_interval:
+            clock.sleep(self._check_interval)
+            if self._should_exit():
+                return None
+        error = schedule.wait_until_offset(offset)
+        return None if self._should_exit() else error
@@ -0,0 +1,180 @@
+import calendar
+import math
+from dataclasses import dataclass
+from datetime import datetime
+from enum import IntEnum, auto
+from typing import Optional
+
+from switch_pilot_core.controller import StickDisplacementPreset as Displacement
+from .macro import MacroStep, Press
+
+
+class DateTimeField(IntEnum):
+    """Fields of the Current Date and Time screen, in cursor order."""
+
+    YEAR = 0
+    """Year"""
+
+    MONTH = auto()
+    """Month"""
+
+    DAY = auto()
+    """Day"""
+
+    HOUR = auto()
+    """Hour"""
+
+    MINUTE = auto()
+    """Minute"""
+
+
+_FIXED_MODULI = {
+    DateTimeField.MONTH: 12,
+    DateTimeField.HOUR: 24,
+    DateTimeField.MINUTE: 60,
+}
+
+
+@dataclass(frozen=True)
+class HoldScrollProfile:
+    """Auto-repeat behaviour of a held direction, measured on the console.
+
+    The value changes once on press, again after initial_delay, then every repeat_interval.
+    """
+    initial_delay: float
+    repeat_interval: float
+
+    def hold_duration(self, steps: int) -> float:
+        # Release halfway between the last wanted repeat and the next one to be robust against jitter.
+        if steps <= 1:
+            return self.initial_delay / 2
+        return self.initial_delay + (steps - 1.5) * self.repeat_interval
+
+    def steps_for(self, hold_duration: float) -> int:
+        if hold_duration < self.initial_delay:
+            return 1
+        return 2 + math.floor((hold_duration - self.initial_delay) / self.repeat_interval)
+
+
+@dataclass(frozen=True)
+class FieldPlan:
+    field: DateTimeField
+    steps: int
+    """Signed number of value changes; positive scrolls up."""
+    hold_duration: Optional[float]
+    """Set when the change is made by holding instead of tapping."""
+    cost: float
+    """Estimated seconds spent on the field, excluding the move to the next one."""
+
+    @property
+    def presses(self) -> int:
+        if self.steps == 0:
+            return 0
+        return 1 if self.hold_duration is not None else abs(self.steps)
+
+    def to_steps(self, press_duration: float = 0.1, press_interval: float = 0.1) -> list[MacroStep]:
+        if self.steps == 0:
+            return []
+        direction = Displacement.TOP if self.steps > 0 else Displacement.BOTTOM
+        name = self.field.name.lower()
+        if self.hold_duration is not None:
+            return [Press(l_displacement=direction, duration=self.hold_duration, name=name)]
+        return [Press(l_displacement=direction,
+                      times=abs(self.steps),
+                      duration=press_duration,
+                      interval=press_interval,
+                      name=name)]
+
+
+@dataclass(frozen=True)
+class TimeLeapPlan:
+    fields: tuple[FieldPlan, ...]
+
+    @property
+    def presses(self) -> int:
+        return sum(field.presses for field in self.fields)
+
+    @property
+    def cost(self) -> float:
+        return sum(field.cost for field in self.fields)
+
+
+class TimeLeapPlanner:
+    """Plans the cheapest scroll inputs for each field of the Current Date and Time screen.
+
+    Month, hour and minute wrap around, so a change is made in whichever direction is shorter. The day wraps
+    within the displayed month, which is only known when current is given; otherwise days are not wrapped.
+    Years are never wrapped.
+    """
+
+    def __init__(self,
+                 press_duration: float = 0.1,
+                 press_interval: float = 0.1,
+                 hold_profile: Optional[HoldScrollProfile] = None):
+        self._press_duration = press_duration
+        self._press_interval = press_interval
+        self._hold_profile = hold_profile
+
+    @property
+    def press_duration(self) -> float:
+        return self._press_duration
+
+    @property
+    def press_interval(self) -> float:
+        return self._press_interval
+
+    @property
+    def hold_profile(self) -> Optional[HoldScrollProfile]:
+        return self._hold_profile
+
+    def plan(self,
+             years: int = 0,
+             months: int = 0,
+             days: int = 0,
+             hours: int = 0,
+             minutes: int = 0,
+             current: Optional[datetime] = None) -> TimeLeapPlan:
+        day_modulus = None
+        if current is not None:
+            year = current.year + years
+            month = (current.month - 1 + months) % 12 + 1
+            day_modulus = calendar.monthrange(year, month)[1]
+
+        moduli = {**_FIXED_MODULI, DateTimeField.DAY: day_modulus}
+        diffs = {
+            DateTimeField.YEAR: years,
+            DateTimeField.MONTH: months,
+            DateTimeField.DAY: days,
+            DateTimeField.HOUR: hours,
+            DateTimeField.MINUTE: minutes,
+        }
+        return TimeLeapPlan(fields=tuple(self.plan_field(field, diff, moduli.get(field))
+                                         for field, diff in diffs.items()))
+
+    def plan_field(self, field: DateTimeField, diff: int, modulus: Optional[int] = None) -> FieldPlan:
+        steps = self.shortest_steps(diff, modulus)
+        count = abs(steps)
+        tap_cost = self.tap_cost(count)
+        if self._hold_profile is not None and count > 1:
+            hold_duration = self._hold_profile.hold_duration(count)
+            if hold_duration < tap_cost:
+                return FieldPlan(field=field, steps=steps, hold_duration=hold_duration, cost=hold_duration)
+        return FieldPlan(field=field, steps=steps, hold_duration=None, cost=tap_cost)
+
+    def tap_cost(self, count: int) -> float:
+        if count <= 0:
+            return 0.0
+        return count * self._press_duration + (count - 1) * self._press_interval
+
+    @staticmethod
+    def shortest_steps(diff: int, modulus: Optional[int] = None) -> int:
+        if modulus is None or modulus <= 0:
+            return diff
+        forward = diff % modulus
+        backward = modulus - forward
+        if forward == 0:
+            return 0
+        if forward < backward or (forward == backward and diff > 0):
+            return forward
+        return -backward
+
@@ -1 +1,2 @@
 from .config import Config
+from .frozen import FrozenDict, freeze, thaw
@@ -1,20 +1,94 @@
 import json
 import os.path
-from typing import Optional
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Optional, Type, TypeVar
+
+from pydantic import BaseModel
 
 from switch_pilot_core.path import Path
+from .frozen import freeze, thaw
+
+Model = TypeVar('Model', bound=BaseModel)
+
+
+@dataclass
+class _ConfigCacheEntry:
+    mtime_ns: int
+    file_size: int
+    data: Any
+    checked_at: float
+    models: dict[type, Any] = field(default_factory=dict)
 
 
 class Config:
-    def __init__(self, path: Path):
+    def __init__(self, path: Path, check_interval: float = 0.0):
+        """check_interval is how long a cached config is trusted before the file is stat'ed again.
+
+        The default 0 stats the file on every read, so an edit is always picked up.
+        """
         self._path = path
+        self.check_interval = check_interval
+        self._cache: dict[str, _ConfigCacheEntry] = {}
+        self._cache_lock = threading.Lock()
+
+    def read_command_config(self, name: str, model: Optional[Type[Model]] = None):
+        return self.read(os.path.join("commands", name), model=model)
 
-    def read_command_config(self, name: str):
-        return self.read(os.path.join("commands", name))
+    def read(self, relative_path: Optional[str] = None, model: Optional[Type[Model]] = None):
+        """Read a config.json, parsing it again only when the file has changed.
 
-    def read(self, relative_path: Optional[str] = None):
+        Every call gets its own copy made of plain dicts and lists, so callers may change it freely.
+        When model is given the config is validated into it once per file version and a deep copy is returned.
+        """
         absolute_path = os.path.join(self._path.user_directory(), relative_path, "config.json")
-        return self._read_json_file(absolute_path)
+        entry = self._read_cached(absolute_path)
+        if model is None:
+            return thaw(entry.data)
+
+        with self._cache_lock:
+            instance = entry.models.get(model)
+        if instance is None:
+            instance = model.model_validate(entry.data)
+            with self._cache_lock:
+                instance = entry.models.setdefault(model, instance)
+        return instance.model_copy(deep=True)
+
+    def invalidate(self, relative_path: Optional[str] = None):
+        """Forget the cached config under relative_path, or every cached config when it is None."""
+        with self._cache_lock:
+            if relative_path is None:
+                self._cache.clear()
+            else:
+                self._cache.pop(os.path.join(self._path.user_directory(), relative_path, "config.json"), None)
+
+    def _read_cached(self, path_name: str) -> _ConfigCacheEntry:
+        now = time.monotonic()
+        with self._cache_lock:
+            entry = self._cache.get(path_name)
+        if entry is not None and now - entry.checked_at < self.check_interval:
+            return entry
+
+        try:
+            stat = os.stat(path_name)
+        except FileNotFoundError:
+            with self._cache_lock:
+                self._cache.pop(path_name, None)
+            raise FileNotFoundError(f"Config file not found: {path_name}")
+
+        if entry is not None and entry.mtime_ns == stat.st_mtime_ns and entry.file_size == stat.st_size:
+            entry.checked_at = now
+            return entry
+
+        entry = _ConfigCacheEntry(mtime_ns=stat.st_mtime_ns,
+                                  file_size=stat.st_size,
+                                  # Frozen so that nothing can change the cached copy behind the file's back.
+                                  data=freeze(self._read_json_file(path_name)),
+                                  checked_at=now)
+        with self._cache_lock:
+            self._cache[path_name] = entry
+        return entry
 
     @staticmethod
     def _read_json_file(path_name: Optional[str]):
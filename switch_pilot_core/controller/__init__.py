@@ -1,6 +1,9 @@
 from .button import Button
 from .controller import Controller
 from .hat import Hat
-from .state import ControllerState
+from .recording import InputEvent, InputRecording
+from .report_encoder import BinaryReportEncoder, ReportEncoder, TextReportEncoder
+from .state import ControllerState, ControllerStateSnapshot
 from .state_serializer import ControllerStateSerializer
 from .stick import Stick, StickDisplacement, StickDisplacementRange, StickDisplacementPreset
+from .trajectory import StickTrajectory
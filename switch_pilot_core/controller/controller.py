@@ -1,56 +1,190 @@
-import time
-from time import sleep
+import threading
+from collections import deque
 from typing import Optional
 
 from switch_pilot_core.libs.serial import SerialPort, SerialPortInfo
+from switch_pilot_core.timing import CancellationToken, Clock, DeadlineSchedule, PrecisionSleeper, ScheduleReport, \
+    SystemClock
 from .button import Button
 from .hat import Hat
+from .report_encoder import ReportEncoder, TextReportEncoder
+from .recording import InputRecording
+from .report_loop import ReportLoop
 from .state import ControllerState
-from .state_serializer import ControllerStateSerializer
-from .stick import StickDisplacement
+from .stick import StickDisplacement, StickDisplacementPreset
+from .trajectory import StickTrajectory
 
 
 class Controller:
-    def __init__(self):
+    def __init__(self,
+                 suppress_redundant_reports: bool = False,
+                 keepalive_interval: Optional[float] = None,
+                 encoder: Optional[ReportEncoder] = None,
+                 serial_port: Optional[SerialPort] = None,
+                 clock: Optional[Clock] = None):
         self._state = ControllerState()
-        self._serial = SerialPort()
+        self._encoder = encoder if encoder is not None else TextReportEncoder()
+        self._serial = serial_port if serial_port is not None else SerialPort()
+        self._sleeper = PrecisionSleeper.shared()
+        self._clock = clock if clock is not None else SystemClock.shared()
+        self._lock = threading.RLock()
+        self._report_loop: Optional[ReportLoop] = None
+        self._pending_states: deque[ControllerState] = deque()
+
+        self.suppress_redundant_reports = suppress_redundant_reports
+        """Skip send() when the device already has the same state; off by default, so every send writes a report."""
+        self.keepalive_interval = keepalive_interval
+        """Seconds after which a suppressed report is written anyway; None suppresses it indefinitely."""
+        self._last_sent_key: Optional[int] = None
+        self._last_sent_time = 0.0
+        self._suppressed_count = 0
+        self._recording: Optional[InputRecording] = None
+        self._cancellation_token: Optional[CancellationToken] = None
 
     @property
     def is_open(self) -> bool:
         return self._serial.is_open
 
-    def open(self, port_info: SerialPortInfo):
-        self._serial.open(port_info, baud_rate=9600)
+    @property
+    def suppressed_count(self) -> int:
+        """Number of send() calls skipped because the device already had the same state."""
+        return self._suppressed_count
+
+    @property
+    def encoder(self) -> ReportEncoder:
+        return self._encoder
+
+    @encoder.setter
+    def encoder(self, new_value: ReportEncoder):
+        with self._lock:
+            self._encoder = new_value
+            self._last_sent_key = None
+
+    @property
+    def clock(self) -> Clock:
+        """Clock used for every wait and timestamp of the sends; the report loop always runs on real time."""
+        return self._clock
+
+    @clock.setter
+    def clock(self, new_value: Clock):
+        self._clock = new_value
+
+    @property
+    def cancellation_token(self) -> Optional[CancellationToken]:
+        """Token that cuts every wait short; the inputs still release what they pressed."""
+        return self._cancellation_token
+
+    @cancellation_token.setter
+    def cancellation_token(self, new_value: Optional[CancellationToken]):
+        self._cancellation_token = new_value
+
+    def open(self, port_info: SerialPortInfo, baud_rate: int = 9600):
+        self._serial.open(port_info, baud_rate=baud_rate)
+        self._last_sent_key = None
 
     def close(self):
-        self._serial.close()
+        try:
+            self.stop_report_loop()
+        finally:
+            self._serial.close()
+
+    @property
+    def is_report_loop_running(self) -> bool:
+        report_loop = self._report_loop
+        return report_loop is not None and report_loop.is_running
+
+    @property
+    def report_loop_missed_ticks(self) -> int:
+        report_loop = self._report_loop
+        return report_loop.missed_ticks if report_loop is not None else 0
+
+    def start_report_loop(self, rate: float = 30.0):
+        """Send the current state at a fixed rate from a dedicated thread.
+
+        While the loop runs, send() no longer writes; each distinct state it is called with goes out on its own tick,
+        in order, so a press shorter than a tick is still held for one tick instead of being lost.
+        """
+        self.stop_report_loop()
+        self._report_loop = ReportLoop(send=self._write_next_state, rate=rate, sleeper=self._sleeper)
+        self._report_loop.start()
+
+    def stop_report_loop(self):
+        report_loop = self._report_loop
+        if report_loop is not None:
+            report_loop.stop()
+        self._report_loop = None
+        with self._lock:
+            self._pending_states.clear()
 
     def set_state(self, state: ControllerState):
-        self._state = state
+        with self._lock:
+            self._state = state
 
     def set(self,
             buttons: Optional[list[Button]] = None,
             l_displacement: Optional[StickDisplacement] = None,
             r_displacement: Optional[StickDisplacement] = None,
             hat: Optional[Hat] = None):
-        self._state.set(buttons=buttons,
-                        l_displacement=l_displacement,
-                        r_displacement=r_displacement,
-                        hat=hat)
+        with self._lock:
+            self._state.set(buttons=buttons,
+                            l_displacement=l_displacement,
+                            r_displacement=r_displacement,
+                            hat=hat)
 
     def unset(self,
               buttons: Optional[list[Button]] = None,
               hat: bool = False):
-        self._state.unset(buttons=buttons,
-                          hat=hat)
+        with self._lock:
+            self._state.unset(buttons=buttons,
+                              hat=hat)
 
     def reset(self):
-        self._state.reset()
+        with self._lock:
+            self._state.reset()
 
     def send(self):
-        state_line = ControllerStateSerializer.serialize(self._state)
-        self._serial.write_line(state_line)
-        self._state.consume_stick_displacement()
+        if self.is_report_loop_running:
+            self._queue_state()
+            return
+        self._write_state()
+
+    def _queue_state(self):
+        with self._lock:
+            pending = self._pending_states
+            last_key = pending[-1].value_key if len(pending) > 0 else self._last_sent_key
+            if self._state.value_key != last_key:
+                pending.append(self._state.copy())
+
+    def _write_next_state(self):
+        """Write the oldest state queued by send(), or the current one when none is left."""
+        with self._lock:
+            if len(self._pending_states) > 0:
+                self._write_report(self._pending_states.popleft())
+            else:
+                self._write_report(self._state)
+
+    def _write_state(self, force: bool = False):
+        with self._lock:
+            if not force and self.suppress_redundant_reports and self._state.value_key == self._last_sent_key:
+                keepalive_interval = self.keepalive_interval
+                if keepalive_interval is None or self._clock.now() - self._last_sent_time < keepalive_interval:
+                    self._suppressed_count += 1
+                    self._state.consume_stick_displacement()
+                    return
+            self._write_report(self._state)
+
+    def _write_report(self, state: ControllerState):
+        if self._serial.is_writer_running:
+            # Queued reports may be coalesced away, so each one carries the full stick state.
+            self._serial.write_bytes(self._encoder.encode(state, full=True), coalesce=True)
+        else:
+            self._serial.write_bytes(self._encoder.encode(state))
+        recording = self._recording
+        if recording is not None:
+            recording.append(self._clock.now_ns(), state.snapshot())
+        state.consume_stick_displacement()
+        self._last_sent_key = state.value_key
+        self._last_sent_time = self._clock.now()
 
     def send_hold(self,
                   buttons: Optional[list[Button]] = None,
@@ -88,30 +222,122 @@ class Controller:
                     hat: Optional[Hat] = None,
                     duration: float = 0.1,
                     interval: float = 0.1,
-                    skip_last_interval: bool = True):
+                    skip_last_interval: bool = True,
+                    report_drift: bool = False) -> Optional[ScheduleReport]:
         if times < 1:
-            return
+            return None
 
+        # Every press and release is due at a fixed offset from one start time,
+        # so serial write time and sleep overshoot do not add up over the repeats.
+        schedule = self.create_schedule()
         for i in range(times):
-            self.send_one_shot(buttons=buttons,
-                               l_displacement=l_displacement,
-                               r_displacement=r_displacement,
-                               hat=hat,
-                               duration=duration)
+            self.send_hold(buttons=buttons,
+                           l_displacement=l_displacement,
+                           r_displacement=r_displacement,
+                           hat=hat)
+            schedule.advance(duration)
+            self.send_reset()
 
-            if skip_last_interval and i >= times - 1:
+            if schedule.is_cancelled or (skip_last_interval and i >= times - 1):
                 break
 
-            self._wait(interval)
+            schedule.advance(interval)
+
+        return schedule.report() if report_drift else None
+
+    def send_trajectory(self,
+                        trajectory: StickTrajectory,
+                        use_r_stick: bool = False,
+                        reset: bool = True,
+                        report_drift: bool = False) -> Optional[ScheduleReport]:
+        """Send every sample of trajectory at its rate, then center the stick unless reset is False."""
+        schedule = self.create_schedule()
+        period = 1.0 / trajectory.rate
+        for displacement in trajectory.displacements():
+            if use_r_stick:
+                self.send_hold(r_displacement=displacement)
+            else:
+                self.send_hold(l_displacement=displacement)
+            schedule.advance(period)
+            if schedule.is_cancelled:
+                break
+
+        if reset:
+            if use_r_stick:
+                self.send_hold(r_displacement=StickDisplacementPreset.CENTER)
+            else:
+                self.send_hold(l_displacement=StickDisplacementPreset.CENTER)
+        return schedule.report() if report_drift else None
+
+    @property
+    def is_recording(self) -> bool:
+        return self._recording is not None
+
+    def start_recording(self) -> InputRecording:
+        """Record every report written from now on, with its perf_counter_ns timestamp."""
+        with self._lock:
+            self._recording = InputRecording()
+            return self._recording
+
+    def stop_recording(self) -> Optional[InputRecording]:
+        with self._lock:
+            recording = self._recording
+            self._recording = None
+            return recording
+
+    def play(self, recording: InputRecording) -> ScheduleReport:
+        """Write the recorded reports again with their original relative timing.
+
+        Reports are encoded before the first one is written, so the loop only waits and writes.
+        A running report loop is stopped for the playback and started again afterwards, so that its ticks
+        do not interleave the current state with the recorded reports.
+        The returned report holds the lateness of every event.
+        """
+        report_loop = self._report_loop
+        if report_loop is None or not report_loop.is_running:
+            return self._play(recording)
+
+        self.stop_report_loop()
+        try:
+            return self._play(recording)
+        finally:
+            self.start_report_loop(rate=report_loop.rate)
+
+    def _play(self, recording: InputRecording) -> ScheduleReport:
+        events = recording.events
+        if len(events) == 0:
+            return self.create_schedule().report()
+
+        reports = [self._encoder.encode(event.snapshot.to_state()) for event in events]
+        first_timestamp_ns = events[0].timestamp_ns
+        schedule = self.create_schedule()
+        last_event = None
+        for event, report in zip(events, reports):
+            schedule.wait_until_offset((event.timestamp_ns - first_timestamp_ns) / 1e9)
+            if schedule.is_cancelled:
+                break
+            with self._lock:
+                self._serial.write_bytes(report)
+            last_event = event
+
+        if last_event is None:
+            return schedule.report()
+        with self._lock:
+            state = last_event.snapshot.to_state()
+            state.consume_stick_displacement()
+            self._state = state
+            self._last_sent_key = state.value_key
+            self._last_sent_time = self._clock.now()
+        return schedule.report()
+
+    def create_schedule(self) -> DeadlineSchedule:
+        return DeadlineSchedule(clock=self._clock, token=self._cancellation_token)
 
     def send_raw(self, line: str):
-        self._serial.write_line(line)
+        with self._lock:
+            self._serial.write_line(line)
+            # The device state after a raw line is unknown, so the next report must not be suppressed.
+            self._last_sent_key = None
 
-    @staticmethod
-    def _wait(wait: float):
-        if float(wait) > 0.1:
-            sleep(wait)
-        else:
-            current_time = time.perf_counter()
-            while time.perf_counter() < current_time + wait:
-                pass
+    def _wait(self, wait: float):
+        self._clock.sleep(float(wait), token=self._cancellation_token)
@@ -0,0 +1,74 @@
+import struct
+from dataclasses import dataclass
+from typing import Optional
+
+from .state import ControllerStateSnapshot
+
+
+@dataclass(frozen=True)
+class InputEvent:
+    timestamp_ns: int
+    """perf_counter_ns time the report was written"""
+    snapshot: ControllerStateSnapshot
+
+
+class InputRecording:
+    """Reports written by a Controller, stored as a compact binary log.
+
+    The log is a header (magic, version, event count) followed by one little-endian
+    (int64 timestamp in nanoseconds, uint64 packed state key) pair per event.
+    """
+
+    MAGIC = b"SPIR"
+    VERSION = 1
+    _HEADER = struct.Struct("<4sHQ")
+    _EVENT = struct.Struct("<qQ")
+
+    def __init__(self, events: Optional[list[InputEvent]] = None):
+        self._events: list[InputEvent] = [] if events is None else list(events)
+
+    @property
+    def events(self) -> list[InputEvent]:
+        return list(self._events)
+
+    @property
+    def duration(self) -> float:
+        """Seconds between the first and the last event"""
+        if len(self._events) < 2:
+            return 0.0
+        return (self._events[-1].timestamp_ns - self._events[0].timestamp_ns) / 1e9
+
+    def __len__(self) -> int:
+        return len(self._events)
+
+    def append(self, timestamp_ns: int, snapshot: ControllerStateSnapshot):
+        self._events.append(InputEvent(timestamp_ns=timestamp_ns, snapshot=snapshot))
+
+    def to_bytes(self) -> bytes:
+        chunks = [self._HEADER.pack(self.MAGIC, self.VERSION, len(self._events))]
+        chunks.extend(self._EVENT.pack(event.timestamp_ns, event.snapshot.key) for event in self._events)
+        return b"".join(chunks)
+
+    @staticmethod
+    def from_bytes(data: bytes) -> 'InputRecording':
+        header = InputRecording._HEADER
+        magic, version, count = header.unpack_from(data, 0)
+        if magic != InputRecording.MAGIC:
+            raise ValueError(f"Not an input recording: magic {magic!r}")
+        if version != InputRecording.VERSION:
+            raise ValueError(f"Unsupported input recording version: {version}")
+        expected_size = header.size + count * InputRecording._EVENT.size
+        if len(data) != expected_size:
+            raise ValueError(f"Input recording size mismatch: {len(data)} != {expected_size}")
+        events = [InputEvent(timestamp_ns=timestamp_ns, snapshot=ControllerStateSnapshot(key))
+                  for timestamp_ns, key in InputRecording._EVENT.iter_unpack(data[header.size:])]
+        return InputRecording(events)
+
+    def save(self, file_path: str):
+        with open(file_path, mode="wb") as f:
+            f.write(self.to_bytes())
+
+    @staticmethod
+    def load(file_path: str) -> 'InputRecording':
+        with open(file_path, mode="rb") as f:
+            return InputRecording.from_bytes(f.read())
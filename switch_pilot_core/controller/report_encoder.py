@@ -0,0 +1,89 @@
+from abc import ABCMeta, abstractmethod
+from functools import lru_cache
+
+from .state import ControllerState, ControllerStateSnapshot
+from .state_serializer import ControllerStateSerializer
+
+
+class ReportEncoder(metaclass=ABCMeta):
+    """Wire format of the reports sent to the controller device."""
+
+    @abstractmethod
+    def encode(self, controller_state: ControllerState, full: bool = False) -> bytes:
+        """Encode state into one report; with full, both sticks are included regardless of changed flags."""
+        raise NotImplementedError
+
+    @abstractmethod
+    def decode(self, report: bytes) -> ControllerStateSnapshot:
+        """Decode one report into a snapshot whose changed flags tell which sticks it carries."""
+        raise NotImplementedError
+
+
+class TextReportEncoder(ReportEncoder):
+    """ASCII line format: '<flags and buttons> <hat> [<lx> <ly>] [<rx> <ry>]\\r\\n' in hex."""
+
+    def encode(self, controller_state: ControllerState, full: bool = False) -> bytes:
+        return ControllerStateSerializer.serialize_bytes(controller_state, full=full)
+
+    def decode(self, report: bytes) -> ControllerStateSnapshot:
+        tokens = report.decode('ascii').split()
+        if len(tokens) < 2:
+            raise ValueError(f"Malformed text report: {report!r}")
+        flag_buttons = int(tokens[0], 16)
+        values = [int(token, 16) for token in tokens[2:]]
+        l_changed = bool(flag_buttons & 0x2)
+        r_changed = bool(flag_buttons & 0x1)
+        if len(values) != 2 * (l_changed + r_changed):
+            raise ValueError(f"Malformed text report: {report!r}")
+        lx, ly = values[0:2] if l_changed else (0, 0)
+        rx, ry = values[-2:] if r_changed else (0, 0)
+        return ControllerStateSnapshot.from_values(buttons=flag_buttons >> 2,
+                                                   hat=int(tokens[1]),
+                                                   lx=lx,
+                                                   ly=ly,
+                                                   rx=rx,
+                                                   ry=ry,
+                                                   l_changed=l_changed,
+                                                   r_changed=r_changed)
+
+
+class BinaryReportEncoder(ReportEncoder):
+    """Fixed-length frame: header, flags and buttons (u16 LE), hat, lx, ly, rx, ry, checksum.
+
+    Axes are always present; the stick flags tell the device which of them to apply.
+    The checksum is the low byte of the sum of every byte between header and checksum.
+    """
+
+    HEADER = 0xA5
+    FRAME_SIZE = 9
+
+    def encode(self, controller_state: ControllerState, full: bool = False) -> bytes:
+        if full:
+            return _encode_binary_frame(controller_state.full_report_key)
+        return _encode_binary_frame(controller_state.report_key)
+
+    def decode(self, report: bytes) -> ControllerStateSnapshot:
+        if len(report) != self.FRAME_SIZE or report[0] != self.HEADER:
+            raise ValueError(f"Malformed binary report: {report!r}")
+        if sum(report[1:8]) & 0xFF != report[8]:
+            raise ValueError(f"Checksum mismatch in binary report: {report!r}")
+        flag_buttons = report[1] | report[2] << 8
+        l_changed = bool(flag_buttons & 0x2)
+        r_changed = bool(flag_buttons & 0x1)
+        return ControllerStateSnapshot.from_values(buttons=flag_buttons >> 2,
+                                                   hat=report[3],
+                                                   lx=report[4] if l_changed else 0,
+                                                   ly=report[5] if l_changed else 0,
+                                                   rx=report[6] if r_changed else 0,
+                                                   ry=report[7] if r_changed else 0,
+                                                   l_changed=l_changed,
+                                                   r_changed=r_changed)
+
+
+@lru_cache(maxsize=4096)
+def _encode_binary_frame(report_key: int) -> bytes:
+    snapshot = ControllerStateSnapshot(report_key)
+    flag_buttons = snapshot.buttons << 2 | snapshot.l_changed << 1 | snapshot.r_changed
+    body = bytes((flag_buttons & 0xFF, flag_buttons >> 8,
+                  snapshot.hat, snapshot.lx, snapshot.ly, snapshot.rx, snapshot.ry))
+    return bytes((BinaryReportEncoder.HEADER,)) + body + bytes((sum(body) & 0xFF,))
@@ -0,0 +1,74 @@
+import threading
+import time
+from typing import Callable, Optional
+
+from switch_pilot_core.timing import PrecisionSleeper
+
+
+class ReportLoop:
+    """Calls send at a fixed rate from a dedicated thread and counts the ticks it could not keep."""
+
+    def __init__(self,
+                 send: Callable[[], None],
+                 rate: float,
+                 sleeper: Optional[PrecisionSleeper] = None):
+        if rate <= 0:
+            raise ValueError(f"rate must be positive: {rate}")
+        self._send = send
+        self._period = 1.0 / rate
+        self._sleeper = sleeper if sleeper is not None else PrecisionSleeper.shared()
+        self._thread: Optional[threading.Thread] = None
+        self._stop_event = threading.Event()
+        self._tick_count = 0
+        self._missed_ticks = 0
+
+    @property
+    def rate(self) -> float:
+        return 1.0 / self._period
+
+    @property
+    def is_running(self) -> bool:
+        thread = self._thread
+        return thread is not None and thread.is_alive()
+
+    @property
+    def tick_count(self) -> int:
+        return self._tick_count
+
+    @property
+    def missed_ticks(self) -> int:
+        return self._missed_ticks
+
+    def start(self):
+        if self.is_running:
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run,
+                                        name=f"{ReportLoop.__name__}:{self.rate:g}Hz",
+                                        daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop_event.set()
+        thread = self._thread
+        try:
+            if thread is not None and thread.is_alive() and thread is not threading.current_thread():
+                thread.join()
+        finally:
+            self._thread = None
+
+    def _run(self):
+        period = self._period
+        next_tick = time.perf_counter()
+        while not self._stop_event.is_set():
+            self._send()
+            self._tick_count += 1
+
+            next_tick += period
+            late = time.perf_counter() - next_tick
+            if late > 0:
+                # Skip the ticks that are already over instead of sending a burst to catch up.
+                missed = int(late / period) + 1
+                self._missed_ticks += missed
+                next_tick += missed * period
+            self._sleeper.sleep_until(next_tick)
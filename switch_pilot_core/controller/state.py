@@ -4,10 +4,129 @@ from .button import Button
 from .hat import Hat
 from .stick import StickDisplacementRange, Stick, StickDisplacement
 
+# Bit layout of the packed state key: (field name, shift, mask)
+_KEY_LAYOUT = (
+    ('buttons', 0, 0xFFFF),
+    ('hat', 16, 0xF),
+    ('lx', 20, 0xFF),
+    ('ly', 28, 0xFF),
+    ('rx', 36, 0xFF),
+    ('ry', 44, 0xFF),
+    ('l_changed', 52, 0x1),
+    ('r_changed', 53, 0x1),
+)
+_L_AXES_MASK = 0xFFFF << 20
+_R_AXES_MASK = 0xFFFF << 36
+_CHANGED_MASK = 0x3 << 52
+
+
+class ControllerStateSnapshot:
+    """Immutable, hashable ControllerState packed into a single integer."""
+
+    __slots__ = ('_key',)
+
+    FIELDS = tuple(name for name, _, _ in _KEY_LAYOUT)
+    """Field names reported by diff"""
+
+    def __init__(self, key: int):
+        self._key = key
+
+    @staticmethod
+    def from_values(buttons: int = 0,
+                    hat: int = Hat.CENTER,
+                    lx: int = StickDisplacementRange.CENTER,
+                    ly: int = StickDisplacementRange.CENTER,
+                    rx: int = StickDisplacementRange.CENTER,
+                    ry: int = StickDisplacementRange.CENTER,
+                    l_changed: bool = False,
+                    r_changed: bool = False) -> 'ControllerStateSnapshot':
+        """Pack field values into a snapshot"""
+        return ControllerStateSnapshot(int(buttons)
+                                       | int(hat) << 16
+                                       | int(lx) << 20
+                                       | int(ly) << 28
+                                       | int(rx) << 36
+                                       | int(ry) << 44
+                                       | bool(l_changed) << 52
+                                       | bool(r_changed) << 53)
+
+    @property
+    def key(self) -> int:
+        """Get packed state"""
+        return self._key
+
+    @property
+    def buttons(self) -> int:
+        return self._key & 0xFFFF
+
+    @property
+    def hat(self) -> Hat:
+        return Hat((self._key >> 16) & 0xF)
+
+    @property
+    def lx(self) -> int:
+        return (self._key >> 20) & 0xFF
+
+    @property
+    def ly(self) -> int:
+        return (self._key >> 28) & 0xFF
+
+    @property
+    def rx(self) -> int:
+        return (self._key >> 36) & 0xFF
+
+    @property
+    def ry(self) -> int:
+        return (self._key >> 44) & 0xFF
+
+    @property
+    def l_changed(self) -> bool:
+        return bool((self._key >> 52) & 0x1)
+
+    @property
+    def r_changed(self) -> bool:
+        return bool((self._key >> 53) & 0x1)
+
+    def __eq__(self, other):
+        if not isinstance(other, ControllerStateSnapshot):
+            return NotImplemented
+        return self._key == other._key
+
+    def __hash__(self):
+        return hash(self._key)
+
+    def __repr__(self):
+        fields = ", ".join(f"{name}={getattr(self, name)!r}" for name in self.FIELDS)
+        return f"ControllerStateSnapshot({fields})"
+
+    def diff(self, other: 'ControllerStateSnapshot') -> frozenset[str]:
+        """Get names of the fields that differ from other"""
+        changed = self._key ^ other._key
+        if changed == 0:
+            return frozenset()
+        return frozenset(name for name, shift, mask in _KEY_LAYOUT if (changed >> shift) & mask)
+
+    def to_state(self) -> 'ControllerState':
+        """Create a mutable state with the same values and changed flags"""
+        state = ControllerState(buttons=self.buttons,
+                                hat=self.hat,
+                                lx=self.lx,
+                                ly=self.ly,
+                                rx=self.rx,
+                                ry=self.ry)
+        # A new state has both sticks marked as changed.
+        if not self.l_changed:
+            state.l_stick.consume()
+        if not self.r_changed:
+            state.r_stick.consume()
+        return state
+
 
 class ControllerState:
     """ControllerState class for the Nintendo Switch Controller."""
 
+    __slots__ = ('_buttons', '_hat', '_l_stick', '_r_stick')
+
     def __init__(self,
                  buttons=0,
                  hat=Hat.CENTER,
@@ -90,6 +209,59 @@ class ControllerState:
         """Set right stick y-axis value"""
         self._r_stick.y = new_value
 
+    @property
+    def key(self) -> int:
+        """Get all values and stick changed flags packed into a single integer"""
+        # Hot path of every send: read the stick slots directly instead of going through properties.
+        l_stick, r_stick = self._l_stick, self._r_stick
+        return (int(self._buttons)
+                | self._hat << 16
+                | l_stick._x << 20
+                | l_stick._y << 28
+                | r_stick._x << 36
+                | r_stick._y << 44
+                | l_stick._changed << 52
+                | r_stick._changed << 53)
+
+    @property
+    def value_key(self) -> int:
+        """Get packed buttons, hat and axes without the stick changed flags"""
+        return self.key & ~_CHANGED_MASK
+
+    @property
+    def report_key(self) -> int:
+        """Get packed state without the axes of unchanged sticks; equal keys serialize to the same report"""
+        key = self.key
+        if not self._l_stick._changed:
+            key &= ~_L_AXES_MASK
+        if not self._r_stick._changed:
+            key &= ~_R_AXES_MASK
+        return key
+
+    @property
+    def full_report_key(self) -> int:
+        """Get packed state with both sticks flagged as changed; it serializes to a self-contained report"""
+        return self.value_key | _CHANGED_MASK
+
+    def snapshot(self) -> ControllerStateSnapshot:
+        """Get immutable, hashable snapshot"""
+        return ControllerStateSnapshot(self.key)
+
+    def diff(self, other: 'ControllerState') -> frozenset[str]:
+        """Get names of the fields that differ from other"""
+        return self.snapshot().diff(other.snapshot())
+
+    def __eq__(self, other):
+        if not isinstance(other, ControllerState):
+            return NotImplemented
+        # Changed flags only track what has been sent; they are not part of the state's value.
+        return self.value_key == other.value_key
+
+    __hash__ = None
+
+    def __repr__(self):
+        return f"ControllerState({self.snapshot()!r})"
+
     def set(self,
             buttons: Optional[list[Button]] = None,
             l_displacement: Optional[StickDisplacement] = None,
@@ -144,9 +316,10 @@ class ControllerState:
 
     def copy(self):
         """Copy state."""
-        return ControllerState(buttons=self.buttons,
-                               hat=self.hat,
-                               lx=self.l_stick.x,
-                               ly=self.l_stick.y,
-                               rx=self.r_stick.x,
-                               ry=self.r_stick.y)
+        state = ControllerState.__new__(ControllerState)
+        state._buttons = self._buttons
+        state._hat = self._hat
+        # As with a newly constructed state, both sticks of the copy are marked as changed.
+        state._l_stick = self._l_stick.copy(changed=True)
+        state._r_stick = self._r_stick.copy(changed=True)
+        return state
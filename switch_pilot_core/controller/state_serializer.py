@@ -1,4 +1,10 @@
-from .state import ControllerState
+from functools import lru_cache
+
+from .state import ControllerState, ControllerStateSnapshot
+
+_AXIS_HEX: tuple[bytes, ...] = tuple(format(value, 'x').encode('ascii') for value in range(256))
+_HAT_DIGITS: tuple[bytes, ...] = tuple(str(value).encode('ascii') for value in range(16))
+_BUTTON_WORDS: dict[int, bytes] = {}
 
 
 class ControllerStateSerializer:
@@ -17,3 +23,33 @@ class ControllerStateSerializer:
         str_hat = str(int(controller_state.hat))
 
         return f"{format(flag_buttons, '#06x')} {str_hat} {str_l} {str_r}"
+
+    @staticmethod
+    def serialize_bytes(controller_state: ControllerState, full: bool = False) -> bytes:
+        """Encoded line including the line terminator, byte-identical to serialize() + '\\r\\n'.
+
+        With full, both sticks are always included so the report does not depend on the ones before it.
+        """
+        if full:
+            return _encode_line(controller_state.full_report_key)
+        return _encode_line(controller_state.report_key)
+
+
+@lru_cache(maxsize=4096)
+def _encode_line(report_key: int) -> bytes:
+    snapshot = ControllerStateSnapshot(report_key)
+    flag_buttons = snapshot.buttons << 2
+    bytes_l = b""
+    bytes_r = b""
+    if snapshot.l_changed:
+        flag_buttons |= 0x2
+        bytes_l = _AXIS_HEX[snapshot.lx] + b" " + _AXIS_HEX[snapshot.ly]
+    if snapshot.r_changed:
+        flag_buttons |= 0x1
+        bytes_r = _AXIS_HEX[snapshot.rx] + b" " + _AXIS_HEX[snapshot.ry]
+
+    word = _BUTTON_WORDS.get(flag_buttons)
+    if word is None:
+        word = format(flag_buttons, '#06x').encode('ascii')
+        _BUTTON_WORDS[flag_buttons] = word
+    return b"".join((word, b" ", _HAT_DIGITS[snapshot.hat], b" ", bytes_l, b" ", bytes_r, b"\r\n"))
@@ -19,15 +19,75 @@ class StickDisplacementRange(IntEnum):
 class StickDisplacement:
     """Stick displacement class for the Nintendo Switch Controller."""
 
+    __slots__ = ('_x', '_y')
+
+    ANGLE_STEPS = 360
+    """Lookup table resolution of the angle: 1 degree"""
+
+    MAGNIFICATION_STEPS = 100
+    """Lookup table resolution of the magnification: 0.01"""
+
+    # Rows of the lookup table by magnification step, filled on first use.
+    _table: dict[int, list[tuple[int, int]]] = {}
+
+    # Results by exact constructor arguments, so repeated displacements skip the trigonometry.
+    _memo: dict[tuple[float, float], tuple[int, int]] = {}
+    _MEMO_SIZE = 65536
+
     def __init__(self, angle: float, magnification: float = 1.0):
         """Stick displacement class for the Nintendo Switch Controller."""
 
-        magnification = self._clamp_magnification(magnification)
+        key = (angle, magnification)
+        xy = StickDisplacement._memo.get(key)
+        if xy is None:
+            xy = self._resolve_xy(angle, magnification)
+            if len(StickDisplacement._memo) < StickDisplacement._MEMO_SIZE:
+                StickDisplacement._memo[key] = xy
+        self._x, self._y = xy
+
+    @staticmethod
+    def _resolve_xy(angle: float, magnification: float) -> tuple[int, int]:
+        magnification = StickDisplacement._clamp_magnification(magnification)
         if magnification == 0.0:
             center = StickDisplacementRange.CENTER
-            self.x, self.y = center, center
-        else:
-            self.x, self.y = self._calculate_xy(self._clamp_angle(angle), magnification)
+            return center, center
+
+        angle = StickDisplacement._clamp_angle(angle)
+        steps = StickDisplacement.MAGNIFICATION_STEPS
+        magnification_index = round(magnification * steps)
+        if angle == int(angle) and magnification == magnification_index / steps:
+            # On the table grid the stored value is exactly what _calculate_xy would return.
+            return StickDisplacement._lookup(int(angle), magnification_index)
+        return StickDisplacement._calculate_xy(angle, magnification)
+
+    @staticmethod
+    def from_xy(x: int, y: int) -> 'StickDisplacement':
+        """Create displacement from axis values"""
+        displacement = StickDisplacement.__new__(StickDisplacement)
+        displacement.x, displacement.y = x, y
+        return displacement
+
+    @staticmethod
+    def quantized(angle: float, magnification: float = 1.0) -> 'StickDisplacement':
+        """Create displacement from the lookup table, rounding to 1 degree and 0.01 magnification"""
+        steps = StickDisplacement.MAGNIFICATION_STEPS
+        magnification_index = round(StickDisplacement._clamp_magnification(magnification) * steps)
+        if magnification_index == 0:
+            center = StickDisplacementRange.CENTER
+            return StickDisplacement.from_xy(center, center)
+        angle_index = round(angle) % StickDisplacement.ANGLE_STEPS
+        return StickDisplacement.from_xy(*StickDisplacement._lookup(angle_index, magnification_index))
+
+    @staticmethod
+    def _lookup(angle_index: int, magnification_index: int) -> tuple[int, int]:
+        table = StickDisplacement._table
+        row = table.get(magnification_index)
+        if row is None:
+            magnification = magnification_index / StickDisplacement.MAGNIFICATION_STEPS
+            row = [StickDisplacement._calculate_xy(angle, magnification)
+                   for angle in range(StickDisplacement.ANGLE_STEPS)]
+            table[magnification_index] = row
+        return row[angle_index]
 
     @property
     def x(self):
@@ -74,6 +134,8 @@ class StickDisplacement:
 class Stick:
     """Stick class for the Nintendo Switch Controller."""
 
+    __slots__ = ('_x', '_y', '_changed')
+
     def __init__(self,
                  displacement: Optional[StickDisplacement] = None,
                  x: Optional[int] = None,
@@ -116,6 +178,22 @@ class Stick:
         """Get if changed"""
         return self._changed
 
+    def __eq__(self, other):
+        if not isinstance(other, Stick):
+            return NotImplemented
+        return self._x == other._x and self._y == other._y
+
+    __hash__ = None
+
+    def __repr__(self):
+        return f"Stick(x={int(self._x)}, y={int(self._y)}, changed={self._changed})"
+
+    def copy(self, changed: Optional[bool] = None) -> 'Stick':
+        """Copy x and y value, keeping the changed flag unless given"""
+        stick = Stick(x=self._x, y=self._y)
+        stick._changed = self._changed if changed is None else changed
+        return stick
+
     def consume(self):
         """Consume changed flag"""
         self._changed = False
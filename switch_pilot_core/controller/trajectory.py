@@ -0,0 +1,96 @@
+from typing import Iterator, TYPE_CHECKING
+
+from .stick import StickDisplacement
+
+if TYPE_CHECKING:
+    import numpy as np
+
+
+class StickTrajectory:
+    """Stick axis values sampled at a fixed rate, computed as whole arrays."""
+
+    def __init__(self, axes: 'np.ndarray', rate: float):
+        if rate <= 0:
+            raise ValueError(f"rate must be positive: {rate}")
+        self._axes = axes
+        self._rate = rate
+
+    @property
+    def axes(self) -> 'np.ndarray':
+        """Array of shape (n, 2) holding x and y per sample"""
+        return self._axes
+
+    @property
+    def rate(self) -> float:
+        return self._rate
+
+    @property
+    def duration(self) -> float:
+        return len(self._axes) / self._rate
+
+    def __len__(self) -> int:
+        return len(self._axes)
+
+    def displacements(self) -> Iterator[StickDisplacement]:
+        for x, y in self._axes.tolist():
+            yield StickDisplacement.from_xy(x, y)
+
+    @staticmethod
+    def arc(start_angle: float,
+            end_angle: float,
+            duration: float,
+            rate: float,
+            magnification: float = 1.0) -> 'StickTrajectory':
+        """Move along an arc from start_angle to end_angle, in degrees counterclockwise like StickDisplacement."""
+        import numpy as np
+
+        count = StickTrajectory._sample_count(duration, rate)
+        angles = np.linspace(start_angle, end_angle, count, endpoint=False)
+        magnifications = np.full(count, min(max(magnification, 0.0), 1.0))
+        return StickTrajectory(StickTrajectory._polar_to_axes(angles, magnifications), rate)
+
+    @staticmethod
+    def circle(duration: float,
+               rate: float,
+               magnification: float = 1.0,
+               start_angle: float = 0.0,
+               turns: float = 1.0,
+               clockwise: bool = False) -> 'StickTrajectory':
+        sweep = -360.0 * turns if clockwise else 360.0 * turns
+        return StickTrajectory.arc(start_angle=start_angle,
+                                   end_angle=start_angle + sweep,
+                                   duration=duration,
+                                   rate=rate,
+                                   magnification=magnification)
+
+    @staticmethod
+    def linear(start: StickDisplacement,
+               end: StickDisplacement,
+               duration: float,
+               rate: float) -> 'StickTrajectory':
+        """Sweep axis values in a straight line from start to end, ending on end."""
+        import numpy as np
+
+        count = StickTrajectory._sample_count(duration, rate)
+        # A single sample has no room for the sweep, so it goes straight to end.
+        steps = (np.linspace(0.0, 1.0, count) if count > 1 else np.ones(1))[:, np.newaxis]
+        begin = np.array([start.x, start.y], dtype=np.float64)
+        finish = np.array([end.x, end.y], dtype=np.float64)
+        axes = np.rint(begin + (finish - begin) * steps).astype(np.uint8)
+        return StickTrajectory(axes, rate)
+
+    @staticmethod
+    def _sample_count(duration: float, rate: float) -> int:
+        if rate <= 0:
+            raise ValueError(f"rate must be positive: {rate}")
+        return max(int(round(duration * rate)), 1)
+
+    @staticmethod
+    def _polar_to_axes(angles: 'np.ndarray', magnifications: 'np.ndarray') -> 'np.ndarray':
+        import numpy as np
+
+        # Same formula as StickDisplacement._calculate_xy, applied to every sample at once.
+        radians = np.radians(np.mod(angles, 360.0))
+        x = np.ceil(127.5 * np.cos(radians) * magnifications + 127.5)
+        y = 255 - np.ceil(127.5 * np.sin(radians) * magnifications + 127.5)
+        return np.stack((x, y), axis=1).astype(np.uint8)
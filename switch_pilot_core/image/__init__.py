@@ -1,2 +1,5 @@
 from .image import Image
+from .matching import TemplateMatch, TemplateQuery
 from .region import ImageRegion
+from .template_cache import TemplateCache
+from .text_reader import TextReaderRegistry
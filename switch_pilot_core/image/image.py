@@ -1,17 +1,22 @@
-import math
 import os
-from typing import Optional
-
-import cv2
-from easyocr import easyocr
-import numpy as np
+from typing import Optional, TYPE_CHECKING
 
+from switch_pilot_core.image.matching import match_template, match_templates, region_bounds, TemplateMatch, TemplateQuery
 from switch_pilot_core.image.region import ImageRegion
+from switch_pilot_core.image.text_reader import TextReaderRegistry
+
+if TYPE_CHECKING:
+    import cv2
+    from easyocr import easyocr
 
 
 class Image:
-    def __init__(self, mat: Optional[cv2.typing.MatLike] = None):
-        self._mat: Optional[cv2.typing.MatLike] = mat
+    def __init__(self, mat: Optional['cv2.typing.MatLike'] = None):
+        self._mat: Optional['cv2.typing.MatLike'] = mat
+
+    @property
+    def mat(self) -> Optional['cv2.typing.MatLike']:
+        return self._mat
 
     @property
     def width(self) -> int:
@@ -23,6 +28,8 @@ class Image:
 
     @staticmethod
     def from_file(file_path: str, use_gray_scale: bool = True) -> 'Image':
+        import cv2
+
         if use_gray_scale:
             flags = cv2.IMREAD_GRAYSCALE
         else:
@@ -30,12 +37,12 @@ class Image:
         return Image(cv2.imread(filename=file_path, flags=flags))
 
     @staticmethod
-    def get_text_reader(langs: Optional[list[str]] = None) -> easyocr.Reader:
-        if langs is None or len(langs) == 0:
-            langs = ['ja', 'en']
-        return easyocr.Reader(langs)
+    def get_text_reader(langs: Optional[list[str]] = None) -> 'easyocr.Reader':
+        return TextReaderRegistry.shared().get(langs=langs)
 
     def save(self, file_path: str) -> bool:
+        import cv2
+
         ext = os.path.splitext(file_path)[1]
         result, n = cv2.imencode(ext, self._mat)
 
@@ -45,26 +52,28 @@ class Image:
         return result
 
     def roi(self, region: ImageRegion) -> 'Image':
-        height, width, _ = self._mat.shape
-        x0, x1 = math.ceil(width * region.x[0]), math.ceil(width * region.x[1])
-        y0, y1 = math.ceil(height * region.y[0]), math.ceil(height * region.y[1])
+        x0, y0, x1, y1 = region_bounds(self._mat.shape, region)
         return Image(self._mat[y0:y1, x0:x1])
 
     def to_gray_scale(self) -> 'Image':
+        import cv2
+
         return Image(cv2.cvtColor(self._mat, cv2.COLOR_BGR2GRAY))
 
-    def contains(self, other: 'Image', threshold: float) -> bool:
-        result = cv2.matchTemplate(self._mat, other._mat, cv2.TM_CCOEFF_NORMED)
-        _, max_val, _, _ = cv2.minMaxLoc(result)
+    def contains(self, other: 'Image', threshold: float, pyramid_levels: int = 0) -> bool:
+        max_val, _ = match_template(self._mat, other._mat, threshold=threshold, pyramid_levels=pyramid_levels)
         return max_val >= threshold
 
+    def match_templates(self, queries: list[TemplateQuery], pyramid_levels: int = 0) -> list[TemplateMatch]:
+        return match_templates(self._mat, queries, pyramid_levels=pyramid_levels)
+
     def is_contained_in(self, other: 'Image', threshold: float) -> bool:
         return other.contains(self, threshold)
 
     def contains_text(self,
                       target_text: str,
                       threshold: float = 0.8,
-                      reader: Optional[easyocr.Reader] = None,
+                      reader: Optional['easyocr.Reader'] = None,
                       langs: Optional[list[str]] = None) -> bool:
         results = self.detect_text(threshold=threshold, reader=reader, langs=langs)
         for result in results:
@@ -74,8 +83,10 @@ class Image:
 
     def detect_text(self,
                     threshold: float = 0.8,
-                    reader: Optional[easyocr.Reader] = None,
+                    reader: Optional['easyocr.Reader'] = None,
                     langs: Optional[list[str]] = None) -> list[tuple[str, float]]:
+        import numpy as np
+
         if reader is None:
             reader = self.get_text_reader(langs=langs)
 
@@ -0,0 +1,180 @@
+import math
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Optional, TYPE_CHECKING
+
+from switch_pilot_core.image.region import ImageRegion
+
+if TYPE_CHECKING:
+    import cv2
+    from switch_pilot_core.image.image import Image
+
+MIN_PYRAMID_TEMPLATE_SIDE = 8
+"""Templates smaller than this at the coarse level are matched at full resolution only."""
+
+DEFAULT_COARSE_MARGIN = 0.3
+"""How far below the threshold a coarse score may be and still get refined.
+
+Downscaling lowers the score of a true match by up to about 0.25 when the finest detail of the template spans
+2 * 2 ** pyramid_levels pixels, and by less for coarser detail. Templates with finer detail need a larger margin
+or pyramid_levels 0.
+"""
+
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+@dataclass(frozen=True)
+class TemplateQuery:
+    template: 'Image'
+    threshold: float
+    region: Optional[ImageRegion] = None
+    name: Optional[str] = None
+
+
+@dataclass(frozen=True)
+class TemplateMatch:
+    query: TemplateQuery
+    score: float
+    location: tuple[int, int]
+    """Top-left corner of the best match in the coordinates of the whole image."""
+
+    @property
+    def matched(self) -> bool:
+        return self.score >= self.query.threshold
+
+
+def region_bounds(shape: tuple[int, ...], region: ImageRegion) -> tuple[int, int, int, int]:
+    """Get (x0, y0, x1, y1) pixel bounds of region in an image of the given shape."""
+    height, width = shape[:2]
+    x0, x1 = math.ceil(width * region.x[0]), math.ceil(width * region.x[1])
+    y0, y1 = math.ceil(height * region.y[0]), math.ceil(height * region.y[1])
+    return x0, y0, x1, y1
+
+
+def match_templates(mat: 'cv2.typing.MatLike',
+                    queries: list[TemplateQuery],
+                    pyramid_levels: int = 0) -> list[TemplateMatch]:
+    """Score every query against a single image, sharing the color conversion between them."""
+    import cv2
+
+    if len(queries) == 0:
+        return []
+
+    sources = {mat.ndim: mat}
+    for query in queries:
+        ndim = query.template.mat.ndim
+        if ndim not in sources:
+            if ndim == 2 and mat.ndim == 3:
+                sources[2] = cv2.cvtColor(mat, cv2.COLOR_BGR2GRAY)
+            else:
+                raise ValueError(f"Can't match a {ndim}-dimensional template against a {mat.ndim}-dimensional image")
+
+    def match(query: TemplateQuery) -> TemplateMatch:
+        source = sources[query.template.mat.ndim]
+        x0, y0 = 0, 0
+        if query.region is not None:
+            x0, y0, x1, y1 = region_bounds(source.shape, query.region)
+            source = source[y0:y1, x0:x1]
+        score, (x, y) = match_template(source,
+                                       query.template.mat,
+                                       threshold=query.threshold,
+                                       pyramid_levels=pyramid_levels)
+        return TemplateMatch(query=query, score=score, location=(x0 + x, y0 + y))
+
+    if len(queries) == 1:
+        return [match(queries[0])]
+    # cv2.matchTemplate releases the GIL, so the templates are scored in parallel.
+    return list(_get_executor().map(match, queries))
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=min(4, os.cpu_count() or 1),
+                                           thread_name_prefix="match_templates")
+        return _executor
+
+
+def match_template(mat: 'cv2.typing.MatLike',
+                   template: 'cv2.typing.MatLike',
+                   threshold: float,
+                   pyramid_levels: int = 0,
+                   max_candidates: int = 5,
+                   coarse_margin: float = DEFAULT_COARSE_MARGIN) -> tuple[float, tuple[int, int]]:
+    """Get the best TM_CCOEFF_NORMED score and its top-left location of template in mat.
+
+    With pyramid_levels > 0 the search runs on an image downscaled by 2 ** pyramid_levels first.
+    Coarse peaks within coarse_margin of threshold are refined at full resolution, best first, and
+    the first one reaching threshold is returned. When no coarse peak is that close the search stops
+    after the coarse pass, so a miss costs about 1 / 4 ** pyramid_levels of a full search. Only when
+    more than max_candidates peaks are close without a match does the full search run. Scores of a
+    miss are estimates and may be below the global maximum.
+    """
+    if pyramid_levels > 0:
+        result = _match_pyramid(mat, template, threshold, pyramid_levels, max_candidates, coarse_margin)
+        if result is not None:
+            return result
+    return _match_full(mat, template)
+
+
+def _match_full(mat: 'cv2.typing.MatLike', template: 'cv2.typing.MatLike') -> tuple[float, tuple[int, int]]:
+    import cv2
+
+    result = cv2.matchTemplate(mat, template, cv2.TM_CCOEFF_NORMED)
+    _, max_val, _, max_loc = cv2.minMaxLoc(result)
+    return max_val, max_loc
+
+
+def _match_pyramid(mat: 'cv2.typing.MatLike',
+                   template: 'cv2.typing.MatLike',
+                   threshold: float,
+                   levels: int,
+                   max_candidates: int,
+                   coarse_margin: float) -> Optional[tuple[float, tuple[int, int]]]:
+    """Search coarse to fine, None when the full search has to decide."""
+    import cv2
+
+    factor = 2 ** levels
+    template_height, template_width = template.shape[:2]
+    height, width = mat.shape[:2]
+    coarse_template_size = (template_width // factor, template_height // factor)
+    coarse_size = (width // factor, height // factor)
+    if min(coarse_template_size) < MIN_PYRAMID_TEMPLATE_SIDE:
+        return None
+    if coarse_size[0] < coarse_template_size[0] or coarse_size[1] < coarse_template_size[1]:
+        return None
+
+    coarse_mat = cv2.resize(mat, coarse_size, interpolation=cv2.INTER_AREA)
+    coarse_template = cv2.resize(template, coarse_template_size, interpolation=cv2.INTER_AREA)
+    coarse = cv2.matchTemplate(coarse_mat, coarse_template, cv2.TM_CCOEFF_NORMED)
+
+    # Search radius around each coarse peak at full resolution; covers rounding from the downscale.
+    pad = factor + 1
+    suppress_x = max(coarse_template_size[0] // 2, 1)
+    suppress_y = max(coarse_template_size[1] // 2, 1)
+    best_score, best_loc = None, (0, 0)
+    for _ in range(max_candidates):
+        _, coarse_score, _, (cx, cy) = cv2.minMaxLoc(coarse)
+        if coarse_score < threshold - coarse_margin:
+            # No match loses more than coarse_margin to the downscale, so nothing further down can reach threshold.
+            if best_score is None:
+                return coarse_score, (cx * factor, cy * factor)
+            return best_score, best_loc
+
+        x0 = max(cx * factor - pad, 0)
+        y0 = max(cy * factor - pad, 0)
+        x1 = min(cx * factor + pad + template_width, width)
+        y1 = min(cy * factor + pad + template_height, height)
+        score, (lx, ly) = _match_full(mat[y0:y1, x0:x1], template)
+        if score >= threshold:
+            return score, (x0 + lx, y0 + ly)
+        if best_score is None or score > best_score:
+            best_score, best_loc = score, (x0 + lx, y0 + ly)
+
+        coarse[max(cy - suppress_y, 0):cy + suppress_y + 1, max(cx - suppress_x, 0):cx + suppress_x + 1] = -1.0
+    # Too many close peaks to tell; let the full search decide.
+    return None
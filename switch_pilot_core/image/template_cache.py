@@ -0,0 +1,100 @@
+import os
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Optional
+
+from switch_pilot_core.image.image import Image
+
+
+@dataclass(frozen=True)
+class _TemplateCacheEntry:
+    mtime_ns: int
+    file_size: int
+    image: Image
+    nbytes: int
+
+
+class TemplateCache:
+    """Process-wide LRU cache of decoded template images, invalidated by file mtime."""
+
+    _shared: Optional['TemplateCache'] = None
+    _shared_lock = threading.Lock()
+
+    def __init__(self, max_bytes: int = 256 * 1024 * 1024):
+        self._max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[tuple[str, bool], _TemplateCacheEntry] = OrderedDict()
+        self._total_bytes = 0
+
+    @classmethod
+    def shared(cls) -> 'TemplateCache':
+        with cls._shared_lock:
+            if cls._shared is None:
+                cls._shared = cls()
+            return cls._shared
+
+    @property
+    def max_bytes(self) -> int:
+        return self._max_bytes
+
+    @property
+    def total_bytes(self) -> int:
+        return self._total_bytes
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, file_path: str, use_gray_scale: bool = True) -> Image:
+        """Get a read-only template, decoding it again only when the file has changed."""
+        key = (os.path.abspath(file_path), use_gray_scale)
+        try:
+            stat = os.stat(key[0])
+        except FileNotFoundError:
+            self.invalidate(file_path)
+            raise FileNotFoundError(f"Template file not found: {file_path}")
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry.mtime_ns == stat.st_mtime_ns and entry.file_size == stat.st_size:
+                self._entries.move_to_end(key)
+                return entry.image
+
+        image = Image.from_file(file_path=key[0], use_gray_scale=use_gray_scale)
+        mat = image.mat
+        if mat is None:
+            raise ValueError(f"Template file can't be decoded: {file_path}")
+        mat.setflags(write=False)
+        entry = _TemplateCacheEntry(mtime_ns=stat.st_mtime_ns,
+                                    file_size=stat.st_size,
+                                    image=image,
+                                    nbytes=mat.nbytes)
+
+        with self._lock:
+            self._remove(key)
+            self._entries[key] = entry
+            self._total_bytes += entry.nbytes
+            self._evict()
+        return image
+
+    def invalidate(self, file_path: str):
+        path = os.path.abspath(file_path)
+        with self._lock:
+            for use_gray_scale in (True, False):
+                self._remove((path, use_gray_scale))
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._total_bytes = 0
+
+    def _remove(self, key: tuple[str, bool]):
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._total_bytes -= entry.nbytes
+
+    def _evict(self):
+        # Keep at least the most recent entry even if it alone exceeds the budget.
+        while self._total_bytes > self._max_bytes and len(self._entries) > 1:
+            _, entry = self._entries.popitem(last=False)
+            self._total_bytes -= entry.nbytes
@@ -0,0 +1,70 @@
+import threading
+from concurrent.futures import Future
+from typing import Optional, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from easyocr import easyocr
+
+DEFAULT_LANGS = ('ja', 'en')
+
+
+class TextReaderRegistry:
+    """Process-wide registry that loads each easyocr.Reader once per language set."""
+
+    _shared: Optional['TextReaderRegistry'] = None
+    _shared_lock = threading.Lock()
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._readers: dict[tuple[str, ...], Future] = {}
+
+    @classmethod
+    def shared(cls) -> 'TextReaderRegistry':
+        with cls._shared_lock:
+            if cls._shared is None:
+                cls._shared = cls()
+            return cls._shared
+
+    @staticmethod
+    def normalize_langs(langs: Optional[list[str]] = None) -> tuple[str, ...]:
+        if langs is None or len(langs) == 0:
+            return DEFAULT_LANGS
+        return tuple(langs)
+
+    def warm_up(self, langs: Optional[list[str]] = None) -> Future:
+        """Start loading the reader on a background thread if it is not loaded yet."""
+        key = self.normalize_langs(langs)
+        with self._lock:
+            future = self._readers.get(key)
+            if future is None:
+                future = Future()
+                self._readers[key] = future
+                threading.Thread(target=self._load,
+                                 args=(key, future),
+                                 name=f"{TextReaderRegistry.__name__}:{'+'.join(key)}",
+                                 daemon=True).start()
+        return future
+
+    def get(self, langs: Optional[list[str]] = None, timeout: Optional[float] = None) -> 'easyocr.Reader':
+        return self.warm_up(langs).result(timeout=timeout)
+
+    def is_loaded(self, langs: Optional[list[str]] = None) -> bool:
+        future = self._readers.get(self.normalize_langs(langs))
+        return future is not None and future.done() and future.exception() is None
+
+    def _load(self, key: tuple[str, ...], future: Future):
+        try:
+            # easyocr pulls in torch; import it only when a reader is actually needed.
+            from easyocr import easyocr
+            import numpy as np
+
+            reader = easyocr.Reader(list(key))
+            # The first readtext call initializes the models lazily; pay for it here instead of in a command.
+            reader.readtext(np.zeros((32, 32, 3), dtype=np.uint8))
+        except BaseException as e:
+            with self._lock:
+                if self._readers.get(key) is future:
+                    del self._readers[key]
+            future.set_exception(e)
+        else:
+            future.set_result(reader)
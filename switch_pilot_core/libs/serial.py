@@ -1,9 +1,14 @@
+import threading
+import time
 from typing import Optional
 
 import serial
 import serial.tools.list_ports
 from pydantic import BaseModel
 
+from .serial_reader import SerialReader
+from .serial_writer import SerialWriter
+
 
 class SerialPortInfo(BaseModel):
     path: str
@@ -13,6 +18,11 @@ class SerialPortInfo(BaseModel):
 class SerialPort:
     def __init__(self):
         self._serial: Optional[serial.Serial] = None
+        self._writer: Optional[SerialWriter] = None
+        self._reader: Optional[SerialReader] = None
+        self._write_lock = threading.Lock()
+        self.flow_control_timeout: Optional[float] = None
+        """Longest time a write waits for the in-flight window before raising TimeoutError; None waits for a slot."""
 
     @property
     def is_open(self) -> bool:
@@ -26,9 +36,76 @@ class SerialPort:
             if port.description != "n/a"
         ]
 
+    @property
+    def writer(self) -> Optional[SerialWriter]:
+        return self._writer
+
+    @property
+    def is_writer_running(self) -> bool:
+        writer = self._writer
+        return writer is not None and writer.is_running
+
+    def start_writer(self, max_queue: int = 64):
+        """Move writes to a dedicated thread behind a bounded queue."""
+        self.stop_writer()
+        self._writer = SerialWriter(write=self._write_now, max_queue=max_queue)
+        self._writer.start()
+
+    def stop_writer(self, flush_timeout: Optional[float] = None) -> bool:
+        writer = self._writer
+        self._writer = None
+        if writer is None:
+            return True
+        return writer.stop(flush_timeout=flush_timeout)
+
+    @property
+    def reader(self) -> Optional[SerialReader]:
+        return self._reader
+
+    def start_reader(self,
+                     max_in_flight: Optional[int] = None,
+                     ack_prefix: Optional[bytes] = None,
+                     ack_timeout: float = 1.0):
+        """Read device acknowledgments on a dedicated thread to measure round-trip times.
+
+        With max_in_flight set, writes block while that many reports are unacknowledged. Combined
+        with the writer thread, reports superseded while blocked are coalesced in its queue instead.
+        """
+        if not self.is_open:
+            raise Exception("SerialPort is not open.")
+        self.stop_reader()
+        # A short read timeout lets the reader thread notice when it is stopped.
+        self._serial.timeout = 0.05
+        self._reader = SerialReader(read=self._read_available,
+                                    max_in_flight=max_in_flight,
+                                    ack_prefix=ack_prefix,
+                                    ack_timeout=ack_timeout)
+        self._reader.start()
+
+    def stop_reader(self):
+        reader = self._reader
+        self._reader = None
+        if reader is not None:
+            reader.stop()
+
+    def _read_available(self) -> bytes:
+        serial_port = self._serial
+        return serial_port.read(max(serial_port.in_waiting, 1))
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Wait until queued writes reach the port; returns False if timeout passes first."""
+        writer = self._writer
+        if writer is None:
+            return True
+        return writer.flush(timeout=timeout)
+
     def close(self):
-        if self.is_open:
-            self._serial.close()
+        try:
+            self.stop_writer(flush_timeout=1.0)
+            self.stop_reader()
+        finally:
+            if self.is_open:
+                self._serial.close()
 
     def open(self, info: SerialPortInfo, baud_rate: int):
         if self.is_open:
@@ -36,10 +113,33 @@ class SerialPort:
         self._serial = serial.Serial(port=info.path, baudrate=baud_rate)
 
     def write(self, content: str):
+        self.write_bytes(content.encode('utf-8'))
+
+    def write_bytes(self, data: bytes, coalesce: bool = False):
+        """Write data, through the writer thread if it runs; coalesce lets a later coalescible write replace it."""
+        writer = self._writer
+        if writer is not None and writer.is_running:
+            writer.put(data, coalesce=coalesce)
+        else:
+            self._write_now(data)
+
+    def _write_now(self, data: bytes):
         if not self.is_open:
             raise Exception("SerialPort is not open.")
 
-        self._serial.write(content.encode('utf-8'))
+        reader = self._reader
+        if reader is None:
+            self._serial.write(data)
+            return
+
+        # Writes from the caller and the writer thread must not interleave between acquire and on_sent.
+        with self._write_lock:
+            if not reader.acquire(timeout=self.flow_control_timeout):
+                # Writing anyway would overrun the device's buffer, which is what the window is there to prevent.
+                raise TimeoutError("SerialPort flow control window is full.")
+            # Counted before the write returns, since a fast device may already have answered by then.
+            reader.on_sent(time.perf_counter())
+            self._serial.write(data)
 
     def write_line(self, line: str):
         self.write(f"{line}\r\n")
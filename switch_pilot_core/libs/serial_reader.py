@@ -0,0 +1,178 @@
+import threading
+import time
+from collections import deque
+from typing import Callable, Optional
+
+from switch_pilot_core.utils.histogram import Histogram
+
+
+class SerialReader:
+    """Reads device lines on a dedicated thread and matches acknowledgments to written reports in order.
+
+    The device is expected to answer every report with one line. With ack_prefix set, only lines
+    starting with it count as acknowledgments and the others are kept in lines. With max_in_flight
+    set, acquire() blocks writers while that many reports are still unacknowledged.
+    """
+
+    def __init__(self,
+                 read: Callable[[], bytes],
+                 max_in_flight: Optional[int] = None,
+                 ack_prefix: Optional[bytes] = None,
+                 ack_timeout: float = 1.0,
+                 max_lines: int = 256):
+        self._read = read
+        self._max_in_flight = max_in_flight
+        self._ack_prefix = ack_prefix
+        self._ack_timeout = ack_timeout
+        self._condition = threading.Condition()
+        self._in_flight: deque[float] = deque()
+        self._lines: deque[bytes] = deque(maxlen=max_lines)
+        self._buffer = bytearray()
+        self._thread: Optional[threading.Thread] = None
+        self._is_stopping = False
+        self._acked_count = 0
+        self._lost_count = 0
+        self._acquire_timeout_count = 0
+        self._last_round_trip_time: Optional[float] = None
+
+        self.round_trip_time = Histogram.exponential(start=1e-5, factor=2, count=20)
+        """Seconds from the write of a report to its acknowledgment."""
+
+    @property
+    def is_running(self) -> bool:
+        thread = self._thread
+        return thread is not None and thread.is_alive()
+
+    @property
+    def max_in_flight(self) -> Optional[int]:
+        return self._max_in_flight
+
+    @property
+    def in_flight(self) -> int:
+        with self._condition:
+            return len(self._in_flight)
+
+    @property
+    def acked_count(self) -> int:
+        return self._acked_count
+
+    @property
+    def lost_count(self) -> int:
+        """Reports given up on because no acknowledgment arrived within ack_timeout."""
+        return self._lost_count
+
+    @property
+    def acquire_timeout_count(self) -> int:
+        """Calls to acquire that timed out because the window stayed full."""
+        return self._acquire_timeout_count
+
+    @property
+    def last_round_trip_time(self) -> Optional[float]:
+        return self._last_round_trip_time
+
+    def start(self):
+        if self.is_running:
+            return
+        self._is_stopping = False
+        self._thread = threading.Thread(target=self._run, name=SerialReader.__name__, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._is_stopping = True
+        with self._condition:
+            self._condition.notify_all()
+        thread = self._thread
+        if thread is not None and thread is not threading.current_thread():
+            thread.join()
+        self._thread = None
+
+    def pop_lines(self) -> list[bytes]:
+        """Take the lines received that were not acknowledgments."""
+        with self._condition:
+            lines = list(self._lines)
+            self._lines.clear()
+            return lines
+
+    def acquire(self, timeout: Optional[float] = None) -> bool:
+        """Wait until another report may be written; returns False on timeout."""
+        max_in_flight = self._max_in_flight
+        if max_in_flight is None:
+            return True
+        deadline = None if timeout is None else time.perf_counter() + timeout
+        with self._condition:
+            while True:
+                self._expire()
+                if len(self._in_flight) < max_in_flight or self._is_stopping:
+                    return True
+                # Wake up for the oldest report's ack timeout even if nothing arrives.
+                wait = self._in_flight[0] + self._ack_timeout - time.perf_counter()
+                if deadline is not None:
+                    remaining = deadline - time.perf_counter()
+                    if remaining <= 0:
+                        self._acquire_timeout_count += 1
+                        return False
+                    wait = min(wait, remaining)
+                self._condition.wait(timeout=max(wait, 0.0))
+
+    def on_sent(self, sent_at: float):
+        with self._condition:
+            self._in_flight.append(sent_at)
+
+    def wait_for_acks(self, timeout: Optional[float] = None) -> bool:
+        """Wait until every written report is acknowledged or given up on."""
+        deadline = None if timeout is None else time.perf_counter() + timeout
+        with self._condition:
+            while True:
+                self._expire()
+                if len(self._in_flight) == 0:
+                    return True
+                wait = self._in_flight[0] + self._ack_timeout - time.perf_counter()
+                if deadline is not None:
+                    remaining = deadline - time.perf_counter()
+                    if remaining <= 0:
+                        return False
+                    wait = min(wait, remaining)
+                self._condition.wait(timeout=max(wait, 0.0))
+
+    def _expire(self):
+        in_flight = self._in_flight
+        expired_before = time.perf_counter() - self._ack_timeout
+        while len(in_flight) > 0 and in_flight[0] < expired_before:
+            in_flight.popleft()
+            self._lost_count += 1
+
+    def _run(self):
+        while not self._is_stopping:
+            try:
+                chunk = self._read()
+            except Exception:
+                # The port was closed underneath the reader.
+                return
+            if not chunk:
+                continue
+            received_at = time.perf_counter()
+            buffer = self._buffer
+            buffer.extend(chunk)
+            while True:
+                end = buffer.find(b"\n")
+                if end < 0:
+                    break
+                line = bytes(buffer[:end]).rstrip(b"\r")
+                del buffer[:end + 1]
+                self._receive_line(line, received_at)
+
+    def _receive_line(self, line: bytes, received_at: float):
+        with self._condition:
+            if self._ack_prefix is not None and not line.startswith(self._ack_prefix):
+                self._lines.append(line)
+                return
+            self._expire()
+            if len(self._in_flight) == 0:
+                # Acknowledgment for a report already given up on, or an unsolicited line.
+                self._lines.append(line)
+                return
+            round_trip_time = received_at - self._in_flight.popleft()
+            self._acked_count += 1
+            self._last_round_trip_time = round_trip_time
+            self.round_trip_time.record(round_trip_time)
+            self._condition.notify_all()
@@ -0,0 +1,143 @@
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Callable, Optional
+
+from switch_pilot_core.utils.histogram import Histogram
+
+
+@dataclass
+class _WriteRequest:
+    data: bytes
+    coalesce: bool
+    enqueued_at: float
+
+
+class SerialWriter:
+    """Writes to a serial port from a dedicated thread behind a bounded queue.
+
+    A coalescible request replaces a coalescible request still waiting at the tail of the queue,
+    so a state report that is superseded before it could be written is never sent.
+    """
+
+    def __init__(self, write: Callable[[bytes], None], max_queue: int = 64):
+        if max_queue < 1:
+            raise ValueError(f"max_queue must be positive: {max_queue}")
+        self._write = write
+        self._max_queue = max_queue
+        self._queue: deque[_WriteRequest] = deque()
+        self._condition = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+        self._is_stopping = False
+        self._is_writing = False
+        self._error: Optional[BaseException] = None
+        self._coalesced_count = 0
+
+        self.write_latency = Histogram.exponential(start=1e-6, factor=2, count=24)
+        """Seconds spent blocked in the write call."""
+        self.delivery_latency = Histogram.exponential(start=1e-6, factor=2, count=24)
+        """Seconds from put to the end of the write call."""
+        self.queue_depth = Histogram([0, 1, 2, 4, 8, 16, 32, 64, 128, 256])
+        """Requests waiting in the queue, sampled on every put."""
+
+    @property
+    def is_running(self) -> bool:
+        thread = self._thread
+        return thread is not None and thread.is_alive()
+
+    @property
+    def coalesced_count(self) -> int:
+        return self._coalesced_count
+
+    @property
+    def pending(self) -> int:
+        with self._condition:
+            return len(self._queue) + (1 if self._is_writing else 0)
+
+    def start(self):
+        if self.is_running:
+            return
+        with self._condition:
+            self._is_stopping = False
+            self._error = None
+        self._thread = threading.Thread(target=self._run,
+                                        name=SerialWriter.__name__,
+                                        daemon=True)
+        self._thread.start()
+
+    def stop(self, flush_timeout: Optional[float] = None) -> bool:
+        """Stop the writer thread; returns False if requests were dropped because flush timed out or a write failed.
+
+        The thread is stopped even then, so a port can always be torn down; a pending write error is discarded.
+        """
+        try:
+            flushed = self.flush(timeout=flush_timeout) if self.is_running else True
+        except Exception:
+            flushed = False
+        with self._condition:
+            self._is_stopping = True
+            self._queue.clear()
+            self._condition.notify_all()
+        thread = self._thread
+        if thread is not None and thread is not threading.current_thread():
+            thread.join()
+        self._thread = None
+        self._error = None
+        return flushed
+
+    def put(self, data: bytes, coalesce: bool = False, timeout: Optional[float] = None):
+        """Queue data for writing, blocking while the queue is full; raises TimeoutError after timeout."""
+        with self._condition:
+            self._raise_error()
+            queue = self._queue
+            if coalesce and len(queue) > 0 and queue[-1].coalesce:
+                queue[-1] = _WriteRequest(data=data, coalesce=True, enqueued_at=queue[-1].enqueued_at)
+                self._coalesced_count += 1
+            else:
+                if not self._condition.wait_for(lambda: len(queue) < self._max_queue or self._is_stopping,
+                                                timeout=timeout):
+                    raise TimeoutError("SerialWriter queue is full.")
+                queue.append(_WriteRequest(data=data, coalesce=coalesce, enqueued_at=time.perf_counter()))
+            self.queue_depth.record(len(queue))
+            self._condition.notify_all()
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Wait until everything queued so far is written; returns False on timeout."""
+        with self._condition:
+            flushed = self._condition.wait_for(
+                lambda: (len(self._queue) == 0 and not self._is_writing) or self._error is not None,
+                timeout=timeout)
+            self._raise_error()
+            return flushed
+
+    def _raise_error(self):
+        error = self._error
+        if error is not None:
+            self._error = None
+            raise error
+
+    def _run(self):
+        condition = self._condition
+        while True:
+            with condition:
+                condition.wait_for(lambda: len(self._queue) > 0 or self._is_stopping)
+                if self._is_stopping:
+                    return
+                request = self._queue.popleft()
+                self._is_writing = True
+                condition.notify_all()
+
+            try:
+                start = time.perf_counter()
+                self._write(request.data)
+                end = time.perf_counter()
+                self.write_latency.record(end - start)
+                self.delivery_latency.record(end - request.enqueued_at)
+            except BaseException as e:
+                with condition:
+                    self._error = e
+            finally:
+                with condition:
+                    self._is_writing = False
+                    condition.notify_all()
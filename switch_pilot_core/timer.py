@@ -1,7 +1,8 @@
-import time
 from dataclasses import dataclass
 from typing import Optional
 
+from switch_pilot_core.timing import Clock, SystemClock
+
 
 @dataclass
 class ElapsedTime:
@@ -11,7 +12,8 @@ class ElapsedTime:
 
 
 class Timer:
-    def __init__(self):
+    def __init__(self, clock: Optional[Clock] = None):
+        self.clock = clock if clock is not None else SystemClock.shared()
         self._start_time: Optional[float] = None
         self._stop_time: Optional[float] = None
 
@@ -44,6 +46,5 @@ class Timer:
                            minutes=minutes,
                            seconds=seconds)
 
-    @staticmethod
-    def _get_current_time():
-        return time.time()
+    def _get_current_time(self):
+        return self.clock.now()
@@ -0,0 +1,4 @@
+from .cancellation import CancellationToken
+from .sleeper import PrecisionSleeper, TimingStats
+from .clock import Clock, SystemClock, VirtualClock
+from .schedule import DeadlineSchedule, ScheduleReport
@@ -0,0 +1,110 @@
+import threading
+import time
+from abc import ABCMeta, abstractmethod
+from typing import Callable, Optional
+
+from .cancellation import CancellationToken
+from .sleeper import PrecisionSleeper
+
+
+class Clock(metaclass=ABCMeta):
+    """Source of time and waits, so commands can run on real or simulated time."""
+
+    @abstractmethod
+    def now(self) -> float:
+        """Monotonic time in seconds, comparable to time.perf_counter."""
+        raise NotImplementedError
+
+    def now_ns(self) -> int:
+        return int(self.now() * 1e9)
+
+    @property
+    def is_virtual(self) -> bool:
+        """Whether sleeping moves the time forward; only the owner of such a clock may sleep on it."""
+        return False
+
+    @abstractmethod
+    def sleep_until(self, deadline: float, token: Optional[CancellationToken] = None) -> float:
+        """Wait until the deadline and return how late it woke up, negative when cut short by token."""
+        raise NotImplementedError
+
+    def sleep(self, duration: float, token: Optional[CancellationToken] = None) -> float:
+        return self.sleep_until(self.now() + float(duration), token=token)
+
+
+class SystemClock(Clock):
+    _shared: Optional['SystemClock'] = None
+    _shared_lock = threading.Lock()
+
+    def __init__(self, sleeper: Optional[PrecisionSleeper] = None):
+        self._sleeper = sleeper if sleeper is not None else PrecisionSleeper.shared()
+
+    @classmethod
+    def shared(cls) -> 'SystemClock':
+        with cls._shared_lock:
+            if cls._shared is None:
+                cls._shared = cls()
+            return cls._shared
+
+    @property
+    def sleeper(self) -> PrecisionSleeper:
+        return self._sleeper
+
+    def now(self) -> float:
+        return time.perf_counter()
+
+    def now_ns(self) -> int:
+        return time.perf_counter_ns()
+
+    def sleep_until(self, deadline: float, token: Optional[CancellationToken] = None) -> float:
+        return self._sleeper.sleep_until(deadline, token=token)
+
+
+class VirtualClock(Clock):
+    """Simulated time that jumps straight to every deadline instead of waiting.
+
+    Listeners are called with the new time after every advance, which is how a replay camera is kept in step.
+    Meant for a single command thread; background threads that wait on real time are not slowed down with it.
+    """
+
+    def __init__(self, start: float = 0.0):
+        self._now = start
+        self._lock = threading.Lock()
+        self._listeners: list[Callable[[float], None]] = []
+
+    def now(self) -> float:
+        return self._now
+
+    @property
+    def is_virtual(self) -> bool:
+        return True
+
+    def advance(self, duration: float) -> float:
+        if duration < 0:
+            raise ValueError(f"duration must not be negative: {duration}")
+        return self.advance_to(self._now + duration)
+
+    def advance_to(self, deadline: float) -> float:
+        with self._lock:
+            if deadline <= self._now:
+                return self._now
+            self._now = deadline
+            listeners = list(self._listeners)
+        for listener in listeners:
+            listener(deadline)
+        return deadline
+
+    def sleep_until(self, deadline: float, token: Optional[CancellationToken] = None) -> float:
+        if token is not None and token.is_cancelled:
+            return min(self._now - deadline, 0.0)
+        self.advance_to(deadline)
+        return 0.0
+
+    def add_listener(self, listener: Callable[[float], None]):
+        with self._lock:
+            self._listeners.append(listener)
+
+    def remove_listener(self, listener: Callable[[float], None]):
+        with self._lock:
+            if listener in self._listeners:
+                self._listeners.remove(listener)
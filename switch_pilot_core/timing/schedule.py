@@ -0,0 +1,81 @@
+from dataclasses import dataclass
+from typing import Optional
+
+from .cancellation import CancellationToken
+from .clock import Clock, SystemClock
+from .sleeper import PrecisionSleeper
+
+
+@dataclass(frozen=True)
+class ScheduleReport:
+    errors: tuple[float, ...]
+    """Lateness of every step in seconds, measured against its absolute deadline."""
+    planned_duration: float
+    actual_duration: float
+
+    @property
+    def drift(self) -> float:
+        return self.actual_duration - self.planned_duration
+
+    @property
+    def max_error(self) -> float:
+        return max(self.errors, default=0.0)
+
+    @property
+    def mean_error(self) -> float:
+        return sum(self.errors) / len(self.errors) if len(self.errors) > 0 else 0.0
+
+
+class DeadlineSchedule:
+    """Sequence of waits measured from a single start time, so per-step overshoot never accumulates."""
+
+    def __init__(self,
+                 sleeper: Optional[PrecisionSleeper] = None,
+                 start: Optional[float] = None,
+                 token: Optional[CancellationToken] = None,
+                 clock: Optional[Clock] = None):
+        """clock takes precedence over sleeper; without either the schedule runs on real time."""
+        if clock is None:
+            clock = SystemClock.shared() if sleeper is None else SystemClock(sleeper)
+        self._clock = clock
+        self._token = token
+        self._start = clock.now() if start is None else start
+        self._offset = 0.0
+        self._errors: list[float] = []
+
+    @property
+    def start(self) -> float:
+        return self._start
+
+    @property
+    def is_cancelled(self) -> bool:
+        return self._token is not None and self._token.is_cancelled
+
+    @property
+    def offset(self) -> float:
+        """Planned time since start of the latest deadline."""
+        return self._offset
+
+    @property
+    def next_deadline(self) -> float:
+        return self._start + self._offset
+
+    def advance(self, duration: float) -> float:
+        """Move the deadline by duration, wait for it and return how late it woke up."""
+        return self.wait_until_offset(self._offset + float(duration))
+
+    def wait_until_offset(self, offset: float) -> float:
+        """Wait until offset seconds after start and return how late it woke up.
+
+        A cancelled wait returns early with a negative error that is left out of the report.
+        """
+        self._offset = offset
+        error = self._clock.sleep_until(self._start + offset, token=self._token)
+        if not self.is_cancelled:
+            self._errors.append(error)
+        return error
+
+    def report(self) -> ScheduleReport:
+        return ScheduleReport(errors=tuple(self._errors),
+                              planned_duration=self._offset,
+                              actual_duration=self._clock.now() - self._start)
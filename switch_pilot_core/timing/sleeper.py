@@ -0,0 +1,109 @@
+import threading
+import time
+from dataclasses import dataclass
+from typing import Optional
+
+from .cancellation import CancellationToken
+
+
+@dataclass
+class TimingStats:
+    count: int = 0
+    total_error: float = 0.0
+    max_error: float = 0.0
+
+    @property
+    def mean_error(self) -> float:
+        return self.total_error / self.count if self.count > 0 else 0.0
+
+    def record(self, error: float):
+        self.count += 1
+        self.total_error += error
+        self.max_error = max(self.max_error, error)
+
+
+class PrecisionSleeper:
+    """Sleeps until just before a deadline and busy-waits only for the calibrated slack."""
+
+    _shared: Optional['PrecisionSleeper'] = None
+    _shared_lock = threading.Lock()
+
+    def __init__(self,
+                 slack: Optional[float] = None,
+                 min_slack: float = 0.0005,
+                 max_slack: float = 0.02):
+        self._min_slack = min_slack
+        self._max_slack = max_slack
+        self._slack = slack
+        self._calibration_lock = threading.Lock()
+        self._stats = TimingStats()
+        self._stats_lock = threading.Lock()
+
+    @classmethod
+    def shared(cls) -> 'PrecisionSleeper':
+        with cls._shared_lock:
+            if cls._shared is None:
+                # Calibration takes about 50 sleeps, so it is left to the first sleep that needs the slack.
+                cls._shared = cls()
+            return cls._shared
+
+    @property
+    def slack(self) -> float:
+        """Time left before the deadline that is busy-waited, calibrated on first use unless given."""
+        if self._slack is None:
+            with self._calibration_lock:
+                if self._slack is None:
+                    self.calibrate()
+        return self._slack
+
+    @property
+    def stats(self) -> TimingStats:
+        """Achieved error of every sleep so far, in seconds past the deadline."""
+        with self._stats_lock:
+            return TimingStats(count=self._stats.count,
+                               total_error=self._stats.total_error,
+                               max_error=self._stats.max_error)
+
+    def reset_stats(self):
+        with self._stats_lock:
+            self._stats = TimingStats()
+
+    def calibrate(self, samples: int = 50, quantum: float = 0.001) -> float:
+        """Measure how late time.sleep wakes up and use its 95th percentile as slack."""
+        overshoots = []
+        for _ in range(samples):
+            start = time.perf_counter()
+            time.sleep(quantum)
+            overshoots.append(time.perf_counter() - start - quantum)
+        overshoots.sort()
+        slack = overshoots[min(int(len(overshoots) * 0.95), len(overshoots) - 1)]
+        self._slack = min(max(slack, self._min_slack), self._max_slack)
+        return self._slack
+
+    def sleep(self, duration: float, token: Optional[CancellationToken] = None) -> float:
+        return self.sleep_until(time.perf_counter() + duration, token=token)
+
+    def sleep_until(self, deadline: float, token: Optional[CancellationToken] = None) -> float:
+        """Wait until the perf_counter deadline and return how late it woke up.
+
+        When token is cancelled the wait ends at once and the negative time left is returned without being recorded.
+        """
+        remaining = deadline - time.perf_counter()
+        # A deadline already due needs no slack, so it does not trigger the calibration either.
+        if remaining > 0 and remaining > self.slack:
+            if token is None:
+                time.sleep(remaining - self._slack)
+            elif token.wait(remaining - self._slack):
+                return time.perf_counter() - deadline
+        if token is None:
+            while time.perf_counter() < deadline:
+                pass
+        else:
+            while time.perf_counter() < deadline:
+                if token.is_cancelled:
+                    return time.perf_counter() - deadline
+
+        error = time.perf_counter() - deadline
+        with self._stats_lock:
+            self._stats.record(error)
+        return error
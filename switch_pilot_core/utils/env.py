@@ -1,7 +1,18 @@
+import os
 import sys
+from typing import Optional
 
 
 def is_packed() -> bool:
     # PyInstaller Run-time Information
     # See https://pyinstaller.org/en/stable/runtime-information.html#run-time-information
     return getattr(sys, 'frozen', False) and hasattr(sys, '_MEIPASS')
+
+
+CAMERA_SOURCE_ENV = 'SWITCH_PILOT_CAMERA_SOURCE'
+
+
+def camera_source() -> Optional[str]:
+    """Frame source spec from the environment, e.g. "video:/path/to/run.mp4?speed=4"; None for the default."""
+    value = os.environ.get(CAMERA_SOURCE_ENV, '').strip()
+    return value if value != '' else None
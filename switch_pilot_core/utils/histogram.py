@@ -0,0 +1,70 @@
+import bisect
+import threading
+from typing import Optional
+
+
+class Histogram:
+    """Thread-safe histogram over fixed, ascending bucket upper bounds."""
+
+    def __init__(self, bounds: list[float]):
+        self._bounds = list(bounds)
+        self._counts = [0] * (len(self._bounds) + 1)
+        self._lock = threading.Lock()
+        self._count = 0
+        self._total = 0.0
+        self._max: Optional[float] = None
+
+    @staticmethod
+    def exponential(start: float, factor: float, count: int) -> 'Histogram':
+        return Histogram([start * factor ** i for i in range(count)])
+
+    @property
+    def bounds(self) -> list[float]:
+        return list(self._bounds)
+
+    @property
+    def counts(self) -> list[int]:
+        """Counts per bucket; the last one holds values above the largest bound."""
+        with self._lock:
+            return list(self._counts)
+
+    @property
+    def count(self) -> int:
+        return self._count
+
+    @property
+    def mean(self) -> float:
+        with self._lock:
+            return self._total / self._count if self._count > 0 else 0.0
+
+    @property
+    def max(self) -> Optional[float]:
+        return self._max
+
+    def record(self, value: float):
+        with self._lock:
+            self._counts[bisect.bisect_left(self._bounds, value)] += 1
+            self._count += 1
+            self._total += value
+            if self._max is None or value > self._max:
+                self._max = value
+
+    def percentile(self, p: float) -> Optional[float]:
+        """Upper bound of the bucket holding the p-th percentile, the maximum for the overflow bucket."""
+        with self._lock:
+            if self._count == 0:
+                return None
+            rank = p / 100 * self._count
+            cumulative = 0
+            for i, count in enumerate(self._counts):
+                cumulative += count
+                if cumulative >= rank and count > 0:
+                    return self._bounds[i] if i < len(self._bounds) else self._max
+            return self._max
+
+    def reset(self):
+        with self._lock:
+            self._counts = [0] * (len(self._bounds) + 1)
+            self._count = 0
+            self._total = 0.0
+            self._max = None
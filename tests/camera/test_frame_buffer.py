@@ -0,0 +1,126 @@
+import threading
+import time
+
+import numpy as np
+import pytest
+
+from switch_pilot_core.camera import Camera, SyntheticFrameSource
+from switch_pilot_core.camera.frame_buffer import FrameBuffer
+from switch_pilot_core.timing import CancellationToken, VirtualClock
+
+SIZE = (32, 18)
+
+
+class NullLogger:
+    def debug(self, message):
+        pass
+
+    info = error = debug
+
+
+def numbered_frame(position: int):
+    mat = np.zeros((SIZE[1], SIZE[0], 3), dtype=np.uint8)
+    mat[0, 0, 0] = position % 256
+    return mat
+
+
+def test_frames_are_stamped_with_the_buffer_clock():
+    clock = VirtualClock(start=5.0)
+    frame_buffer = FrameBuffer(clock=clock)
+
+    first = frame_buffer.push(np.zeros((2, 2), dtype=np.uint8))
+    clock.advance(0.25)
+    second = frame_buffer.push(np.zeros((2, 2), dtype=np.uint8))
+
+    assert (first.timestamp, second.timestamp) == (5.0, 5.25)
+
+
+def push_frames(frame_buffer: FrameBuffer, count: int):
+    for i in range(count):
+        frame_buffer.push(np.full((2, 2), i, dtype=np.uint8))
+
+
+def test_buffer_keeps_only_the_newest_frames():
+    frame_buffer = FrameBuffer(capacity=3)
+    assert frame_buffer.latest() is None
+
+    push_frames(frame_buffer, 5)
+
+    assert frame_buffer.sequence == 5
+    assert frame_buffer.latest().sequence == 5
+    assert [frame_buffer.look_back(n).sequence for n in range(3)] == [5, 4, 3]
+    assert frame_buffer.look_back(3) is None
+    with pytest.raises(ValueError):
+        frame_buffer.look_back(-1)
+
+
+def test_capacity_must_be_positive():
+    with pytest.raises(ValueError):
+        FrameBuffer(capacity=0)
+
+
+def test_wait_for_next_returns_frame_pushed_from_another_thread():
+    frame_buffer = FrameBuffer()
+    push_frames(frame_buffer, 1)
+
+    timer = threading.Timer(0.05, push_frames, args=(frame_buffer, 1))
+    timer.start()
+    frame = frame_buffer.wait_for_next(timeout=2.0)
+    timer.join()
+
+    assert frame.sequence == 2
+
+
+def test_wait_for_next_returns_buffered_frame_newer_than_after_sequence():
+    frame_buffer = FrameBuffer()
+    push_frames(frame_buffer, 3)
+
+    assert frame_buffer.wait_for_next(after_sequence=1, timeout=0).sequence == 3
+    assert frame_buffer.wait_for_next(after_sequence=3, timeout=0.01) is None
+
+
+def test_wait_for_next_returns_none_when_cancelled():
+    frame_buffer = FrameBuffer()
+    token = CancellationToken()
+
+    timer = threading.Timer(0.05, token.cancel)
+    timer.start()
+    started_at = time.perf_counter()
+    frame = frame_buffer.wait_for_next(timeout=5.0, token=token)
+    timer.join()
+
+    assert frame is None
+    assert time.perf_counter() - started_at < 2.0
+
+
+def test_capture_thread_fills_buffer_until_stopped():
+    camera = Camera(capture_size=SIZE, logger=NullLogger())
+    camera.open(SyntheticFrameSource(size=SIZE, fps=200.0, generator=numbered_frame))
+    camera.start_capture(buffer_size=4)
+    try:
+        assert camera.is_capturing
+        first = camera.wait_for_next_frame(timeout=2.0)
+        second = camera.wait_for_next_frame(after_sequence=first.sequence, timeout=2.0)
+        assert second.sequence > first.sequence
+        assert second.timestamp >= first.timestamp
+        assert second.source_time > first.source_time
+        # While capturing, the current frame is the latest buffered one.
+        assert camera.current_frame is camera.get_latest_frame().mat
+    finally:
+        camera.stop_capture()
+
+    assert not camera.is_capturing
+    assert camera.get_latest_frame() is None
+    assert camera.current_frame is not None
+    camera.release()
+
+
+def test_capture_is_refused_on_a_virtual_clock():
+    camera = Camera(capture_size=SIZE, logger=NullLogger())
+    camera.clock = VirtualClock()
+    camera.open(SyntheticFrameSource(size=SIZE, fps=30.0, generator=numbered_frame))
+
+    camera.start_capture()
+
+    assert not camera.is_capturing
+    camera.release()
@@ -0,0 +1,63 @@
+import numpy as np
+import pytest
+
+from switch_pilot_core.camera import Camera, SyntheticFrameSource
+from switch_pilot_core.timing import VirtualClock
+
+FPS = 30.0
+SIZE = (32, 18)
+
+
+class NullLogger:
+    def debug(self, message):
+        pass
+
+    info = error = debug
+
+
+def numbered_frame(position: int):
+    mat = np.zeros((SIZE[1], SIZE[0], 3), dtype=np.uint8)
+    mat[0, 0, 0] = position % 256
+    return mat
+
+
+def open_camera(clock: VirtualClock, speed: float = 1.0) -> tuple[Camera, SyntheticFrameSource]:
+    source = SyntheticFrameSource(size=SIZE, fps=FPS, speed=speed, generator=numbered_frame)
+    camera = Camera(capture_size=SIZE, logger=NullLogger())
+    camera.clock = clock
+    camera.open(source)
+    camera.update_frame()
+    return camera, source
+
+
+def test_virtual_clock_steps_deliver_one_frame_each():
+    clock = VirtualClock()
+    camera, source = open_camera(clock)
+    assert camera.current_frame[0, 0, 0] == 0
+
+    for expected in range(1, 40):
+        clock.advance(1 / FPS)
+        assert camera.current_frame[0, 0, 0] == expected
+        assert source.source_time == pytest.approx(clock.now())
+
+
+def test_reading_never_moves_virtual_clock():
+    clock = VirtualClock()
+    camera, source = open_camera(clock)
+
+    for _ in range(4):
+        camera.update_frame()
+        assert source.read() is None
+    assert clock.now() == 0.0
+    assert camera.current_frame[0, 0, 0] == 0
+
+
+def test_large_advance_drops_late_frames_and_keeps_timestamps():
+    clock = VirtualClock()
+    camera, source = open_camera(clock, speed=2.0)
+
+    clock.advance(1.0)
+
+    assert camera.current_frame[0, 0, 0] == 60
+    assert source.source_time == pytest.approx(2.0)
+    assert source.dropped_count == 59
@@ -0,0 +1,107 @@
+import threading
+import time
+from types import SimpleNamespace
+
+from switch_pilot_core.command import BaseCommand, CommandExtensionsAPI
+from switch_pilot_core.controller import Button, Controller, TextReportEncoder
+from switch_pilot_core.timing import CancellationToken
+from tests.doubles.fake_serial import FakeSerialPort
+
+
+class IdleCommand(BaseCommand):
+    def process(self):
+        pass
+
+
+def create_command() -> tuple[IdleCommand, Controller, FakeSerialPort]:
+    port = FakeSerialPort()
+    controller = Controller(serial_port=port)
+    extensions = CommandExtensionsAPI(controller=controller, camera=None, path=None)
+    api = SimpleNamespace(controller=controller,
+                          extensions=extensions,
+                          timer=SimpleNamespace(start=lambda: None))
+    return IdleCommand(api), controller, port
+
+
+def stop_later(command: BaseCommand, delay: float = 0.05) -> threading.Timer:
+    timer = threading.Timer(delay, command.stop)
+    timer.start()
+    return timer
+
+
+def test_callbacks_run_once_on_cancel():
+    token = CancellationToken()
+    calls = []
+    removed = []
+    token.add_callback(lambda: calls.append('first'))
+    token.add_callback(removed.append)
+    token.remove_callback(removed.append)
+
+    token.cancel()
+    token.cancel()
+    token.add_callback(lambda: calls.append('late'))
+
+    assert token.is_cancelled
+    assert token.wait(0)
+    assert (calls, removed) == (['first', 'late'], [])
+
+
+def test_command_token_is_wired_to_the_controller_while_running():
+    command, controller, _ = create_command()
+    assert not command.should_keep_running
+
+    command.preprocess()
+    token = command.cancellation_token
+    assert command.should_keep_running
+    assert controller.cancellation_token is token
+
+    command.postprocess()
+    assert token.is_cancelled
+    assert controller.cancellation_token is None
+
+    command.preprocess()
+    assert command.cancellation_token is not token
+    assert not command.cancellation_token.is_cancelled
+    command.postprocess()
+
+
+def test_stop_cuts_a_controller_press_short_and_still_releases():
+    command, controller, port = create_command()
+    command.preprocess()
+    timer = stop_later(command)
+    started_at = time.perf_counter()
+
+    controller.send_one_shot(buttons=[Button.A], duration=5.0)
+    timer.join()
+    command.postprocess()
+
+    assert time.perf_counter() - started_at < 1.0
+    assert [snapshot.buttons for _, snapshot in port.decode(TextReportEncoder())] == [Button.A, 0]
+
+
+def test_stop_cuts_a_command_wait_short():
+    command, _, _ = create_command()
+    command.preprocess()
+    timer = stop_later(command)
+    started_at = time.perf_counter()
+
+    command.extensions.wait(5.0)
+    timer.join()
+
+    assert time.perf_counter() - started_at < 1.0
+    assert command.extensions.should_exit
+    command.postprocess()
+
+
+def test_stop_cuts_a_repeat_short_after_the_current_press():
+    command, controller, port = create_command()
+    command.preprocess()
+    timer = stop_later(command)
+
+    controller.send_repeat(times=100, buttons=[Button.B], duration=0.02, interval=0.02)
+    timer.join()
+    command.postprocess()
+
+    buttons = [snapshot.buttons for _, snapshot in port.decode(TextReportEncoder())]
+    assert 2 <= len(buttons) < 20
+    assert buttons[-1] == 0
@@ -0,0 +1,43 @@
+import os
+from types import SimpleNamespace
+
+import cv2
+import numpy as np
+
+from switch_pilot_core.command import CommandExtensionsAPI
+
+
+def create_extensions(template_directory: str = '') -> tuple[CommandExtensionsAPI, list]:
+    path = SimpleNamespace(template=lambda name: os.path.join(template_directory, name))
+    extensions = CommandExtensionsAPI(controller=None, camera=None, path=path)
+    macros = []
+    extensions.run_macro = macros.append
+    return extensions, macros
+
+
+def test_goto_home_reuses_one_macro():
+    extensions, macros = create_extensions()
+
+    extensions.goto_home()
+    extensions.goto_home()
+
+    assert len(macros) == 2
+    assert macros[0] is macros[1]
+    assert macros[0].compile() is macros[1].compile()
+
+
+def test_restart_sv_is_rebuilt_only_when_the_logo_changes(tmp_path):
+    logo_path = tmp_path / "game_freak_logo.png"
+    cv2.imwrite(str(logo_path), np.zeros((8, 8, 3), dtype=np.uint8))
+    extensions, macros = create_extensions(str(tmp_path))
+
+    extensions.restart_sv()
+    extensions.restart_sv()
+    cv2.imwrite(str(logo_path), np.full((8, 8, 3), 255, dtype=np.uint8))
+    stat = os.stat(logo_path)
+    os.utime(logo_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+    extensions.restart_sv()
+
+    assert macros[0] is macros[1]
+    assert macros[2] is not macros[1]
+    assert macros[2].steps[-3].template.mat.max() == 255
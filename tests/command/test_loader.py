@@ -0,0 +1,142 @@
+import json
+import os
+import sys
+
+import pytest
+
+from switch_pilot_core.command import CommandLoader
+from switch_pilot_core.command import loader as loader_module
+from switch_pilot_core.config import Config
+from switch_pilot_core.path import Path
+
+COMMAND_SOURCE = '''
+class Command:
+    version = {version!r}
+'''
+
+
+class DirectoryPath(Path):
+    def __init__(self, directory: str):
+        super().__init__()
+        self._directory = directory
+
+    def _get_user_directory(self) -> str:
+        return self._directory
+
+
+class CountingConfig(Config):
+    def __init__(self, path: Path):
+        super().__init__(path=path)
+        self.read_names = []
+
+    def read_command_config(self, name: str, model=None):
+        self.read_names.append(name)
+        return super().read_command_config(name, model=model)
+
+
+def bump_mtime(file_path, step_ns: int = 1_000_000):
+    # Distinct mtime even when the change happens within the file system's timestamp granularity.
+    stat = os.stat(file_path)
+    os.utime(file_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + step_ns))
+
+
+def add_command(directory, name: str, config: dict, version: int = 1):
+    command_directory = directory / "commands" / name
+    command_directory.mkdir(parents=True, exist_ok=True)
+    (command_directory / "config.json").write_text(json.dumps(config), encoding='utf-8')
+    (command_directory / "command.py").write_text(COMMAND_SOURCE.format(version=version), encoding='utf-8')
+    bump_mtime(directory / "commands")
+
+
+def create_loader(directory) -> tuple[CommandLoader, CountingConfig]:
+    path = DirectoryPath(str(directory))
+    config = CountingConfig(path)
+    return CommandLoader(config=config, path=path), config
+
+
+@pytest.fixture
+def user_directory(tmp_path):
+    add_command(tmp_path, "alpha", {'speed': 1})
+    add_command(tmp_path, "beta", {'speed': 2})
+    (tmp_path / "commands" / ".hidden").mkdir()
+    bump_mtime(tmp_path / "commands")
+    return tmp_path
+
+
+def test_names_are_listed_once_per_directory_change(user_directory, monkeypatch):
+    loader, _ = create_loader(user_directory)
+    assert sorted(loader.get_names()) == ['alpha', 'beta']
+
+    def fail_listdir(_):
+        raise AssertionError("commands directory listed again")
+
+    monkeypatch.setattr(loader_module.os, 'listdir', fail_listdir)
+    # A new loader, as on the next start, takes the names from the manifest.
+    assert sorted(create_loader(user_directory)[0].get_names()) == ['alpha', 'beta']
+    monkeypatch.undo()
+
+    add_command(user_directory, "gamma", {'speed': 3})
+    assert sorted(loader.get_names()) == ['alpha', 'beta', 'gamma']
+
+
+def test_configs_are_parsed_again_only_when_changed(user_directory):
+    loader, config = create_loader(user_directory)
+    info = loader.get_info()
+    assert sorted(config.read_names) == ['alpha', 'beta']
+    assert sorted((entry['name'], entry['config']['speed']) for entry in info) == [('alpha', 1), ('beta', 2)]
+
+    next_loader, next_config = create_loader(user_directory)
+    next_loader.get_info()
+    assert next_config.read_names == []
+
+    config_path = user_directory / "commands" / "beta" / "config.json"
+    config_path.write_text(json.dumps({'speed': 5}), encoding='utf-8')
+    bump_mtime(config_path)
+    info = next_loader.get_info()
+    assert next_config.read_names == ['beta']
+    assert {entry['name']: entry['config']['speed'] for entry in info}['beta'] == 5
+
+
+def test_returned_configs_are_independent_copies(user_directory):
+    loader, _ = create_loader(user_directory)
+
+    loader.get_info()[0]['config']['speed'] = 100
+
+    assert all(entry['config']['speed'] < 100 for entry in loader.get_info())
+
+
+def test_missing_config_raises(user_directory):
+    os.remove(user_directory / "commands" / "alpha" / "config.json")
+    loader, _ = create_loader(user_directory)
+
+    with pytest.raises(FileNotFoundError):
+        loader.get_info()
+
+
+@pytest.mark.parametrize('content', ["not json", json.dumps({'version': 0, 'names': ['stale']})])
+def test_unusable_manifest_is_rebuilt(user_directory, content: str):
+    (user_directory / ".commands_manifest.json").write_text(content, encoding='utf-8')
+    loader, _ = create_loader(user_directory)
+
+    assert sorted(loader.get_names()) == ['alpha', 'beta']
+    manifest = json.loads((user_directory / ".commands_manifest.json").read_text(encoding='utf-8'))
+    assert sorted(manifest['names']) == ['alpha', 'beta']
+
+
+def test_command_module_runs_again_only_when_edited(user_directory):
+    loader, _ = create_loader(user_directory)
+    command = loader.load("alpha")
+    command_path = user_directory / "commands" / "alpha" / "command.py"
+
+    bump_mtime(command_path)
+    assert loader.load("alpha") is command
+    assert loader.reload() == []
+
+    command_path.write_text(COMMAND_SOURCE.format(version=22), encoding='utf-8')
+    bump_mtime(command_path)
+    assert loader.reload() == ['alpha']
+    assert loader.load("alpha").version == 22
+
+    module_name = loader.load("alpha").__module__
+    loader.unload("alpha")
+    assert module_name not in sys.modules
@@ -0,0 +1,66 @@
+import threading
+
+import pytest
+
+from switch_pilot_core.command import Macro, MacroExecutor, Press, Wait
+from switch_pilot_core.controller import Controller, StickDisplacementPreset as Displacement, TextReportEncoder
+from switch_pilot_core.timing import CancellationToken, SystemClock, VirtualClock
+from tests.doubles.fake_serial import FakeSerialPort
+
+
+def create_controller(clock):
+    port = FakeSerialPort(clock=clock)
+    return Controller(serial_port=port, clock=clock), port
+
+
+def decoded_reports(port):
+    return [snapshot for _, snapshot in port.decode(TextReportEncoder())]
+
+
+def test_press_timings_follow_schedule():
+    clock = VirtualClock()
+    controller, port = create_controller(clock)
+    macro = Macro('test', [Press(l_displacement=Displacement.TOP, times=2, duration=0.1, interval=0.2), Wait(0.5)])
+
+    profile = MacroExecutor(controller, should_exit=lambda: False, wait_for_template=lambda step: None).run(macro)
+
+    assert profile.completed
+    assert [write.timestamp for write in port.writes] == pytest.approx([0.0, 0.1, 0.3, 0.4])
+    assert profile.total_duration == pytest.approx(0.9)
+    assert [step.planned_duration for step in profile.steps] == pytest.approx([0.4, 0.5])
+
+
+def test_stop_during_hold_releases_input():
+    clock = VirtualClock()
+    controller, port = create_controller(clock)
+    macro = Macro('test', [Press(l_displacement=Displacement.BOTTOM, duration=2), Wait(1)])
+
+    profile = MacroExecutor(controller,
+                            should_exit=lambda: clock.now() >= 1.0,
+                            wait_for_template=lambda step: None).run(macro)
+
+    assert not profile.completed
+    reports = decoded_reports(port)
+    assert reports[0].ly == 255
+    assert reports[-1].ly == 128 and reports[-1].buttons == 0
+
+
+def test_cancellation_token_interrupts_hold_and_releases_input():
+    clock = SystemClock()
+    controller, port = create_controller(clock)
+    token = CancellationToken()
+    controller.cancellation_token = token
+    macro = Macro('test', [Press(l_displacement=Displacement.BOTTOM, duration=2)])
+    timer = threading.Timer(0.1, token.cancel)
+    timer.start()
+
+    started_at = clock.now()
+    profile = MacroExecutor(controller,
+                            should_exit=lambda: token.is_cancelled,
+                            wait_for_template=lambda step: None).run(macro)
+
+    assert not profile.completed
+    assert clock.now() - started_at < 0.5
+    reports = decoded_reports(port)
+    assert len(reports) == 2
+    assert reports[-1].ly == 128
@@ -0,0 +1,93 @@
+import json
+import os
+import subprocess
+import sys
+import textwrap
+
+STARTUP_BUDGET = 2.0
+"""Seconds allowed for importing the command package, listing commands and ports and starting a command."""
+
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+HEAVY_MODULES = ('easyocr', 'torch', 'cv2', 'pygame')
+
+SCRIPT = textwrap.dedent('''
+    import json
+    import os
+    import sys
+    import tempfile
+    import threading
+    import time
+
+    started_at = time.perf_counter()
+    from switch_pilot_core.camera import Camera
+    from switch_pilot_core.command import BaseCommand, CommandAPI, CommandLoader
+    from switch_pilot_core.config import Config
+    from switch_pilot_core.controller import Controller
+    from switch_pilot_core.libs.serial import SerialPort
+    from switch_pilot_core.logger import Logger
+    from switch_pilot_core.path import Path
+    from switch_pilot_core.timer import Timer
+    from tests.doubles.fake_serial import FakeSerialPort
+
+
+    class NullLogger(Logger):
+        def debug(self, message):
+            pass
+
+        info = warn = error = debug
+
+
+    class DirectoryPath(Path):
+        def __init__(self, directory):
+            super().__init__()
+            self._directory = directory
+
+        def _get_user_directory(self):
+            return self._directory
+
+
+    class Command(BaseCommand):
+        def process(self):
+            pass
+
+
+    logger = NullLogger()
+    with tempfile.TemporaryDirectory() as directory:
+        os.makedirs(os.path.join(directory, "commands", "startup"))
+        path = DirectoryPath(directory)
+        config = Config(path=path)
+        # What the application does on start: list the commands and the serial ports.
+        names = CommandLoader(config=config, path=path).get_names()
+        SerialPort.get_serial_ports()
+        api = CommandAPI(name='startup',
+                         logger=logger,
+                         controller=Controller(serial_port=FakeSerialPort()),
+                         config=config,
+                         camera=Camera(capture_size=(1280, 720), logger=logger),
+                         path=path,
+                         timer=Timer())
+        command = Command(api)
+        command.preprocess()
+        command.postprocess()
+    print(json.dumps({
+        'elapsed': time.perf_counter() - started_at,
+        'names': names,
+        'modules': [name for name in %r if name in sys.modules],
+        'threads': [thread.name for thread in threading.enumerate() if thread.name.startswith('TextReaderRegistry')],
+    }))
+''' % (HEAVY_MODULES,))
+
+
+def test_listing_and_starting_commands_does_not_load_heavy_modules():
+    output = subprocess.run([sys.executable, '-c', SCRIPT],
+                            cwd=ROOT,
+                            capture_output=True,
+                            text=True,
+                            check=True).stdout
+    result = json.loads(output.splitlines()[-1])
+
+    assert result['names'] == ['startup']
+    assert result['modules'] == []
+    assert result['threads'] == []
+    assert result['elapsed'] < STARTUP_BUDGET
@@ -0,0 +1,130 @@
+import threading
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from switch_pilot_core.camera import Camera, SyntheticFrameSource
+from switch_pilot_core.command import BaseCommand, CommandExtensionsAPI, Macro, WaitForTemplate
+from switch_pilot_core.controller import Controller
+from switch_pilot_core.image import Image, TemplateQuery
+from switch_pilot_core.timing import CancellationToken, VirtualClock
+from tests.doubles.fake_serial import FakeSerialPort
+
+TEMPLATE = Image(np.zeros((8, 8), dtype=np.uint8))
+
+
+class NullLogger:
+    def debug(self, message):
+        pass
+
+    info = error = debug
+
+
+class RecordingExtensions:
+    def __init__(self):
+        self.calls = []
+
+    def wait_for_template(self, **kwargs):
+        self.calls.append(('wait_for_template', kwargs))
+
+    def wait_for_any(self, **kwargs):
+        self.calls.append(('wait_for_any', kwargs))
+
+
+class Command(BaseCommand):
+    def process(self):
+        pass
+
+
+def test_command_wrappers_forward_matching_options():
+    extensions = RecordingExtensions()
+    command = Command(SimpleNamespace(extensions=extensions))
+    query = TemplateQuery(template=TEMPLATE, threshold=0.9)
+
+    command.wait_for_template(TEMPLATE, threshold=0.9, timeout=1.0, pyramid_levels=2, poll_interval=0.05)
+    command.wait_for_any([query], timeout=1.0, pyramid_levels=1, poll_interval=0.02)
+
+    assert extensions.calls == [
+        ('wait_for_template', {'template': TEMPLATE, 'threshold': 0.9, 'region': None, 'timeout': 1.0,
+                               'pyramid_levels': 2, 'poll_interval': 0.05}),
+        ('wait_for_any', {'queries': [query], 'timeout': 1.0, 'pyramid_levels': 1, 'poll_interval': 0.02}),
+    ]
+
+
+def test_macro_template_step_forwards_pyramid_levels():
+    clock = VirtualClock()
+    extensions = CommandExtensionsAPI(controller=Controller(serial_port=FakeSerialPort(clock=clock), clock=clock),
+                                      camera=None,
+                                      path=None)
+    extensions.prepare(SimpleNamespace(should_keep_running=True, cancellation_token=None))
+    calls = []
+    extensions.wait_for_any = lambda queries, **kwargs: calls.append((queries, kwargs))
+
+    step = WaitForTemplate(template=TEMPLATE, threshold=0.8, timeout=2.0, pyramid_levels=2)
+    extensions.run_macro(Macro('wait', [step]))
+
+    [(queries, kwargs)] = calls
+    assert queries == [TemplateQuery(template=TEMPLATE, threshold=0.8)]
+    assert kwargs == {'timeout': 2.0, 'pyramid_levels': 2, 'poll_interval': 0.01}
+
+
+def textured(seed: int, size: tuple[int, int]) -> np.ndarray:
+    return np.random.default_rng(seed).integers(0, 256, (size[1], size[0], 3), dtype=np.uint8)
+
+
+MARKER = textured(1, (16, 12))
+MARKER_FROM = 15
+"""Position of the first frame showing the marker, 0.5 s into the footage at 30 fps."""
+
+
+def marker_frame(position: int) -> np.ndarray:
+    mat = textured(0, (64, 36))
+    if position >= MARKER_FROM:
+        mat[10:22, 20:36] = MARKER
+    return mat
+
+
+def create_virtual_extensions() -> tuple[CommandExtensionsAPI, Camera, VirtualClock]:
+    clock = VirtualClock()
+    camera = Camera(capture_size=(64, 36), logger=NullLogger())
+    camera.clock = clock
+    camera.open(SyntheticFrameSource(size=(64, 36), fps=30, generator=marker_frame))
+    camera.update_frame()
+    extensions = CommandExtensionsAPI(controller=Controller(serial_port=FakeSerialPort(clock=clock), clock=clock),
+                                      camera=camera,
+                                      path=None)
+    extensions.prepare(SimpleNamespace(should_keep_running=True, cancellation_token=CancellationToken()))
+    return extensions, camera, clock
+
+
+def run_with_deadline(function, seconds: float = 5.0):
+    results = []
+    thread = threading.Thread(target=lambda: results.append(function()), daemon=True)
+    thread.start()
+    thread.join(seconds)
+    assert not thread.is_alive(), "wait did not return"
+    return results[0]
+
+
+def test_wait_times_out_in_virtual_time_even_if_capture_was_requested():
+    extensions, camera, clock = create_virtual_extensions()
+    camera.start_capture()
+    assert not camera.is_capturing
+
+    absent = Image(textured(2, (16, 12)))
+    result = run_with_deadline(lambda: extensions.wait_for_template(absent, threshold=0.9, timeout=1.0))
+
+    assert result is None
+    assert clock.now() == pytest.approx(1.0, abs=0.02)
+
+
+def test_wait_reports_match_time_on_the_virtual_clock():
+    extensions, camera, clock = create_virtual_extensions()
+
+    result = run_with_deadline(lambda: extensions.wait_for_template(Image(MARKER), threshold=0.9, timeout=2.0))
+
+    assert result is not None
+    assert result.match.location == (20, 10)
+    assert result.timestamp == pytest.approx(MARKER_FROM / 30, abs=0.02)
+    assert result.elapsed == pytest.approx(MARKER_FROM / 30, abs=0.02)
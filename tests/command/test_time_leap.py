@@ -0,0 +1,133 @@
+import calendar
+import random
+from datetime import datetime
+from typing import Optional
+
+import pytest
+
+from switch_pilot_core.command import DateTimeField, HoldScrollProfile, TimeLeapPlan, TimeLeapPlanner
+
+HOLD_PROFILE = HoldScrollProfile(initial_delay=0.5, repeat_interval=0.05)
+
+
+class DateTimeScreenSimulator:
+    """Model of the Current Date and Time screen for checking plans without a console.
+
+    Fields wrap independently without carrying into the next one, and the day is clamped to the length of the
+    displayed month.
+    """
+
+    MODULI = {DateTimeField.MONTH: 12, DateTimeField.HOUR: 24, DateTimeField.MINUTE: 60}
+
+    def __init__(self, current: datetime, hold_profile: Optional[HoldScrollProfile] = None):
+        self._values = [current.year, current.month, current.day, current.hour, current.minute]
+        self._hold_profile = hold_profile
+        self.presses = 0
+
+    @property
+    def value(self) -> datetime:
+        year, month, day, hour, minute = self._values
+        return datetime(year, month, day, hour, minute)
+
+    def apply(self, plan: TimeLeapPlan) -> datetime:
+        for field_plan in plan.fields:
+            if field_plan.steps == 0:
+                continue
+            if field_plan.hold_duration is None:
+                self.presses += abs(field_plan.steps)
+                self._change(field_plan.field, field_plan.steps)
+            else:
+                self.presses += 1
+                steps = self._hold_profile.steps_for(field_plan.hold_duration)
+                self._change(field_plan.field, steps if field_plan.steps > 0 else -steps)
+        return self.value
+
+    def _change(self, field: DateTimeField, steps: int):
+        if field == DateTimeField.YEAR:
+            self._values[field] += steps
+        elif field == DateTimeField.DAY:
+            self._values[field] = (self._values[field] - 1 + steps) % self._days_in_month() + 1
+        elif field == DateTimeField.MONTH:
+            self._values[field] = (self._values[field] - 1 + steps) % 12 + 1
+        else:
+            self._values[field] = (self._values[field] + steps) % self.MODULI[field]
+        self._values[DateTimeField.DAY] = min(self._values[DateTimeField.DAY], self._days_in_month())
+
+    def _days_in_month(self) -> int:
+        return calendar.monthrange(self._values[DateTimeField.YEAR], self._values[DateTimeField.MONTH])[1]
+
+
+def expected_screen(current: datetime, years=0, months=0, days=0, hours=0, minutes=0) -> datetime:
+    year = current.year + years
+    month = (current.month - 1 + months) % 12 + 1
+    day = (current.day - 1 + days) % calendar.monthrange(year, month)[1] + 1
+    return datetime(year, month, day, (current.hour + hours) % 24, (current.minute + minutes) % 60)
+
+
+@pytest.mark.parametrize('current, changes, expected, steps', [
+    (datetime(2024, 5, 10, 12, 55), {'minutes': 10}, datetime(2024, 5, 10, 12, 5), {DateTimeField.MINUTE: 10}),
+    (datetime(2024, 5, 10, 12, 30), {'minutes': -50}, datetime(2024, 5, 10, 12, 40), {DateTimeField.MINUTE: 10}),
+    (datetime(2024, 5, 10, 23, 0), {'hours': 1}, datetime(2024, 5, 10, 0, 0), {DateTimeField.HOUR: 1}),
+    (datetime(2024, 12, 10, 0, 0), {'months': 1}, datetime(2024, 1, 10, 0, 0), {DateTimeField.MONTH: 1}),
+    (datetime(2024, 5, 10, 0, 0), {'months': 11}, datetime(2024, 4, 10, 0, 0), {DateTimeField.MONTH: -1}),
+    (datetime(2024, 2, 28, 0, 0), {'days': 2}, datetime(2024, 2, 1, 0, 0), {DateTimeField.DAY: 2}),
+    (datetime(2023, 2, 28, 0, 0), {'days': 2}, datetime(2023, 2, 2, 0, 0), {DateTimeField.DAY: 2}),
+    (datetime(2024, 3, 2, 0, 0), {'days': 29}, datetime(2024, 3, 31, 0, 0), {DateTimeField.DAY: -2}),
+])
+def test_plan_wraps_around_the_shorter_way(current, changes, expected, steps):
+    plan = TimeLeapPlanner().plan(current=current, **changes)
+    simulator = DateTimeScreenSimulator(current)
+
+    assert simulator.apply(plan) == expected
+    assert {field_plan.field: field_plan.steps for field_plan in plan.fields if field_plan.steps != 0} == steps
+    assert simulator.presses == plan.presses == sum(abs(step) for step in steps.values())
+
+
+def test_plan_reaches_the_expected_screen_with_the_fewest_taps():
+    rng = random.Random(20)
+    planner = TimeLeapPlanner()
+    for _ in range(500):
+        current = datetime(rng.randint(2000, 2050), rng.randint(1, 12), rng.randint(1, 28), rng.randint(0, 23),
+                           rng.randint(0, 59))
+        changes = {'years': rng.randint(0, 5), 'months': rng.randint(-20, 20), 'days': rng.randint(-40, 40),
+                   'hours': rng.randint(-30, 30), 'minutes': rng.randint(-90, 90)}
+        plan = planner.plan(current=current, **changes)
+
+        assert DateTimeScreenSimulator(current).apply(plan) == expected_screen(current, **changes)
+        for field_plan, modulus in zip(plan.fields[1:], (12, None, 24, 60)):
+            if modulus is not None:
+                assert abs(field_plan.steps) <= modulus // 2
+
+
+@pytest.mark.parametrize('steps', range(1, 61))
+def test_hold_duration_gives_the_planned_number_of_steps(steps: int):
+    assert HOLD_PROFILE.steps_for(HOLD_PROFILE.hold_duration(steps)) == steps
+
+
+def test_hold_profile_holds_long_changes_and_taps_short_ones():
+    current = datetime(2024, 5, 10, 12, 0)
+    plan = TimeLeapPlanner(hold_profile=HOLD_PROFILE).plan(years=20, minutes=2, current=current)
+    simulator = DateTimeScreenSimulator(current, hold_profile=HOLD_PROFILE)
+
+    assert simulator.apply(plan) == datetime(2044, 5, 10, 12, 2)
+    year_plan, minute_plan = plan.fields[DateTimeField.YEAR], plan.fields[DateTimeField.MINUTE]
+    assert year_plan.hold_duration is not None and year_plan.presses == 1
+    assert minute_plan.hold_duration is None and minute_plan.presses == 2
+    assert simulator.presses == plan.presses == 3
+    assert plan.cost < TimeLeapPlanner().plan(years=20, minutes=2, current=current).cost
+
+
+def test_hold_profile_plans_reach_the_expected_screen():
+    rng = random.Random(7)
+    planner = TimeLeapPlanner(hold_profile=HOLD_PROFILE)
+    for _ in range(300):
+        current = datetime(rng.randint(2000, 2050), rng.randint(1, 12), rng.randint(1, 28), rng.randint(0, 23),
+                           rng.randint(0, 59))
+        changes = {'years': rng.randint(-30, 30), 'months': rng.randint(-20, 20), 'days': rng.randint(-40, 40),
+                   'hours': rng.randint(-30, 30), 'minutes': rng.randint(-90, 90)}
+        plan = planner.plan(current=current, **changes)
+        simulator = DateTimeScreenSimulator(current, hold_profile=HOLD_PROFILE)
+
+        assert simulator.apply(plan) == expected_screen(current, **changes)
+        assert simulator.presses == plan.presses
+        assert plan.cost <= TimeLeapPlanner().plan(current=current, **changes).cost
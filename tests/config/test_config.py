@@ -0,0 +1,63 @@
+import json
+import os
+
+from pydantic import BaseModel
+
+from switch_pilot_core.config import Config
+from switch_pilot_core.path import Path
+
+
+class DirectoryPath(Path):
+    def __init__(self, directory: str):
+        super().__init__()
+        self._directory = directory
+
+    def _get_user_directory(self) -> str:
+        return self._directory
+
+
+class CommandSettings(BaseModel):
+    targets: list[str]
+
+
+def write_config(directory, data: dict):
+    command_directory = directory / "commands" / "sample"
+    command_directory.mkdir(parents=True, exist_ok=True)
+    (command_directory / "config.json").write_text(json.dumps(data), encoding='utf-8')
+
+
+def test_read_returns_plain_mutable_copies(tmp_path):
+    write_config(tmp_path, {'targets': ['a', 'b'], 'options': {'speed': 1}})
+    config = Config(path=DirectoryPath(str(tmp_path)))
+
+    data = config.read_command_config('sample')
+    assert data == {'targets': ['a', 'b'], 'options': {'speed': 1}}
+    assert data['targets'] == ['a', 'b']
+    data['targets'].append('c')
+    data['options']['speed'] = 2
+
+    assert config.read_command_config('sample') == {'targets': ['a', 'b'], 'options': {'speed': 1}}
+
+
+def test_read_with_model_returns_independent_instances(tmp_path):
+    write_config(tmp_path, {'targets': ['a']})
+    config = Config(path=DirectoryPath(str(tmp_path)))
+
+    settings = config.read_command_config('sample', model=CommandSettings)
+    settings.targets.append('b')
+
+    assert config.read_command_config('sample', model=CommandSettings).targets == ['a']
+
+
+def test_edit_is_picked_up_on_next_read(tmp_path):
+    write_config(tmp_path, {'targets': ['a']})
+    config = Config(path=DirectoryPath(str(tmp_path)))
+    assert config.read_command_config('sample') == {'targets': ['a']}
+
+    write_config(tmp_path, {'targets': ['b']})
+    config_path = tmp_path / "commands" / "sample" / "config.json"
+    stat = os.stat(config_path)
+    # Same size and a distinct mtime, as an editor saving within the same second would leave it.
+    os.utime(config_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+    assert config.read_command_config('sample') == {'targets': ['b']}
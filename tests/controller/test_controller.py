@@ -0,0 +1,58 @@
+import pytest
+
+from switch_pilot_core.controller import Button, Controller
+from switch_pilot_core.timing import VirtualClock
+from tests.doubles.fake_serial import FakeSerialPort
+
+
+def create_controller(**kwargs) -> tuple[Controller, FakeSerialPort, VirtualClock]:
+    clock = VirtualClock()
+    port = FakeSerialPort(clock=clock)
+    return Controller(serial_port=port, clock=clock, **kwargs), port, clock
+
+
+def test_every_send_is_written_by_default():
+    controller, port, _ = create_controller()
+
+    controller.send_hold(buttons=[Button.A])
+    controller.send_hold(buttons=[Button.A])
+
+    assert len(port.writes) == 2
+    assert controller.suppressed_count == 0
+
+
+def test_redundant_send_is_suppressed():
+    controller, port, _ = create_controller(suppress_redundant_reports=True)
+
+    controller.send_hold(buttons=[Button.A])
+    controller.send_hold(buttons=[Button.A])
+    controller.send_reset()
+
+    assert len(port.writes) == 2
+    assert port.writes[0].data != port.writes[1].data
+    assert controller.suppressed_count == 1
+
+
+def test_keepalive_writes_unchanged_state_after_interval():
+    controller, port, clock = create_controller(suppress_redundant_reports=True, keepalive_interval=0.5)
+
+    controller.send_hold(buttons=[Button.A])
+    clock.advance(0.4)
+    controller.send_hold(buttons=[Button.A])
+    clock.advance(0.2)
+    controller.send_hold(buttons=[Button.A])
+
+    assert [write.timestamp for write in port.writes] == pytest.approx([0.0, 0.6])
+    assert controller.suppressed_count == 1
+
+
+def test_send_after_raw_line_is_not_suppressed():
+    controller, port, _ = create_controller(suppress_redundant_reports=True)
+
+    controller.send_hold(buttons=[Button.A])
+    controller.send_raw("raw")
+    controller.send_hold(buttons=[Button.A])
+
+    assert len(port.writes) == 3
+    assert port.writes[1].data == b"raw\r\n"
+    assert controller.suppressed_count == 0
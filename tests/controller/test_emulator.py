@@ -0,0 +1,75 @@
+import random
+import sys
+
+import pytest
+
+from switch_pilot_core.controller import BinaryReportEncoder, Button, Controller, ControllerStateSnapshot, Hat, \
+    StickDisplacementPreset as Displacement, TextReportEncoder
+from switch_pilot_core.libs.serial import SerialPort
+from tests.doubles.device_emulator import DeviceEmulator
+
+pytestmark = pytest.mark.skipif(sys.platform == 'win32', reason="DeviceEmulator needs a pseudo terminal")
+
+REPORT_COUNT = 40
+
+
+def as_received(snapshot: ControllerStateSnapshot) -> ControllerStateSnapshot:
+    """Sticks that are not marked as changed are not carried by a report."""
+    return ControllerStateSnapshot.from_values(buttons=snapshot.buttons,
+                                               hat=snapshot.hat,
+                                               lx=snapshot.lx if snapshot.l_changed else 0,
+                                               ly=snapshot.ly if snapshot.l_changed else 0,
+                                               rx=snapshot.rx if snapshot.r_changed else 0,
+                                               ry=snapshot.ry if snapshot.r_changed else 0,
+                                               l_changed=snapshot.l_changed,
+                                               r_changed=snapshot.r_changed)
+
+
+def send_random_inputs(controller: Controller, count: int):
+    rng = random.Random(0)
+    displacements = [Displacement.CENTER, Displacement.RIGHT, Displacement.TOP, Displacement.LEFT, Displacement.BOTTOM]
+    for _ in range(count):
+        controller.send_hold(buttons=rng.sample(list(Button), rng.randint(0, 3)),
+                             l_displacement=rng.choice(displacements) if rng.random() < 0.5 else None,
+                             r_displacement=rng.choice(displacements) if rng.random() < 0.3 else None,
+                             hat=rng.choice(list(Hat)))
+        controller.reset()
+
+
+@pytest.mark.parametrize('encoder', [TextReportEncoder(), BinaryReportEncoder()], ids=['text', 'binary'])
+def test_reports_round_trip_through_emulator(encoder):
+    emulator = DeviceEmulator()
+    emulator.open()
+    controller = Controller(encoder=encoder, serial_port=SerialPort())
+    try:
+        controller.open(emulator.port_info, baud_rate=115200)
+        recording = controller.start_recording()
+        send_random_inputs(controller, REPORT_COUNT)
+
+        assert emulator.wait_for_reports(REPORT_COUNT, timeout=5.0)
+    finally:
+        controller.close()
+        emulator.close()
+
+    expected_encoding = 'text' if isinstance(encoder, TextReportEncoder) else 'binary'
+    assert emulator.errors == []
+    assert [report.encoding for report in emulator.reports] == [expected_encoding] * REPORT_COUNT
+    assert [report.snapshot for report in emulator.reports] == \
+           [as_received(event.snapshot) for event in recording.events]
+
+
+def test_baud_rate_delays_reception_by_wire_time():
+    emulator = DeviceEmulator(baud_rate=9600)
+    emulator.open()
+    controller = Controller(encoder=BinaryReportEncoder(), serial_port=SerialPort())
+    try:
+        controller.open(emulator.port_info, baud_rate=9600)
+        send_random_inputs(controller, REPORT_COUNT)
+        assert emulator.wait_for_reports(REPORT_COUNT, timeout=5.0)
+    finally:
+        controller.close()
+        emulator.close()
+
+    reports = emulator.reports
+    wire_time = BinaryReportEncoder.FRAME_SIZE * 10 / 9600
+    assert reports[-1].received_at - reports[0].received_at >= (REPORT_COUNT - 1) * wire_time * 0.99
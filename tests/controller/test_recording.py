@@ -0,0 +1,105 @@
+import struct
+
+import pytest
+
+from switch_pilot_core.controller import BinaryReportEncoder, Button, Controller, ControllerState, ControllerStateSnapshot, Hat, \
+    InputEvent, InputRecording, StickDisplacementPreset
+from switch_pilot_core.timing import CancellationToken, VirtualClock
+from tests.doubles.fake_serial import FakeSerialPort
+
+
+def create_controller() -> tuple[Controller, FakeSerialPort, VirtualClock]:
+    clock = VirtualClock(start=100.0)
+    port = FakeSerialPort(clock=clock)
+    return Controller(encoder=BinaryReportEncoder(), serial_port=port, clock=clock), port, clock
+
+
+def encode(snapshot: ControllerStateSnapshot) -> bytes:
+    return BinaryReportEncoder().encode(snapshot.to_state())
+
+
+def record_inputs(controller: Controller) -> InputRecording:
+    recording = controller.start_recording()
+    controller.send_hold(buttons=[Button.A], l_displacement=StickDisplacementPreset.RIGHT)
+    controller.clock.advance(0.25)
+    controller.send_hold(hat=Hat.TOP)
+    controller.clock.advance(0.5)
+    controller.send_reset()
+    assert controller.stop_recording() is recording
+    return recording
+
+
+def test_recording_holds_every_written_report_with_its_time():
+    controller, port, _ = create_controller()
+
+    recording = record_inputs(controller)
+
+    assert not controller.is_recording
+    assert len(recording) == len(port.writes) == 3
+    assert recording.duration == pytest.approx(0.75)
+    assert [encode(event.snapshot) for event in recording.events] == [write.data for write in port.writes]
+
+
+def test_recording_round_trips_through_bytes_and_files(tmp_path):
+    controller, _, _ = create_controller()
+    recording = record_inputs(controller)
+
+    data = recording.to_bytes()
+    file_path = str(tmp_path / "inputs.spir")
+    recording.save(file_path)
+
+    assert len(data) == 14 + 16 * 3
+    assert InputRecording.from_bytes(data).events == recording.events
+    assert InputRecording.load(file_path).events == recording.events
+
+
+@pytest.mark.parametrize('data', [
+    b"NOPE" + struct.pack("<HQ", 1, 0),
+    b"SPIR" + struct.pack("<HQ", 2, 0),
+    b"SPIR" + struct.pack("<HQ", 1, 2) + struct.pack("<qQ", 0, 0),
+])
+def test_malformed_recording_is_rejected(data: bytes):
+    with pytest.raises(ValueError):
+        InputRecording.from_bytes(data)
+
+
+def test_playback_repeats_reports_with_original_timing():
+    controller, port, clock = create_controller()
+    recording = record_inputs(controller)
+    port.clear()
+    clock.advance(10.0)
+
+    report = controller.play(recording)
+
+    played = port.writes
+    assert [write.timestamp - played[0].timestamp for write in played] == pytest.approx([0.0, 0.25, 0.75])
+    assert [write.data for write in played] == [encode(event.snapshot) for event in recording.events]
+    assert report.errors == (0.0,) * 3
+
+    # The controller continues from the last played state, whose centered sticks the device already has.
+    controller.send_hold(buttons=[Button.B])
+    expected = ControllerState(buttons=Button.B)
+    expected.consume_stick_displacement()
+    assert port.writes[-1].data == BinaryReportEncoder().encode(expected)
+
+
+def test_playback_stops_when_cancelled():
+    controller, port, _ = create_controller()
+    token = CancellationToken()
+    controller.cancellation_token = token
+    events = [InputEvent(timestamp_ns=0, snapshot=ControllerStateSnapshot.from_values(buttons=Button.B)),
+              InputEvent(timestamp_ns=10 ** 9, snapshot=ControllerStateSnapshot.from_values())]
+    port.clear()
+    token.cancel()
+
+    controller.play(InputRecording(events))
+
+    assert port.writes == []
+
+
+def test_playing_an_empty_recording_writes_nothing():
+    controller, port, _ = create_controller()
+
+    report = controller.play(InputRecording())
+
+    assert (port.writes, report.errors) == ([], ())
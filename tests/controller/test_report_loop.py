@@ -0,0 +1,107 @@
+import time
+
+import pytest
+
+from switch_pilot_core.controller import Button, Controller, InputRecording, TextReportEncoder
+from switch_pilot_core.controller.report_loop import ReportLoop
+from switch_pilot_core.timing import PrecisionSleeper
+from tests.doubles.fake_serial import FakeSerialPort
+
+SLEEPER = PrecisionSleeper(slack=0.002)
+
+
+def wait_until(condition, timeout: float = 2.0) -> bool:
+    deadline = time.perf_counter() + timeout
+    while not condition():
+        if time.perf_counter() > deadline:
+            return False
+        time.sleep(0.005)
+    return True
+
+
+def distinct_buttons(port: FakeSerialPort) -> list[int]:
+    buttons = []
+    for _, snapshot in port.decode(TextReportEncoder()):
+        if len(buttons) == 0 or buttons[-1] != snapshot.buttons:
+            buttons.append(snapshot.buttons)
+    return buttons
+
+
+def test_loop_sends_at_rate_until_stopped():
+    ticks = []
+    report_loop = ReportLoop(send=lambda: ticks.append(time.perf_counter()), rate=100.0, sleeper=SLEEPER)
+
+    report_loop.start()
+    assert wait_until(lambda: len(ticks) >= 10)
+    report_loop.stop()
+    count = report_loop.tick_count
+
+    assert not report_loop.is_running
+    assert count == len(ticks)
+    assert (ticks[9] - ticks[0]) == pytest.approx(0.09, abs=0.02)
+    time.sleep(0.03)
+    assert len(ticks) == count
+
+
+def test_slow_send_skips_ticks_instead_of_catching_up():
+    ticks = []
+
+    def slow_send():
+        ticks.append(time.perf_counter())
+        time.sleep(0.025)
+
+    report_loop = ReportLoop(send=slow_send, rate=100.0, sleeper=SLEEPER)
+    report_loop.start()
+    assert wait_until(lambda: len(ticks) >= 5)
+    report_loop.stop()
+
+    assert report_loop.missed_ticks >= 2 * (report_loop.tick_count - 1)
+    assert min(b - a for a, b in zip(ticks, ticks[1:])) >= 0.025
+
+
+def test_rate_must_be_positive():
+    with pytest.raises(ValueError):
+        ReportLoop(send=lambda: None, rate=0)
+
+
+def test_press_shorter_than_a_tick_reaches_the_device():
+    port = FakeSerialPort()
+    controller = Controller(serial_port=port)
+    controller.start_report_loop(rate=20.0)
+    try:
+        assert wait_until(lambda: len(port.writes) >= 1)
+        controller.send_hold(buttons=[Button.A])
+        controller.send_reset()
+        controller.send_hold(buttons=[Button.B])
+        controller.send_hold(buttons=[Button.B])
+        controller.send_reset()
+        assert wait_until(lambda: len(distinct_buttons(port)) >= 5)
+    finally:
+        controller.stop_report_loop()
+
+    assert distinct_buttons(port) == [0, Button.A, 0, Button.B, 0]
+
+
+def test_play_pauses_the_loop_for_the_recorded_reports():
+    port = FakeSerialPort()
+    controller = Controller(serial_port=port)
+    recording = controller.start_recording()
+    controller.send_hold(buttons=[Button.A])
+    time.sleep(0.1)
+    controller.send_reset()
+    controller.stop_recording()
+
+    controller.start_report_loop(rate=100.0)
+    try:
+        assert wait_until(lambda: len(port.writes) >= 5)
+        played_from = len(port.writes)
+        controller.play(InputRecording(recording.events))
+        played = port.writes[played_from:played_from + 2]
+        assert controller.is_report_loop_running
+        assert wait_until(lambda: len(port.writes) >= played_from + 5)
+    finally:
+        controller.stop_report_loop()
+
+    # Nothing but the two recorded reports was written during the 0.1 s between them.
+    assert [TextReportEncoder().decode(write.data).buttons for write in played] == [Button.A, 0]
+    assert played[1].timestamp - played[0].timestamp == pytest.approx(0.1, abs=0.02)
@@ -0,0 +1,48 @@
+import pytest
+
+from switch_pilot_core.controller import StickDisplacement, StickDisplacementPreset, StickDisplacementRange
+
+
+def exact_xy(angle: float, magnification: float) -> tuple[int, int]:
+    return StickDisplacement._calculate_xy(angle % 360, min(max(magnification, 0.0), 1.0))
+
+
+@pytest.mark.parametrize('magnification', [0.01, 0.37, 0.5, 1.0])
+def test_lookup_table_matches_exact_calculation(magnification: float):
+    for angle in range(StickDisplacement.ANGLE_STEPS):
+        displacement = StickDisplacement(angle, magnification)
+        assert (displacement.x, displacement.y) == exact_xy(angle, magnification)
+
+
+@pytest.mark.parametrize('angle, magnification', [(12.5, 1.0), (45, 0.333), (-90, 1.0), (400, 0.5), (30, 1.7)])
+def test_values_off_the_table_grid_are_exact(angle: float, magnification: float):
+    displacement = StickDisplacement(angle, magnification)
+
+    assert (displacement.x, displacement.y) == exact_xy(angle, magnification)
+
+
+def test_zero_magnification_is_centered():
+    displacement = StickDisplacement(123, 0.0)
+
+    center = StickDisplacementRange.CENTER
+    assert (displacement.x, displacement.y) == (center, center)
+
+
+def test_repeated_arguments_give_same_values():
+    first = StickDisplacement(33.3, 0.77)
+    second = StickDisplacement(33.3, 0.77)
+
+    assert (first.x, first.y) == (second.x, second.y) == exact_xy(33.3, 0.77)
+
+
+def test_quantized_rounds_to_table_grid():
+    displacement = StickDisplacement.quantized(89.6, 0.504)
+
+    assert (displacement.x, displacement.y) == exact_xy(90, 0.5)
+    quantized_center = StickDisplacement.quantized(45, 0.004)
+    assert (quantized_center.x, quantized_center.y) == (StickDisplacementRange.CENTER, StickDisplacementRange.CENTER)
+
+
+def test_presets_point_to_the_edges():
+    assert (StickDisplacementPreset.RIGHT.x, StickDisplacementPreset.LEFT.x) == (255, 0)
+    assert (StickDisplacementPreset.TOP.y, StickDisplacementPreset.BOTTOM.y) == (0, 255)
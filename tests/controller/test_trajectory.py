@@ -0,0 +1,68 @@
+import numpy as np
+import pytest
+
+from switch_pilot_core.controller import BinaryReportEncoder, Controller, StickDisplacement, StickDisplacementPreset, \
+    StickTrajectory
+from switch_pilot_core.timing import VirtualClock
+from tests.doubles.fake_serial import FakeSerialPort
+
+
+def xy_list(trajectory: StickTrajectory) -> list[tuple[int, int]]:
+    return [(displacement.x, displacement.y) for displacement in trajectory.displacements()]
+
+
+def test_arc_samples_match_single_displacements():
+    trajectory = StickTrajectory.arc(start_angle=10, end_angle=100, duration=0.3, rate=30, magnification=0.8)
+
+    assert (len(trajectory), trajectory.duration) == (9, pytest.approx(0.3))
+    expected = [StickDisplacement(10 + 10 * i, 0.8) for i in range(9)]
+    assert xy_list(trajectory) == [(displacement.x, displacement.y) for displacement in expected]
+
+
+def test_circle_turns_clockwise_from_start_angle():
+    trajectory = StickTrajectory.circle(duration=1.0, rate=4, start_angle=90, clockwise=True)
+
+    assert xy_list(trajectory) == [(StickDisplacementPreset.TOP.x, StickDisplacementPreset.TOP.y),
+                                   (StickDisplacementPreset.RIGHT.x, StickDisplacementPreset.RIGHT.y),
+                                   (StickDisplacementPreset.BOTTOM.x, StickDisplacementPreset.BOTTOM.y),
+                                   (StickDisplacementPreset.LEFT.x, StickDisplacementPreset.LEFT.y)]
+
+
+def test_linear_sweeps_from_start_to_end():
+    start, end = StickDisplacementPreset.LEFT, StickDisplacementPreset.RIGHT
+    trajectory = StickTrajectory.linear(start, end, duration=0.5, rate=10)
+
+    axes = trajectory.axes
+    assert axes.dtype == np.uint8
+    assert (tuple(axes[0]), tuple(axes[-1])) == ((start.x, start.y), (end.x, end.y))
+    assert np.all(np.diff(axes[:, 0].astype(int)) > 0)
+
+
+def test_single_sample_linear_goes_to_end():
+    trajectory = StickTrajectory.linear(StickDisplacementPreset.LEFT,
+                                        StickDisplacementPreset.TOP,
+                                        duration=0.01,
+                                        rate=30)
+
+    assert xy_list(trajectory) == [(StickDisplacementPreset.TOP.x, StickDisplacementPreset.TOP.y)]
+
+
+def test_rate_must_be_positive():
+    with pytest.raises(ValueError):
+        StickTrajectory.circle(duration=1.0, rate=0)
+    with pytest.raises(ValueError):
+        StickTrajectory(np.zeros((1, 2), dtype=np.uint8), rate=-1)
+
+
+def test_controller_sends_every_sample_at_rate_and_centers_stick():
+    clock = VirtualClock()
+    port = FakeSerialPort(clock=clock)
+    controller = Controller(encoder=BinaryReportEncoder(), serial_port=port, clock=clock)
+    trajectory = StickTrajectory.circle(duration=0.4, rate=10)
+
+    report = controller.send_trajectory(trajectory, use_r_stick=True, report_drift=True)
+
+    sent = port.decode(BinaryReportEncoder())
+    assert [timestamp for timestamp, _ in sent] == pytest.approx([0.0, 0.1, 0.2, 0.3, 0.4])
+    assert [(snapshot.rx, snapshot.ry) for _, snapshot in sent] == [*xy_list(trajectory), (128, 128)]
+    assert report.errors == (0.0,) * 4
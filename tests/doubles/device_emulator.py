@@ -0,0 +1,166 @@
+import os
+import select
+import threading
+import time
+from dataclasses import dataclass
+from typing import Optional
+
+from switch_pilot_core.controller import BinaryReportEncoder, ControllerStateSnapshot, TextReportEncoder
+from switch_pilot_core.libs.serial import SerialPortInfo
+
+
+@dataclass(frozen=True)
+class ReceivedReport:
+    snapshot: ControllerStateSnapshot
+    encoding: str
+    """'text' or 'binary'"""
+    received_at: float
+    """perf_counter time the last byte of the report arrived, including simulated wire time."""
+
+
+class DeviceEmulator:
+    """Stand-in for the controller device on a Linux pseudo terminal.
+
+    Controller.open(emulator.port_info) talks to it like to real hardware. It decodes both text and
+    binary reports. With baud_rate set, reception is delayed by the time the bytes take on the wire
+    (10 bits per byte), so throughput and latency of the encoders can be compared without a device.
+    With ack, every report or undecodable line is answered with an 'OK' line after processing_time,
+    which is what SerialPort.start_reader() expects from the device.
+    """
+
+    def __init__(self,
+                 baud_rate: Optional[int] = None,
+                 ack: bool = False,
+                 processing_time: float = 0.0):
+        self._baud_rate = baud_rate
+        self._ack = ack
+        self._processing_time = processing_time
+        self._master_fd: Optional[int] = None
+        self._slave_fd: Optional[int] = None
+        self._thread: Optional[threading.Thread] = None
+        self._is_stopping = False
+        self._condition = threading.Condition()
+        self._reports: list[ReceivedReport] = []
+        self._errors: list[bytes] = []
+        self._buffer = bytearray()
+        self._wire_free_at = 0.0
+        self._text_encoder = TextReportEncoder()
+        self._binary_encoder = BinaryReportEncoder()
+
+    @property
+    def is_open(self) -> bool:
+        return self._master_fd is not None
+
+    @property
+    def port_info(self) -> SerialPortInfo:
+        if self._slave_fd is None:
+            raise Exception("DeviceEmulator is not open.")
+        path = os.ttyname(self._slave_fd)
+        return SerialPortInfo(path=path, name=os.path.basename(path))
+
+    @property
+    def reports(self) -> list[ReceivedReport]:
+        with self._condition:
+            return list(self._reports)
+
+    @property
+    def errors(self) -> list[bytes]:
+        """Lines or frames that could not be decoded."""
+        with self._condition:
+            return list(self._errors)
+
+    def open(self):
+        import pty
+        import tty
+
+        if self.is_open:
+            self.close()
+        self._master_fd, self._slave_fd = pty.openpty()
+        # No echo and no newline translation, like a real serial line.
+        tty.setraw(self._slave_fd)
+        self._is_stopping = False
+        self._thread = threading.Thread(target=self._run, name=DeviceEmulator.__name__, daemon=True)
+        self._thread.start()
+
+    def close(self):
+        self._is_stopping = True
+        thread = self._thread
+        if thread is not None:
+            thread.join()
+        self._thread = None
+        for fd in (self._master_fd, self._slave_fd):
+            if fd is not None:
+                os.close(fd)
+        self._master_fd = None
+        self._slave_fd = None
+
+    def clear(self):
+        with self._condition:
+            self._reports.clear()
+            self._errors.clear()
+
+    def wait_for_reports(self, count: int, timeout: Optional[float] = None) -> bool:
+        with self._condition:
+            return self._condition.wait_for(lambda: len(self._reports) >= count, timeout=timeout)
+
+    def _run(self):
+        master_fd = self._master_fd
+        while not self._is_stopping:
+            readable, _, _ = select.select([master_fd], [], [], 0.05)
+            if not readable:
+                continue
+            try:
+                chunk = os.read(master_fd, 4096)
+            except OSError:
+                return
+            self._receive(chunk)
+
+    def _receive(self, chunk: bytes):
+        received_at = time.perf_counter()
+        byte_time = 0.0
+        if self._baud_rate is not None:
+            byte_time = 10 / self._baud_rate
+            received_at = max(received_at, self._wire_free_at) + len(chunk) * byte_time
+            self._wire_free_at = received_at
+            delay = received_at - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+
+        buffer = self._buffer
+        buffer.extend(chunk)
+        while len(buffer) > 0:
+            if buffer[0] == BinaryReportEncoder.HEADER:
+                size = BinaryReportEncoder.FRAME_SIZE
+                if len(buffer) < size:
+                    return
+                frame = bytes(buffer[:size])
+                del buffer[:size]
+                # Reports read in one chunk still arrived one after the other on the wire.
+                self._decode(frame, self._binary_encoder, 'binary', received_at - len(buffer) * byte_time)
+            else:
+                end = buffer.find(b"\n")
+                if end < 0:
+                    return
+                line = bytes(buffer[:end]).rstrip(b"\r")
+                del buffer[:end + 1]
+                self._decode(line, self._text_encoder, 'text', received_at - len(buffer) * byte_time)
+
+    def _decode(self, report: bytes, encoder, encoding: str, received_at: float):
+        try:
+            snapshot = encoder.decode(report)
+        except ValueError:
+            with self._condition:
+                self._errors.append(report)
+            self._acknowledge()
+            return
+        with self._condition:
+            self._reports.append(ReceivedReport(snapshot=snapshot, encoding=encoding, received_at=received_at))
+            self._condition.notify_all()
+        self._acknowledge()
+
+    def _acknowledge(self):
+        if not self._ack:
+            return
+        if self._processing_time > 0:
+            time.sleep(self._processing_time)
+        os.write(self._master_fd, b"OK\r\n")
@@ -0,0 +1,59 @@
+import threading
+from dataclasses import dataclass
+from typing import Any, Optional
+
+from switch_pilot_core.libs.serial import SerialPort, SerialPortInfo
+from switch_pilot_core.timing import Clock, SystemClock
+
+
+@dataclass(frozen=True)
+class SerialWrite:
+    timestamp: float
+    """Clock time the data was written at."""
+    data: bytes
+
+
+class FakeSerialPort(SerialPort):
+    """SerialPort that keeps every write in memory, for running commands without a device."""
+
+    def __init__(self, clock: Optional[Clock] = None, open_on_start: bool = True):
+        super().__init__()
+        self.clock = clock if clock is not None else SystemClock.shared()
+        self._is_open = open_on_start
+        self._writes: list[SerialWrite] = []
+        self._writes_lock = threading.Lock()
+
+    @property
+    def is_open(self) -> bool:
+        return self._is_open
+
+    @property
+    def writes(self) -> list[SerialWrite]:
+        with self._writes_lock:
+            return list(self._writes)
+
+    def clear(self):
+        with self._writes_lock:
+            self._writes.clear()
+
+    def decode(self, encoder: Any) -> list[tuple[float, Any]]:
+        """Decode the writes with a ReportEncoder into (timestamp, ControllerStateSnapshot) pairs."""
+        return [(write.timestamp, encoder.decode(write.data)) for write in self.writes]
+
+    def open(self, info: Optional[SerialPortInfo] = None, baud_rate: int = 9600):
+        self._is_open = True
+
+    def close(self):
+        self.stop_writer(flush_timeout=1.0)
+        self.stop_reader()
+        self._is_open = False
+
+    def start_reader(self, *args, **kwargs):
+        raise Exception("FakeSerialPort has no read-back channel.")
+
+    def _write_now(self, data: bytes):
+        if not self.is_open:
+            raise Exception("SerialPort is not open.")
+
+        with self._writes_lock:
+            self._writes.append(SerialWrite(timestamp=self.clock.now(), data=bytes(data)))
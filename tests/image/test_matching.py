@@ -0,0 +1,158 @@
+import threading
+
+import cv2
+import numpy as np
+import pytest
+
+from switch_pilot_core.image import Image, ImageRegion, TemplateQuery, matching
+from switch_pilot_core.image.matching import match_template, match_templates
+
+
+def textured_scene(rng: np.random.Generator, size: tuple[int, int], cell: int) -> np.ndarray:
+    """Random texture whose finest detail spans cell pixels."""
+    width, height = size
+    cells = rng.integers(0, 256, (-(-height // cell), -(-width // cell), 3), dtype=np.uint8)
+    return np.repeat(np.repeat(cells, cell, axis=0), cell, axis=1)[:height, :width].copy()
+
+
+def degrade(mat: np.ndarray, rng: np.random.Generator, blur: int, noise: float) -> np.ndarray:
+    if blur > 0:
+        mat = cv2.GaussianBlur(mat, (2 * blur + 1, 2 * blur + 1), 0)
+    noisy = mat.astype(np.float32) + rng.normal(0, noise, mat.shape).astype(np.float32)
+    return np.clip(noisy, 0, 255).astype(np.uint8)
+
+
+@pytest.mark.parametrize('pyramid_levels', [1, 2])
+def test_pyramid_agrees_with_full_search(pyramid_levels: int):
+    # The finest detail the default coarse margin is documented for.
+    cell = 2 * 2 ** pyramid_levels
+    rng = np.random.default_rng(pyramid_levels)
+    disagreements = []
+    for case in range(200):
+        scene = textured_scene(rng, (320, 180), cell)
+        width, height = int(rng.integers(24, 96)), int(rng.integers(24, 96))
+        x, y = int(rng.integers(0, 320 - width)), int(rng.integers(0, 180 - height))
+        template = scene[y:y + height, x:x + width].copy()
+        if case % 3 == 0:
+            # Template from another scene, usually absent from this one.
+            template = textured_scene(rng, (width, height), cell)
+        scene = degrade(scene, rng, blur=int(rng.integers(0, 3)), noise=float(rng.uniform(0, 12)))
+        threshold = float(rng.uniform(0.5, 0.95))
+
+        full_score, _ = match_template(scene, template, threshold=threshold)
+        score, (lx, ly) = match_template(scene, template, threshold=threshold, pyramid_levels=pyramid_levels)
+        if (score >= threshold) != (full_score >= threshold):
+            disagreements.append((case, width, height, threshold, full_score, score))
+            continue
+        if score >= threshold:
+            # The reported score belongs to the reported location.
+            actual = cv2.matchTemplate(scene[ly:ly + height, lx:lx + width], template, cv2.TM_CCOEFF_NORMED)
+            assert actual[0, 0] == pytest.approx(score, abs=1e-4)
+    assert disagreements == []
+
+
+def test_pyramid_finds_blurred_noisy_template():
+    rng = np.random.default_rng(0)
+    scene = textured_scene(rng, (320, 180), 8)
+    template = scene[40:116, 100:135].copy()
+    scene = degrade(scene, rng, blur=1, noise=5)
+
+    score, location = match_template(scene, template, threshold=0.8, pyramid_levels=2)
+    assert score == pytest.approx(match_template(scene, template, threshold=0.8)[0], abs=1e-4)
+    assert score >= 0.8
+    assert location == (100, 40)
+
+
+@pytest.mark.parametrize('pyramid_levels', [1, 2])
+def test_pyramid_miss_skips_full_resolution_search(pyramid_levels: int, monkeypatch):
+    rng = np.random.default_rng(3)
+    frame = textured_scene(rng, (1280, 720), 8)
+    absent = textured_scene(rng, (96, 64), 8)
+    searched = []
+    match_full = matching._match_full
+
+    def recording_match_full(mat, template):
+        searched.append(mat.shape)
+        return match_full(mat, template)
+
+    monkeypatch.setattr(matching, '_match_full', recording_match_full)
+
+    score, _ = match_template(frame, absent, threshold=0.8, pyramid_levels=pyramid_levels)
+
+    assert score < 0.8
+    assert all(shape[0] < 720 and shape[1] < 1280 for shape in searched)
+
+
+def scene_with_templates(rng: np.random.Generator) -> tuple[np.ndarray, list[np.ndarray]]:
+    scene = textured_scene(rng, (320, 180), 4)
+    templates = [scene[20:52, 30:78].copy(), scene[100:140, 200:248].copy(), scene[60:92, 120:168].copy()]
+    return scene, templates
+
+
+def test_match_templates_keeps_query_order_and_scores_each_query():
+    scene, templates = scene_with_templates(np.random.default_rng(4))
+    absent = textured_scene(np.random.default_rng(5), (48, 32), 4)
+    queries = [TemplateQuery(template=Image(mat), threshold=0.9) for mat in [*templates, absent]]
+
+    matches = match_templates(scene, queries)
+
+    assert [match.query for match in matches] == queries
+    assert [match.location for match in matches[:3]] == [(30, 20), (200, 100), (120, 60)]
+    assert [match.matched for match in matches] == [True, True, True, False]
+
+
+def test_match_templates_converts_image_for_gray_templates_once(monkeypatch):
+    scene, templates = scene_with_templates(np.random.default_rng(6))
+    conversions = []
+    cvt_color = cv2.cvtColor
+
+    def recording_cvt_color(mat, code):
+        conversions.append(code)
+        return cvt_color(mat, code)
+
+    monkeypatch.setattr(cv2, 'cvtColor', recording_cvt_color)
+    queries = [TemplateQuery(template=Image(cvt_color(mat, cv2.COLOR_BGR2GRAY)), threshold=0.9) for mat in templates]
+
+    matches = match_templates(scene, [*queries, TemplateQuery(template=Image(templates[0]), threshold=0.9)])
+
+    assert conversions == [cv2.COLOR_BGR2GRAY]
+    assert all(match.matched for match in matches)
+
+
+def test_match_templates_reports_location_in_whole_image_for_regions():
+    scene, templates = scene_with_templates(np.random.default_rng(7))
+    region = ImageRegion(x=(0.5, 1.0), y=(0.5, 1.0))
+
+    match, = match_templates(scene, [TemplateQuery(template=Image(templates[1]), threshold=0.9, region=region)])
+
+    assert match.matched
+    assert match.location == (200, 100)
+
+
+def test_match_templates_scores_queries_on_worker_threads(monkeypatch):
+    scene, templates = scene_with_templates(np.random.default_rng(8))
+    threads = []
+    match_full = matching._match_full
+
+    def recording_match_full(mat, template):
+        threads.append(threading.current_thread().name)
+        return match_full(mat, template)
+
+    monkeypatch.setattr(matching, '_match_full', recording_match_full)
+
+    match_templates(scene, [TemplateQuery(template=Image(mat), threshold=0.9) for mat in templates])
+    assert len(threads) == 3
+    assert all(name.startswith("match_templates") for name in threads)
+
+    threads.clear()
+    match_templates(scene, [TemplateQuery(template=Image(templates[0]), threshold=0.9)])
+    assert threads == [threading.current_thread().name]
+
+
+def test_match_templates_rejects_color_template_for_gray_image():
+    scene, templates = scene_with_templates(np.random.default_rng(9))
+    gray = cv2.cvtColor(scene, cv2.COLOR_BGR2GRAY)
+
+    assert match_templates(gray, []) == []
+    with pytest.raises(ValueError):
+        match_templates(gray, [TemplateQuery(template=Image(templates[0]), threshold=0.9)])
@@ -0,0 +1,99 @@
+import os
+
+import cv2
+import numpy as np
+import pytest
+
+from switch_pilot_core.image import TemplateCache
+
+SIDE = 16
+NBYTES = SIDE * SIDE
+
+
+def write_template(path, value: int, mtime_ns: int = None) -> str:
+    file_path = str(path)
+    cv2.imwrite(file_path, np.full((SIDE, SIDE), value, dtype=np.uint8))
+    if mtime_ns is not None:
+        os.utime(file_path, ns=(mtime_ns, mtime_ns))
+    return file_path
+
+
+def test_unchanged_file_is_decoded_once(tmp_path):
+    cache = TemplateCache()
+    file_path = write_template(tmp_path / "a.png", 10)
+
+    image = cache.get(file_path)
+
+    assert cache.get(file_path) is image
+    assert not image.mat.flags.writeable
+    assert (len(cache), cache.total_bytes) == (1, NBYTES)
+
+
+def test_gray_and_color_are_cached_separately(tmp_path):
+    cache = TemplateCache()
+    file_path = write_template(tmp_path / "a.png", 10)
+
+    gray = cache.get(file_path)
+    color = cache.get(file_path, use_gray_scale=False)
+
+    assert (gray.mat.ndim, color.mat.ndim) == (2, 3)
+    assert (len(cache), cache.total_bytes) == (2, 4 * NBYTES)
+
+
+def test_changed_mtime_decodes_file_again(tmp_path):
+    cache = TemplateCache()
+    file_path = write_template(tmp_path / "a.png", 10, mtime_ns=1_000_000_000)
+    old = cache.get(file_path)
+
+    write_template(tmp_path / "a.png", 200, mtime_ns=2_000_000_000)
+    new = cache.get(file_path)
+
+    assert new is not old
+    assert (old.mat[0, 0], new.mat[0, 0]) == (10, 200)
+    assert (len(cache), cache.total_bytes) == (1, NBYTES)
+
+
+def test_least_recently_used_template_is_evicted(tmp_path):
+    cache = TemplateCache(max_bytes=2 * NBYTES)
+    a = write_template(tmp_path / "a.png", 1)
+    b = write_template(tmp_path / "b.png", 2)
+    c = write_template(tmp_path / "c.png", 3)
+
+    image_a = cache.get(a)
+    image_b = cache.get(b)
+    cache.get(a)
+    cache.get(c)
+
+    assert (len(cache), cache.total_bytes) == (2, 2 * NBYTES)
+    assert cache.get(a) is image_a
+    assert cache.get(b) is not image_b
+
+
+def test_template_larger_than_budget_is_still_kept(tmp_path):
+    cache = TemplateCache(max_bytes=NBYTES // 2)
+    file_path = write_template(tmp_path / "a.png", 1)
+
+    image = cache.get(file_path)
+
+    assert cache.get(file_path) is image
+    assert len(cache) == 1
+
+
+def test_deleted_file_is_dropped_from_cache(tmp_path):
+    cache = TemplateCache()
+    file_path = write_template(tmp_path / "a.png", 1)
+    cache.get(file_path)
+
+    os.remove(file_path)
+
+    with pytest.raises(FileNotFoundError):
+        cache.get(file_path)
+    assert (len(cache), cache.total_bytes) == (0, 0)
+
+
+def test_undecodable_file_raises_value_error(tmp_path):
+    file_path = tmp_path / "broken.png"
+    file_path.write_bytes(b"not an image")
+
+    with pytest.raises(ValueError):
+        TemplateCache().get(str(file_path))
@@ -0,0 +1,50 @@
+import time
+
+import pytest
+
+from switch_pilot_core.libs.serial import SerialPort
+from switch_pilot_core.libs.serial_reader import SerialReader
+
+
+class SilentSerial:
+    """Open serial device that accepts writes and never answers."""
+
+    is_open = True
+
+    def __init__(self):
+        self.writes: list[bytes] = []
+
+    def write(self, data: bytes):
+        self.writes.append(data)
+
+
+def create_port(max_in_flight: int, flow_control_timeout: float) -> tuple[SerialPort, SilentSerial]:
+    device = SilentSerial()
+    port = SerialPort()
+    port._serial = device
+    port._reader = SerialReader(read=lambda: b'', max_in_flight=max_in_flight, ack_timeout=10.0)
+    port.flow_control_timeout = flow_control_timeout
+    return port, device
+
+
+def test_write_raises_and_counts_when_window_stays_full():
+    port, device = create_port(max_in_flight=1, flow_control_timeout=0.05)
+    port.write_bytes(b'first')
+
+    started_at = time.perf_counter()
+    with pytest.raises(TimeoutError):
+        port.write_bytes(b'second')
+
+    assert time.perf_counter() - started_at >= 0.05
+    assert device.writes == [b'first']
+    assert port.reader.acquire_timeout_count == 1
+    assert port.reader.in_flight == 1
+
+
+def test_write_goes_through_once_window_has_room():
+    port, device = create_port(max_in_flight=2, flow_control_timeout=0.05)
+    port.write_bytes(b'first')
+    port.write_bytes(b'second')
+
+    assert device.writes == [b'first', b'second']
+    assert port.reader.acquire_timeout_count == 0
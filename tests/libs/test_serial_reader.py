@@ -0,0 +1,76 @@
+import sys
+
+import pytest
+
+from switch_pilot_core.controller import BinaryReportEncoder, ControllerState
+from switch_pilot_core.libs.serial import SerialPort
+from tests.doubles.device_emulator import DeviceEmulator
+
+pytestmark = pytest.mark.skipif(sys.platform == 'win32', reason="DeviceEmulator needs a pseudo terminal")
+
+REPORT = BinaryReportEncoder().encode(ControllerState())
+
+
+@pytest.fixture
+def emulator_port():
+    ports = []
+
+    def open_port(**emulator_options) -> tuple[SerialPort, DeviceEmulator]:
+        emulator = DeviceEmulator(**emulator_options)
+        emulator.open()
+        port = SerialPort()
+        port.open(emulator.port_info, baud_rate=115200)
+        ports.append((port, emulator))
+        return port, emulator
+
+    yield open_port
+    for port, emulator in ports:
+        port.close()
+        emulator.close()
+
+
+def test_every_report_is_acknowledged_with_round_trip_time(emulator_port):
+    port, emulator = emulator_port(ack=True)
+    port.start_reader(max_in_flight=4, ack_prefix=b"OK")
+
+    for _ in range(20):
+        port.write_bytes(REPORT)
+    reader = port.reader
+
+    assert reader.wait_for_acks(timeout=5.0)
+    assert (reader.acked_count, reader.lost_count) == (20, 0)
+    assert reader.round_trip_time.count == 20
+    assert 0 < reader.round_trip_time.mean <= reader.round_trip_time.max
+    assert reader.pop_lines() == []
+
+
+def test_writes_wait_while_window_is_full(emulator_port):
+    port, emulator = emulator_port(ack=True, processing_time=0.02)
+    port.start_reader(max_in_flight=2)
+    reader = port.reader
+
+    in_flight = []
+    for _ in range(10):
+        port.write_bytes(REPORT)
+        in_flight.append(reader.in_flight)
+
+    assert max(in_flight) == 2
+    # Each write past the window waited for an acknowledgment, so at most two reports were ever unanswered.
+    assert reader.acked_count >= 10 - 2
+    assert reader.wait_for_acks(timeout=5.0)
+    assert reader.acquire_timeout_count == 0
+    # Every round trip includes the device's processing time.
+    assert reader.round_trip_time.mean >= 0.02
+
+
+def test_unanswered_reports_are_given_up_after_ack_timeout(emulator_port):
+    port, emulator = emulator_port(ack=False)
+    port.start_reader(max_in_flight=1, ack_timeout=0.05)
+    reader = port.reader
+
+    port.write_bytes(REPORT)
+    port.write_bytes(REPORT)
+
+    assert reader.wait_for_acks(timeout=1.0)
+    assert (reader.acked_count, reader.lost_count) == (0, 2)
+    assert emulator.wait_for_reports(2, timeout=1.0)
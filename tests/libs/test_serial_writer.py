@@ -0,0 +1,55 @@
+import pytest
+
+from switch_pilot_core.libs.serial import SerialPort
+from switch_pilot_core.libs.serial_writer import SerialWriter
+
+
+class UnpluggedSerial:
+    """Open serial device whose writes fail, as after the cable was pulled."""
+
+    def __init__(self):
+        self.is_open = True
+
+    def write(self, data: bytes):
+        raise OSError('unplugged')
+
+    def close(self):
+        self.is_open = False
+
+
+def failing_write(data: bytes):
+    raise OSError('unplugged')
+
+
+def test_write_error_is_raised_on_flush():
+    writer = SerialWriter(write=failing_write)
+    writer.start()
+    writer.put(b'report')
+
+    with pytest.raises(OSError):
+        writer.flush(timeout=1.0)
+    writer.stop()
+
+
+def test_stop_after_write_error_stops_thread():
+    writer = SerialWriter(write=failing_write)
+    writer.start()
+    writer.put(b'report')
+
+    assert writer.stop(flush_timeout=1.0) is False
+    assert not writer.is_running
+
+
+def test_close_after_write_error_closes_port():
+    device = UnpluggedSerial()
+    port = SerialPort()
+    port._serial = device
+    port.start_writer()
+    writer = port.writer
+    port.write_bytes(b'report')
+
+    port.close()
+
+    assert not device.is_open
+    assert not writer.is_running
+    assert port.writer is None
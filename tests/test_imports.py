@@ -0,0 +1,62 @@
+import json
+import os
+import subprocess
+import sys
+import textwrap
+
+IMPORT_BUDGET = 2.0
+"""Seconds allowed for the light entry points below, far above the expected time."""
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+HEAVY_MODULES = ('cv2', 'numpy', 'pygame', 'easyocr', 'torch')
+
+SCRIPT = textwrap.dedent('''
+    import json
+    import os
+    import sys
+    import tempfile
+    import time
+
+    started_at = time.perf_counter()
+    import switch_pilot_core.camera
+    import switch_pilot_core.command
+    from switch_pilot_core.command import CommandLoader
+    from switch_pilot_core.config import Config
+    from switch_pilot_core.libs.serial import SerialPort
+    from switch_pilot_core.path import Path
+
+
+    class DirectoryPath(Path):
+        def __init__(self, directory):
+            super().__init__()
+            self._directory = directory
+
+        def _get_user_directory(self):
+            return self._directory
+
+
+    with tempfile.TemporaryDirectory() as directory:
+        os.makedirs(os.path.join(directory, "commands", "sample"))
+        path = DirectoryPath(directory)
+        names = CommandLoader(config=Config(path=path), path=path).get_names()
+    SerialPort.get_serial_ports()
+    print(json.dumps({
+        'elapsed': time.perf_counter() - started_at,
+        'names': names,
+        'modules': [name for name in %r if name in sys.modules],
+    }))
+''' % (HEAVY_MODULES,))
+
+
+def test_light_entry_points_do_not_load_heavy_modules():
+    output = subprocess.run([sys.executable, '-c', SCRIPT],
+                            cwd=ROOT,
+                            capture_output=True,
+                            text=True,
+                            check=True).stdout
+    result = json.loads(output.splitlines()[-1])
+
+    assert result['names'] == ['sample']
+    assert result['modules'] == []
+    assert result['elapsed'] < IMPORT_BUDGET
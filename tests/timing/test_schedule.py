@@ -0,0 +1,90 @@
+from typing import Optional
+
+import pytest
+
+from switch_pilot_core.timing import CancellationToken, DeadlineSchedule, PrecisionSleeper, VirtualClock
+
+
+class LateClock(VirtualClock):
+    """Virtual clock that wakes up a fixed time after every deadline, like an imprecise sleep."""
+
+    def __init__(self, lateness: float):
+        super().__init__()
+        self.lateness = lateness
+
+    def sleep_until(self, deadline: float, token: Optional[CancellationToken] = None) -> float:
+        if token is not None and token.is_cancelled:
+            return min(self.now() - deadline, 0.0)
+        self.advance_to(max(deadline, self.now()) + self.lateness)
+        return self.now() - deadline
+
+
+def test_lateness_of_a_step_does_not_carry_over_to_the_next():
+    clock = LateClock(lateness=0.004)
+    schedule = DeadlineSchedule(clock=clock)
+
+    for _ in range(10):
+        schedule.advance(0.1)
+    report = schedule.report()
+
+    assert schedule.offset == pytest.approx(1.0)
+    assert clock.now() == pytest.approx(1.004)
+    assert report.errors == pytest.approx((0.004,) * 10)
+    assert (report.planned_duration, report.drift) == pytest.approx((1.0, 0.004))
+
+
+def test_deadline_already_passed_is_reported_as_late():
+    clock = LateClock(lateness=0.0)
+    schedule = DeadlineSchedule(clock=clock)
+
+    clock.advance(0.25)
+    error = schedule.wait_until_offset(0.1)
+
+    assert error == pytest.approx(0.15)
+    assert schedule.next_deadline == pytest.approx(0.1)
+    assert schedule.report().max_error == pytest.approx(0.15)
+
+
+def test_schedule_starts_at_given_time():
+    clock = VirtualClock(start=10.0)
+    schedule = DeadlineSchedule(clock=clock, start=9.5)
+
+    schedule.advance(1.0)
+
+    assert clock.now() == pytest.approx(10.5)
+    assert schedule.report().errors == (0.0,)
+
+
+def test_cancelled_wait_is_left_out_of_report():
+    clock = VirtualClock()
+    token = CancellationToken()
+    schedule = DeadlineSchedule(clock=clock, token=token)
+
+    schedule.advance(0.5)
+    token.cancel()
+    error = schedule.advance(0.5)
+
+    assert schedule.is_cancelled
+    assert error == pytest.approx(-0.5)
+    assert clock.now() == pytest.approx(0.5)
+    report = schedule.report()
+    assert report.errors == (0.0,)
+    assert report.mean_error == 0.0
+
+
+def test_empty_report_has_no_error():
+    report = DeadlineSchedule(clock=VirtualClock()).report()
+
+    assert (report.errors, report.max_error, report.mean_error, report.drift) == ((), 0.0, 0.0, 0.0)
+
+
+def test_sleeper_schedule_runs_on_real_time():
+    schedule = DeadlineSchedule(sleeper=PrecisionSleeper(slack=0.002))
+
+    for _ in range(5):
+        schedule.advance(0.01)
+    report = schedule.report()
+
+    assert len(report.errors) == 5
+    assert all(error >= 0 for error in report.errors)
+    assert report.actual_duration >= 0.05
@@ -0,0 +1,91 @@
+import threading
+import time
+
+import pytest
+
+from switch_pilot_core.controller import Controller
+from switch_pilot_core.timing import CancellationToken, PrecisionSleeper, SystemClock
+from tests.doubles.fake_serial import FakeSerialPort
+
+
+@pytest.fixture
+def calibrations(monkeypatch) -> list[PrecisionSleeper]:
+    calibrated = []
+    calibrate = PrecisionSleeper.calibrate
+
+    def recording_calibrate(self, *args, **kwargs):
+        calibrated.append(self)
+        return calibrate(self, *args, **kwargs)
+
+    monkeypatch.setattr(PrecisionSleeper, 'calibrate', recording_calibrate)
+    return calibrated
+
+
+def test_shared_clock_and_controller_do_not_calibrate(calibrations, monkeypatch):
+    monkeypatch.setattr(PrecisionSleeper, '_shared', None)
+    monkeypatch.setattr(SystemClock, '_shared', None)
+
+    Controller(serial_port=FakeSerialPort())
+    SystemClock.shared().now()
+
+    assert calibrations == []
+
+
+def test_first_sleep_calibrates_once(calibrations):
+    sleeper = PrecisionSleeper()
+
+    sleeper.sleep(0)
+    assert calibrations == []
+
+    threads = [threading.Thread(target=sleeper.sleep, args=(0.01,)) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    sleeper.sleep(0.001)
+
+    assert calibrations == [sleeper]
+    assert sleeper.stats.count == 6
+
+
+def test_given_slack_is_never_calibrated(calibrations):
+    sleeper = PrecisionSleeper(slack=0.002)
+
+    sleeper.sleep(0.005)
+
+    assert calibrations == []
+    assert sleeper.slack == 0.002
+
+
+def test_calibrated_slack_is_clamped():
+    sleeper = PrecisionSleeper(min_slack=0.001, max_slack=0.003)
+
+    assert 0.001 <= sleeper.calibrate(samples=5) <= 0.003
+
+
+def test_sleep_wakes_up_at_deadline_and_records_error():
+    sleeper = PrecisionSleeper(slack=0.002)
+    deadline = time.perf_counter() + 0.02
+
+    error = sleeper.sleep_until(deadline)
+
+    assert error >= 0
+    assert time.perf_counter() >= deadline
+    stats = sleeper.stats
+    assert (stats.count, stats.max_error) == (1, error)
+
+    sleeper.reset_stats()
+    assert sleeper.stats.count == 0
+
+
+def test_cancelled_sleep_returns_time_left_without_recording():
+    sleeper = PrecisionSleeper(slack=0.002)
+    token = CancellationToken()
+    timer = threading.Timer(0.02, token.cancel)
+    timer.start()
+
+    error = sleeper.sleep(5.0, token=token)
+    timer.join()
+
+    assert error < -4.0
+    assert sleeper.stats.count == 0